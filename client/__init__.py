@@ -10,11 +10,12 @@ bl_info = {
 
 import bpy
 from .config import (
-    GestureNavProperties, 
-    GestureNav_OT_Preset, 
-    GestureNav_OT_Reset, 
-    GestureNav_OT_SaveSettings, 
-    GestureNav_OT_LoadSettings
+    GestureNavProperties,
+    GestureNav_OT_Preset,
+    GestureNav_OT_Reset,
+    GestureNav_OT_SaveSettings,
+    GestureNav_OT_LoadSettings,
+    shutdown_config_sync
 )
 from .ui import GESTURENAV_PT_Panel
 from .networking import GestureNav_OT_Start, GestureNav_OT_Stop
@@ -30,17 +31,22 @@ classes = (
     GESTURENAV_PT_Panel
 )
 
+
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
-        
+
     bpy.types.Scene.gesture_nav = bpy.props.PointerProperty(type=GestureNavProperties)
 
+
 def unregister():
+    shutdown_config_sync()
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
-        
+
     del bpy.types.Scene.gesture_nav
 
+
 if __name__ == "__main__":
     register()
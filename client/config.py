@@ -1,21 +1,46 @@
 import bpy
-import socket
 import json
 import os
 
+from .config_sync import ConfigSync
+
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".gesturenav_config.json")
 
-def send_config(self, context=None):
+# One persistent sender for all config updates (coalesced, versioned, acknowledged)
+_config_sync = ConfigSync()
+
+
+def _config_sync_timer():
+    return _config_sync.tick()
+
+
+def get_config_sync_stats():
+    return _config_sync.get_stats()
+
+
+def shutdown_config_sync():
+    """Stops the sync timer and closes its socket (add-on unregister)."""
+    if bpy.app.timers.is_registered(_config_sync_timer):
+        bpy.app.timers.unregister(_config_sync_timer)
+    _config_sync.close()
+
+
+def send_config(self, context=None, full=False):
     """
-    Sends current scene properties to the Python Server via UDP Port 5556.
+    Queues the current scene properties for the Python Server (UDP Port 5556).
     'self' is expected to be the GestureNavProperties instance.
+
+    Called from every property `update=` callback. Nothing is sent here: a timer
+    sends the changed keys at a limited rate (see `ConfigSync`). With `full`, every
+    key is sent again (e.g. when the listener starts, the server may have restarted).
     """
     properties = self
     if not isinstance(self, GestureNavProperties):
         if context:
             properties = getattr(context.scene, "gesture_nav", None)
-            if not properties: return
-    
+            if not properties:
+                return
+
     config = {
         'deadzone_radius': properties.deadzone_radius,
         'deadzone_offset_x': properties.deadzone_x,
@@ -24,14 +49,18 @@ def send_config(self, context=None):
         'zoom_thresh_out': properties.zoom_thresh_out,
         'orbit_sens_server': properties.orbit_sens_server,
         'use_fist_safety': properties.use_fist_safety,
-        'use_open_hand_safety': properties.use_open_hand_safety
+        'use_open_hand_safety': properties.use_open_hand_safety,
+        'filter_mode': properties.server_filter,
+        'use_prediction': properties.use_prediction
     }
-    
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.sendto(json.dumps(config).encode('utf-8'), ("127.0.0.1", 5556))
-    except Exception as e:
-        print(f"Config Send Error: {e}")
+
+    if full:
+        _config_sync.resync()
+    _config_sync.push(config)
+    if not bpy.app.timers.is_registered(_config_sync_timer):
+        # First run on the next event loop pass, so a batch of property changes goes out as one message
+        bpy.app.timers.register(_config_sync_timer, first_interval=0.0)
+
 
 class GestureNavProperties(bpy.types.PropertyGroup):
     """
@@ -41,7 +70,7 @@ class GestureNavProperties(bpy.types.PropertyGroup):
     listening: bpy.props.BoolProperty(
         name="Listening", default=False
     )
-    
+
     # Deadzone
     deadzone_radius: bpy.props.FloatProperty(
         name="Deadzone Radius", default=0.12, min=0.01, max=0.5, update=send_config
@@ -52,7 +81,7 @@ class GestureNavProperties(bpy.types.PropertyGroup):
     deadzone_y: bpy.props.FloatProperty(
         name="Deadzone Y", default=0.6, min=0.0, max=1.0, update=send_config
     )
-    
+
     # Sensitivity (Client Side)
     orbit_sensitivity: bpy.props.FloatProperty(
         name="Orbit Sensitivity", default=0.02, min=0.001, max=0.2
@@ -60,12 +89,12 @@ class GestureNavProperties(bpy.types.PropertyGroup):
     zoom_sensitivity: bpy.props.FloatProperty(
         name="Zoom Sensitivity", default=2.0, min=0.1, max=10.0
     )
-    
+
     # Sensitivity (Server Side)
     orbit_sens_server: bpy.props.FloatProperty(
         name="Orbit Curve", default=3.0, min=1.0, max=10.0, update=send_config
     )
-    
+
     # Zoom Thresholds
     zoom_thresh_in: bpy.props.FloatProperty(
         name="Zoom In Threshold", default=0.05, min=0.01, max=0.2, update=send_config
@@ -73,7 +102,7 @@ class GestureNavProperties(bpy.types.PropertyGroup):
     zoom_thresh_out: bpy.props.FloatProperty(
         name="Zoom Out Threshold", default=0.20, min=0.05, max=0.5, update=send_config
     )
-    
+
     # Safety
     use_fist_safety: bpy.props.BoolProperty(
         name="Fist Safety", default=True, update=send_config
@@ -82,38 +111,61 @@ class GestureNavProperties(bpy.types.PropertyGroup):
         name="Open Hand Safety", default=False, update=send_config
     )
 
+    # Smoothing
+    server_filter: bpy.props.EnumProperty(
+        name="Server Filter",
+        items=[('one_euro', "One-Euro", "Adaptive low-pass on all landmarks: steady at rest, little lag when moving"),
+               ('kalman', "Kalman", "Constant-velocity Kalman filter on all landmarks"),
+               ('off', "Off", "Raw landmarks")],
+        default='one_euro', update=send_config
+    )
+    use_prediction: bpy.props.BoolProperty(
+        name="Latency Compensation",
+        description="Server extrapolates the hand by the measured pipeline latency",
+        default=False, update=send_config
+    )
+    use_client_smoothing: bpy.props.BoolProperty(
+        name="Client Smoothing",
+        description="Extra EMA on the received orbit speed. Adds lag; not needed while the server filters",
+        default=False
+    )
+
 # --- Operators ---
 
+
 class GestureNav_OT_Preset(bpy.types.Operator):
     """Apply a Handedness Preset"""
     bl_idname = "gesturenav.preset"
     bl_label = "Apply Preset"
-    
+
     side: bpy.props.EnumProperty(
         items=[('RIGHT', "Right Handed", ""), ('LEFT', "Left Handed", "")]
     )
-    
+
     def execute(self, context):
         props = getattr(context.scene, "gesture_nav", None)
-        if not props: return {'CANCELLED'}
+        if not props:
+            return {'CANCELLED'}
 
         if self.side == 'RIGHT':
             props.deadzone_x = 0.75
         else:
             props.deadzone_x = 0.25
-            
+
         send_config(props, context)
         self.report({'INFO'}, f"Applied {self.side} Handed Preset")
         return {'FINISHED'}
 
+
 class GestureNav_OT_Reset(bpy.types.Operator):
     """Reset All Settings to default"""
     bl_idname = "gesturenav.reset"
     bl_label = "Reset Settings"
-    
+
     def execute(self, context):
         props = getattr(context.scene, "gesture_nav", None)
-        if not props: return {'CANCELLED'}
+        if not props:
+            return {'CANCELLED'}
 
         props.deadzone_radius = 0.12
         props.deadzone_x = 0.75
@@ -125,19 +177,24 @@ class GestureNav_OT_Reset(bpy.types.Operator):
         props.zoom_thresh_out = 0.20
         props.use_fist_safety = True
         props.use_open_hand_safety = False
-        
+        props.server_filter = 'one_euro'
+        props.use_client_smoothing = False
+        props.use_prediction = False
+
         send_config(props, context)
         self.report({'INFO'}, "Settings Reset")
         return {'FINISHED'}
 
+
 class GestureNav_OT_SaveSettings(bpy.types.Operator):
     """Save current settings to disk"""
     bl_idname = "gesturenav.save"
     bl_label = "Save Config"
-    
+
     def execute(self, context):
         props = getattr(context.scene, "gesture_nav", None)
-        if not props: return {'CANCELLED'}
+        if not props:
+            return {'CANCELLED'}
 
         data = {
             'deadzone_radius': props.deadzone_radius,
@@ -149,49 +206,50 @@ class GestureNav_OT_SaveSettings(bpy.types.Operator):
             'zoom_thresh_in': props.zoom_thresh_in,
             'zoom_thresh_out': props.zoom_thresh_out,
             'use_fist_safety': props.use_fist_safety,
-            'use_open_hand_safety': props.use_open_hand_safety
+            'use_open_hand_safety': props.use_open_hand_safety,
+            'server_filter': props.server_filter,
+            'use_client_smoothing': props.use_client_smoothing,
+            'use_prediction': props.use_prediction
         }
-        
+
         try:
             with open(CONFIG_PATH, 'w') as f:
                 json.dump(data, f, indent=4)
             self.report({'INFO'}, f"Saved to {CONFIG_PATH}")
         except Exception as e:
             self.report({'ERROR'}, f"Save Failed: {e}")
-            
+
         return {'FINISHED'}
 
+
 class GestureNav_OT_LoadSettings(bpy.types.Operator):
     """Load settings from disk"""
     bl_idname = "gesturenav.load"
     bl_label = "Load Config"
-    
+
     def execute(self, context):
         if not os.path.exists(CONFIG_PATH):
             self.report({'WARNING'}, "No config file found.")
             return {'CANCELLED'}
-            
+
         try:
             with open(CONFIG_PATH, 'r') as f:
                 data = json.load(f)
-                
+
             props = getattr(context.scene, "gesture_nav", None)
-            if not props: return {'CANCELLED'}
-
-            if 'deadzone_radius' in data: props.deadzone_radius = data['deadzone_radius']
-            if 'deadzone_x' in data: props.deadzone_x = data['deadzone_x']
-            if 'deadzone_y' in data: props.deadzone_y = data['deadzone_y']
-            if 'orbit_sensitivity' in data: props.orbit_sensitivity = data['orbit_sensitivity']
-            if 'zoom_sensitivity' in data: props.zoom_sensitivity = data['zoom_sensitivity']
-            if 'orbit_sens_server' in data: props.orbit_sens_server = data['orbit_sens_server']
-            if 'zoom_thresh_in' in data: props.zoom_thresh_in = data['zoom_thresh_in']
-            if 'zoom_thresh_out' in data: props.zoom_thresh_out = data['zoom_thresh_out']
-            if 'use_fist_safety' in data: props.use_fist_safety = data['use_fist_safety']
-            if 'use_open_hand_safety' in data: props.use_open_hand_safety = data['use_open_hand_safety']
-            
+            if not props:
+                return {'CANCELLED'}
+
+            keys = ('deadzone_radius', 'deadzone_x', 'deadzone_y', 'orbit_sensitivity', 'zoom_sensitivity',
+                    'orbit_sens_server', 'zoom_thresh_in', 'zoom_thresh_out', 'use_fist_safety',
+                    'use_open_hand_safety', 'server_filter', 'use_client_smoothing', 'use_prediction')
+            for key in keys:
+                if key in data:
+                    setattr(props, key, data[key])
+
             send_config(props, context)
             self.report({'INFO'}, "Settings Loaded")
         except Exception as e:
             self.report({'ERROR'}, f"Load Failed: {e}")
-            
+
         return {'FINISHED'}
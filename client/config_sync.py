@@ -0,0 +1,144 @@
+import json
+import socket
+import time
+
+from . import protocol
+
+
+class ConfigSync:
+    """
+    Sends settings changes to the server's config port.
+
+    Property callbacks only `push()` the new values. `tick()` runs from a Blender
+    timer and coalesces everything pushed since the last send into one message
+    of the keys that differ from what the server has acknowledged. It sends at
+    most `MAX_RATE` messages per second, so dragging a slider no longer floods
+    the server. Every message carries an increasing version; the server answers
+    with a `config_ack`, and unacknowledged messages are retransmitted.
+
+    Uses one persistent socket and must not touch `bpy`.
+    """
+    SERVER_IP = '127.0.0.1'
+    CONFIG_PORT = 5556
+    MAX_RATE = 20.0         # Messages per second while settings keep changing
+    RETRY_INTERVAL = 0.25   # Seconds without an ack before retransmitting
+    MAX_RETRIES = 8         # Give up after this many sends until the next change
+
+    def __init__(self):
+        self.sock = None
+        self.version = 0
+
+        self._desired = {}    # Latest values from the UI
+        self._acked = {}      # Values the server has confirmed
+        self._in_flight = None  # (version, changes, sent_at, attempts) of the unacknowledged message
+        self._last_send = float('-inf')
+        self._failed = False
+
+        # Counters
+        self.pushes = 0
+        self.messages_sent = 0
+        self.retransmits = 0
+        self.acks = 0
+
+    def _socket(self):
+        if self.sock is None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+        return self.sock
+
+    def push(self, config):
+        """Records new setting values; they go out with the next `tick()`."""
+        self._desired.update(config)
+        self._failed = False
+        self.pushes += 1
+
+    def resync(self):
+        """Forgets what the server acknowledged, so the next tick sends every key again."""
+        self._acked = {}
+        self._in_flight = None
+        self._failed = False
+
+    def pending(self):
+        """Keys whose current value the server has not acknowledged yet."""
+        return {key: value for key, value in self._desired.items()
+                if key not in self._acked or self._acked[key] != value}
+
+    def _send(self, version, changes, now):
+        try:
+            self._socket().sendto(protocol.config_message(version, changes), (self.SERVER_IP, self.CONFIG_PORT))
+        except OSError as e:
+            print(f"[GestureNav] Config Send Error: {e}")
+        self._last_send = now
+        self.messages_sent += 1
+
+    def _read_acks(self):
+        while self.sock is not None:
+            try:
+                data, addr = self.sock.recvfrom(1024)
+            except (BlockingIOError, socket.timeout):
+                return
+            except OSError:
+                # e.g. ICMP port unreachable while the server is down
+                return
+            try:
+                version = json.loads(data.decode('utf-8')).get('config_ack', {}).get('version')
+            except (ValueError, AttributeError):
+                continue
+            if self._in_flight is not None and version == self._in_flight[0]:
+                self._acked.update(self._in_flight[1])
+                self._in_flight = None
+                self.acks += 1
+
+    def tick(self, now=None):
+        """
+        Sends or retransmits if needed.
+
+        Returns:
+            float: Seconds until the next tick, or None when nothing is pending
+                   (the Blender timer then unregisters itself).
+        """
+        if now is None:
+            now = time.perf_counter()
+        self._read_acks()
+
+        changes = self.pending()
+        if not changes or self._failed:
+            self._in_flight = None
+            return None
+
+        interval = 1.0 / self.MAX_RATE
+        if self._in_flight is None or self._in_flight[1] != changes:
+            # New content: coalesce into one message, rate limited
+            if now - self._last_send < interval:
+                return interval - (now - self._last_send)
+            self.version += 1
+            self._in_flight = (self.version, changes, now, 1)
+            self._send(self.version, changes, now)
+            return interval
+
+        version, changes, sent_at, attempts = self._in_flight
+        if now - sent_at >= self.RETRY_INTERVAL:
+            if attempts >= self.MAX_RETRIES:
+                print("[GestureNav] Config not acknowledged, is the server running?")
+                self._failed = True
+                self._in_flight = None
+                return None
+            self._in_flight = (version, changes, now, attempts + 1)
+            self._send(version, changes, now)
+            self.retransmits += 1
+        return interval
+
+    def get_stats(self):
+        return {
+            'version': self.version,
+            'pushes': self.pushes,
+            'sent': self.messages_sent,
+            'retransmits': self.retransmits,
+            'acks': self.acks,
+            'pending': len(self.pending())
+        }
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
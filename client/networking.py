@@ -1,55 +1,64 @@
 import bpy
 import socket
-import json
 import logging
-from mathutils import Quaternion, Vector
+from mathutils import Quaternion
+
+from .receiver import PacketReceiver
+from .config import send_config
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Receiver of the running listener (read by the UI for its stats)
+_active_receiver = None
+
+
+def get_receiver_stats():
+    """Returns the running listener's packet counters, or None when stopped."""
+    if _active_receiver is None:
+        return None
+    return _active_receiver.get_stats()
+
+
 class GestureNav_OT_Start(bpy.types.Operator):
     """Start the GestureNav UDP Listener"""
     bl_idname = "gesturenav.start"
     bl_label = "Start Listener"
-    
+
     _timer = None
     _sock = None
-    
+
     # State for Smoothing (EMA)
     _current_speed_x = 0.0
     _current_speed_y = 0.0
-    
+
+    _receiver = None
+
     # Constants
-    ALPHA = 0.1 
-    
+    ALPHA = 0.1
+
     def modal(self, context, event):
         scene = context.scene
         props = getattr(scene, "gesture_nav", None)
-        
+
         if not props or not props.listening:
             return self.cancel(context)
-            
+
         if event.type == 'TIMER':
-            try:
-                data, addr = self._sock.recvfrom(1024)
-                message = data.decode('utf-8')
+            # The receive thread has already drained the socket; apply only the newest packet
+            payload = self._receiver.take()
+            if payload is not None:
                 try:
-                    payload = json.loads(message)
                     if payload.get('state') == 'active':
                         self.process_navigation(context, payload)
                     else:
                         # Decay speed to 0 if hand is lost
                         self.process_navigation(context, {'x': 0.0, 'y': 0.0, 'zoom': 0})
-                        
-                except json.JSONDecodeError:
-                    print(f"[GestureNav] Malformed JSON: {message}")
-            except BlockingIOError:  
-                pass
-            except Exception as e:
-                print(f"[GestureNav] Error: {e}")
-                
+                except Exception as e:
+                    print(f"[GestureNav] Error: {e}")
+
         return {'PASS_THROUGH'}
-        
+
     def find_view3d(self, context):
         for area in context.screen.areas:
             if area.type == 'VIEW_3D':
@@ -74,62 +83,101 @@ class GestureNav_OT_Start(bpy.types.Operator):
             except Exception as e:
                 print(f"[GestureNav] Op Error (Legacy API): {e}")
 
+    def orbit_view(self, r3d, yaw, pitch):
+        """
+        Orbits the view by writing `region_3d.view_rotation` directly, once per tick.
+
+        Matches `view3d.view_orbit` (ORBITRIGHT with angle=-yaw, then ORBITUP with angle=pitch).
+        The operator right-multiplies the internal view quaternion, which is the inverse of
+        `view_rotation`. Expressed on `view_rotation` the two steps become:
+            yaw (world Z axis):  rot = Q(Z, -yaw) @ rot
+            pitch (view X axis): rot = Q(rot @ X, -pitch) @ rot = rot @ Q(X, -pitch)
+        so both compose into a single quaternion.
+
+        Returns:
+            bool: False if the caller should fall back to the operator path.
+        """
+        if r3d is None or r3d.view_perspective == 'CAMERA' or getattr(r3d, "lock_rotation", False):
+            # Camera views and locked (quad) views need the operator's extra handling
+            return False
+
+        try:
+            rotation = Quaternion((0.0, 0.0, 1.0), -yaw) @ r3d.view_rotation @ Quaternion((1.0, 0.0, 0.0), -pitch)
+            rotation.normalize()
+            r3d.view_rotation = rotation
+            # Leave "Top/Front/..." ortho presets the same way the operator does
+            if getattr(r3d, "is_orthographic_side_view", False):
+                r3d.is_orthographic_side_view = False
+        except Exception as e:
+            print(f"[GestureNav] Direct Orbit Error: {e}")
+            return False
+        return True
+
     def process_navigation(self, context, payload):
         scene = context.scene
         props = getattr(scene, "gesture_nav", None)
-        if not props: return
+        if not props:
+            return
 
         target_x = payload.get('x', 0.0)
         target_y = payload.get('y', 0.0)
-        
+
         orbit_sens = props.orbit_sensitivity
-        
-        self._current_speed_x = ((target_x * orbit_sens) * self.ALPHA) + (self._current_speed_x * (1.0 - self.ALPHA))
-        self._current_speed_y = ((target_y * orbit_sens) * self.ALPHA) + (self._current_speed_y * (1.0 - self.ALPHA))
-        
+
+        # The server already filters the landmarks; the EMA is optional extra smoothing
+        alpha = self.ALPHA if props.use_client_smoothing else 1.0
+        self._current_speed_x = ((target_x * orbit_sens) * alpha) + (self._current_speed_x * (1.0 - alpha))
+        self._current_speed_y = ((target_y * orbit_sens) * alpha) + (self._current_speed_y * (1.0 - alpha))
+
         # 2. Context Setup
         area = context.area
         region = context.region
-        
+
         if not area or area.type != 'VIEW_3D':
             area, region = self.find_view3d(context)
-            
+
         if not area:
             return
-            
-        # Get 3D Region Data (for manual zoom)
+
+        # Get 3D Region Data (for direct orbit and manual zoom)
         r3d = None
         if area.spaces.active.type == 'VIEW_3D':
             r3d = area.spaces.active.region_3d
-            
-        # Context Override for bpy.ops
-        override = {
-            'window': context.window,
-            'screen': context.screen,
-            'area': area,
-            'region': region,
-            'scene': context.scene,
-        }
-        
+
         # 3. Apply Orbit
-        if abs(self._current_speed_x) > 0.001:
-            self.run_ops(bpy.ops.view3d.view_orbit, override, angle=-self._current_speed_x, type='ORBITRIGHT')
+        yaw = self._current_speed_x if abs(self._current_speed_x) > 0.001 else 0.0
+        pitch = self._current_speed_y if abs(self._current_speed_y) > 0.001 else 0.0
+
+        if (yaw or pitch) and not self.orbit_view(r3d, yaw, pitch):
+            # Fallback: operator path (camera views, missing region data)
+            override = {
+                'window': context.window,
+                'screen': context.screen,
+                'area': area,
+                'region': region,
+                'scene': context.scene,
+            }
+            if yaw:
+                self.run_ops(bpy.ops.view3d.view_orbit, override, angle=-yaw, type='ORBITRIGHT')
+            if pitch:
+                self.run_ops(bpy.ops.view3d.view_orbit, override, angle=pitch, type='ORBITUP')
+
+        if yaw or pitch:
+            area.tag_redraw()
 
-        if abs(self._current_speed_y) > 0.001:
-            self.run_ops(bpy.ops.view3d.view_orbit, override, angle=self._current_speed_y, type='ORBITUP')
-                
         # 4. Apply Zoom (Manual Distance for Smoothness)
         zoom_state = payload.get('zoom', 0)
         if zoom_state != 0 and r3d:
             zoom_sens = props.zoom_sensitivity
             step = 0.01 * zoom_sens
             r3d.view_distance -= zoom_state * step
-            if area: area.tag_redraw()
+            if area:
+                area.tag_redraw()
 
     def invoke(self, context, event):
         scene = context.scene
         props = getattr(scene, "gesture_nav", None)
-        
+
         if not props:
             self.report({'ERROR'}, "GestureNav Properties not found. Please reload addon.")
             return {'CANCELLED'}
@@ -139,9 +187,14 @@ class GestureNav_OT_Start(bpy.types.Operator):
 
         try:
             self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._sock.bind(('127.0.0.1', 5555))
+            try:
+                self._sock.bind(('127.0.0.1', 5555))
+            except OSError:
+                # Another Blender session has the default port: any port works, the server
+                # streams to the address our hello comes from
+                self._sock.bind(('127.0.0.1', 0))
             self._sock.setblocking(False)
-            print("[GestureNav] Socket bound to 127.0.0.1:5555")
+            print(f"[GestureNav] Socket bound to 127.0.0.1:{self._sock.getsockname()[1]}")
         except OSError as e:
             self.report({'ERROR'}, f"Socket Error: {e}")
             return {'CANCELLED'}
@@ -150,11 +203,20 @@ class GestureNav_OT_Start(bpy.types.Operator):
         wm = context.window_manager
         self._timer = wm.event_timer_add(0.016, window=context.window)
         wm.modal_handler_add(self)
-        
+
         # Reset state
         self._current_speed_x = 0.0
         self._current_speed_y = 0.0
-        
+
+        # Push every setting once: the server may have (re)started with its defaults
+        send_config(props, context, full=True)
+
+        # Background receive (also negotiates the binary protocol with the server)
+        global _active_receiver
+        self._receiver = PacketReceiver(self._sock)
+        self._receiver.start()
+        _active_receiver = self._receiver
+
         print("[GestureNav] Listener Started")
         return {'RUNNING_MODAL'}
 
@@ -162,23 +224,29 @@ class GestureNav_OT_Start(bpy.types.Operator):
         wm = context.window_manager
         if self._timer:
             wm.event_timer_remove(self._timer)
+        global _active_receiver
+        if self._receiver:
+            self._receiver.stop()
+            self._receiver = None
+        _active_receiver = None
         if self._sock:
             self._sock.close()
             self._sock = None
-        
+
         scene = context.scene
         props = getattr(scene, "gesture_nav", None)
         if props:
             props.listening = False
-            
+
         print("[GestureNav] Listener Stopped")
         return {'FINISHED'}
 
+
 class GestureNav_OT_Stop(bpy.types.Operator):
     """Stop the GestureNav UDP Listener"""
     bl_idname = "gesturenav.stop"
     bl_label = "Stop Listener"
-    
+
     def execute(self, context):
         scene = context.scene
         props = getattr(scene, "gesture_nav", None)
@@ -0,0 +1,107 @@
+"""
+GestureNav wire protocol, client side (see docs/PROTOCOL.md).
+
+Copy of the decoding half of server/networking/protocol.py. The add-on is
+installed on its own, so it cannot import the server package. Keep both in sync.
+"""
+import json
+import struct
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary/1"
+PROTOCOL_BINARY_V2 = "binary/2"
+
+# Offered in the hello, most preferred first
+CLIENT_PROTOCOLS = [PROTOCOL_BINARY_V2, PROTOCOL_BINARY, PROTOCOL_JSON]
+
+MAGIC = b"GN"
+BINARY_VERSION = 1
+PACKET = struct.Struct("<2sBBbxIdff")
+PACKET_SIZE = PACKET.size
+
+# binary/2: same header, pad byte = hand count, followed by one record per hand
+BINARY_VERSION_HANDS = 2
+HEADER_V2 = struct.Struct("<2sBBbBIdff")
+HAND_RECORD = struct.Struct("<BBBbff")
+
+STATE_NAMES = {0: 'idle', 1: 'active'}
+HAND_NAMES = {0: None, 1: 'Left', 2: 'Right'}
+
+# Packets at most this far behind the newest one are treated as reordered and dropped
+REORDER_WINDOW = 64
+
+
+def hello():
+    """Handshake sent to the server's config port."""
+    return json.dumps({'hello': {'protocols': CLIENT_PROTOCOLS}}).encode('utf-8')
+
+
+def bye():
+    """Ends the subscription of the socket it is sent from."""
+    return json.dumps({'bye': {}}).encode('utf-8')
+
+
+def config_message(version, changes):
+    """Versioned config update, acknowledged by the server with `{"config_ack": {"version": ...}}`."""
+    return json.dumps({'config': changes, 'version': version}).encode('utf-8')
+
+
+def decode_packet(data):
+    """
+    Decodes a gesture packet in either encoding.
+
+    Returns:
+        dict: {'state', 'x', 'y', 'zoom', 'seq', 'ts', 'hands'} (seq / ts are None for legacy JSON
+              senders, hands lists the per-hand {'id', 'hand', 'state', 'x', 'y', 'zoom'}),
+              or None for non-gesture messages (e.g. the hello acknowledgement).
+
+    Raises:
+        ValueError: If the packet is malformed.
+    """
+    if len(data) >= PACKET_SIZE and data[:2] == MAGIC:
+        magic, version, state, zoom, count, seq, timestamp, x, y = HEADER_V2.unpack_from(data)
+        if version == BINARY_VERSION:
+            expected = PACKET_SIZE
+        elif version == BINARY_VERSION_HANDS:
+            expected = PACKET_SIZE + count * HAND_RECORD.size
+        else:
+            raise ValueError(f"Unsupported binary packet version: {version}")
+        if len(data) != expected:
+            raise ValueError(f"Binary packet has {len(data)} bytes, expected {expected}")
+
+        hands = []
+        if version == BINARY_VERSION_HANDS:
+            for offset in range(PACKET_SIZE, expected, HAND_RECORD.size):
+                track_id, hand, hand_state, hand_zoom, hand_x, hand_y = HAND_RECORD.unpack_from(data, offset)
+                hands.append({'id': track_id, 'hand': HAND_NAMES.get(hand),
+                              'state': STATE_NAMES.get(hand_state, 'idle'), 'x': hand_x, 'y': hand_y,
+                              'zoom': hand_zoom})
+        return {'state': STATE_NAMES.get(state, 'idle'), 'x': x, 'y': y, 'zoom': zoom,
+                'seq': seq, 'ts': timestamp, 'hands': hands}
+
+    payload = json.loads(data.decode('utf-8'))
+    if not isinstance(payload, dict):
+        raise ValueError(f"JSON packet is a {type(payload).__name__}, not an object")
+    if 'state' not in payload:
+        return None
+    payload.setdefault('seq', None)
+    payload.setdefault('ts', None)
+    payload.setdefault('hands', [])
+    return payload
+
+
+def is_newer(seq, last_seq):
+    """
+    True if `seq` comes after `last_seq`, allowing for 32-bit wrap-around.
+
+    A small step backwards is a reordered (stale) packet. A large one means the
+    server restarted its counter, so the packet is accepted.
+    """
+    if seq is None or last_seq is None:
+        return True
+    delta = (seq - last_seq) & 0xFFFFFFFF
+    if delta == 0:
+        return False
+    if delta < 0x80000000:
+        return True
+    return 0x100000000 - delta > REORDER_WINDOW
@@ -0,0 +1,165 @@
+import json
+import socket
+import threading
+import time
+
+from . import protocol
+
+
+class PacketReceiver:
+    """
+    Receives gesture packets on a background thread.
+
+    The thread drains the socket as fast as packets arrive and publishes only the
+    newest one into a single slot. The modal operator picks it up once per timer
+    tick with `take()`, so a burst of packets never queues up behind the viewport.
+
+    The slot is lock-free: only the receive thread writes it (as an immutable
+    `(counter, payload)` tuple) and `take()` only reads it.
+
+    The server streams to every client that subscribed with a hello, so several
+    Blender sessions can share one server. The thread repeats the hello every
+    `HELLO_INTERVAL` seconds as a keep-alive (the server drops subscribers after
+    a few silent seconds) and `stop()` says bye.
+
+    Must not touch `bpy`: everything Blender-related stays on the main thread.
+    """
+    SERVER_IP = '127.0.0.1'
+    CONFIG_PORT = 5556
+    HELLO_INTERVAL = 1.0  # Also the keep-alive interval of the subscription
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._thread = None
+        self._running = False
+
+        # Latest-packet slot
+        self._slot = (0, None)
+        self._taken = 0
+
+        # Protocol State
+        self.protocol = protocol.PROTOCOL_JSON
+        self._last_seq = None
+        self._last_hello = float('-inf')
+        self.subscribed = False
+        self.latency_ms = 0.0
+        self.hands = 0
+
+        # Counters
+        self.packets_received = 0
+        self.packets_stale = 0
+        self.packets_superseded = 0
+        self.packets_malformed = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def start(self):
+        """Starts the receive thread and subscribes to the server's gesture stream."""
+        self.sock.settimeout(0.1)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="GestureNavReceiver", daemon=True)
+        self._thread.start()
+        self.send_hello()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        try:
+            self.sock.sendto(protocol.bye(), (self.SERVER_IP, self.CONFIG_PORT))
+        except OSError:
+            pass
+
+    def _run(self):
+        while self._running:
+            # Keep-alive (rate limited to HELLO_INTERVAL)
+            self.send_hello()
+            try:
+                data, addr = self.sock.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                # Socket closed under us
+                break
+
+            try:
+                self._handle(data)
+            except ValueError:
+                self.packets_malformed += 1
+                print(f"[GestureNav] Malformed packet: {data[:64]!r}")
+            except Exception as e:
+                print(f"[GestureNav] Receive Error: {e}")
+
+    def _handle(self, data):
+        payload = protocol.decode_packet(data)
+        if payload is None:
+            self._handle_control(data)
+            return
+
+        if not protocol.is_newer(payload['seq'], self._last_seq):
+            # Reordered / stale packet
+            self.packets_stale += 1
+            return
+
+        self._last_seq = payload['seq']
+        if payload['ts'] is not None:
+            self.latency_ms = (time.perf_counter() - payload['ts']) * 1000.0
+        if self.protocol != protocol.PROTOCOL_JSON and data[:2] != protocol.MAGIC:
+            # JSON while binary was negotiated: the server restarted
+            self.send_hello()
+
+        self.hands = len(payload['hands'])
+        self.packets_received += 1
+        self._slot = (self.packets_received, payload)
+
+    def _handle_control(self, data):
+        """Handles non-gesture messages from the server."""
+        message = json.loads(data.decode('utf-8'))
+        if 'hello_ack' in message:
+            chosen = message['hello_ack'].get('protocol', protocol.PROTOCOL_JSON)
+            if not self.subscribed or chosen != self.protocol:
+                # Keep-alive acks change nothing; only a new subscription resets seq tracking
+                self.protocol = chosen
+                self._last_seq = None
+                self.subscribed = True
+                print(f"[GestureNav] Subscribed, server protocol: {self.protocol}")
+
+    def send_hello(self):
+        """Subscribes (or renews the subscription) and offers the binary protocol (answered with a hello_ack)."""
+        now = time.perf_counter()
+        if now - self._last_hello < self.HELLO_INTERVAL:
+            return
+        self._last_hello = now
+        try:
+            self.sock.sendto(protocol.hello(), (self.SERVER_IP, self.CONFIG_PORT))
+        except OSError as e:
+            print(f"[GestureNav] Hello Error: {e}")
+
+    def take(self):
+        """
+        Returns the newest packet received since the last call, or None.
+        Older packets that arrived in between are counted as superseded.
+        """
+        counter, payload = self._slot
+        depth = counter - self._taken
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        if depth <= 0:
+            return None
+        self.packets_superseded += depth - 1
+        self._taken = counter
+        return payload
+
+    def get_stats(self):
+        return {
+            'protocol': self.protocol,
+            'received': self.packets_received,
+            'stale': self.packets_stale,
+            'superseded': self.packets_superseded,
+            'malformed': self.packets_malformed,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'latency_ms': self.latency_ms,
+            'hands': self.hands
+        }
@@ -1,4 +1,7 @@
 import bpy
+from .networking import get_receiver_stats
+from .config import get_config_sync_stats
+
 
 class GESTURENAV_PT_Panel(bpy.types.Panel):
     """Creates a Panel in the 3D View Sidebar"""
@@ -11,9 +14,9 @@ class GESTURENAV_PT_Panel(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         scene = context.scene
-        
+
         props = getattr(scene, "gesture_nav", None)
-        
+
         if not props:
             layout.label(text="Error: Properties not found")
             return
@@ -23,10 +26,22 @@ class GESTURENAV_PT_Panel(bpy.types.Panel):
         if props.listening:
             box.operator("gesturenav.stop", text="Stop Listener", icon='CANCEL')
             box.label(text="Status: Listening...", icon='REC')
+
+            stats = get_receiver_stats()
+            if stats:
+                col = box.column(align=True)
+                col.label(text=f"Protocol: {stats['protocol']}  |  Latency: {stats['latency_ms']:.0f} ms")
+                col.label(text=f"Packets: {stats['received']}  |  Stale: {stats['stale'] + stats['superseded']}")
+                col.label(text=f"Queue Depth: {stats['queue_depth']} (max {stats['max_queue_depth']})")
+                if stats['hands']:
+                    col.label(text=f"Tracked Hands: {stats['hands']}")
+                sync = get_config_sync_stats()
+                state = "pending" if sync['pending'] else "synced"
+                col.label(text=f"Config: v{sync['version']} {state}  |  Retransmits: {sync['retransmits']}")
         else:
             box.operator("gesturenav.start", text="Start Listener", icon='PLAY')
             box.label(text="Status: Idle", icon='PAUSE')
-            
+
         # Presets & Management
         layout.separator()
         layout.label(text="Management", icon='FILE_TICK')
@@ -34,41 +49,48 @@ class GESTURENAV_PT_Panel(bpy.types.Panel):
         row.operator("gesturenav.save", text="Save Settings")
         row.operator("gesturenav.load", text="Load Settings")
         layout.operator("gesturenav.reset", text="Reset Defaults", icon='LOOP_BACK')
-            
+
         # Settings
         layout.separator()
         layout.label(text="Tuning (Real-time)", icon='PREFERENCES')
-        
+
         # Deadzone
         box = layout.box()
         box.label(text="Orbit Deadzone")
-        
+
         row = box.row(align=True)
         op = row.operator("gesturenav.preset", text="Right Hand")
         op.side = 'RIGHT'
         op = row.operator("gesturenav.preset", text="Left Hand")
         op.side = 'LEFT'
-        
+
         box.prop(props, "deadzone_radius", text="Size")
         row = box.row(align=True)
         row.prop(props, "deadzone_x", text="X Pos")
         row.prop(props, "deadzone_y", text="Y Pos")
-        
+
         # Sensitivity
         box = layout.box()
         box.label(text="Sensitivity")
         box.prop(props, "orbit_sensitivity", text="Orbit Speed (Client)")
         box.prop(props, "zoom_sensitivity", text="Zoom Speed (Client)")
         box.prop(props, "orbit_sens_server", text="Response Curve (Server)")
-        
+
         # Zoom Thresholds
         box = layout.box()
         box.label(text="Zoom Triggers")
         box.prop(props, "zoom_thresh_in", text="Pinch In <")
         box.prop(props, "zoom_thresh_out", text="Pinch Out >")
-        
+
         # Safety
         box = layout.box()
         box.label(text="Safety Locks")
         box.prop(props, "use_fist_safety", text="Fist Locks Zoom")
         box.prop(props, "use_open_hand_safety", text="Open Hand Locks Orbit")
+
+        # Smoothing
+        box = layout.box()
+        box.label(text="Smoothing")
+        box.prop(props, "server_filter", text="Server")
+        box.prop(props, "use_prediction", text="Latency Compensation")
+        box.prop(props, "use_client_smoothing", text="Client EMA (adds lag)")
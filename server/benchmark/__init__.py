@@ -0,0 +1,7 @@
+"""
+Benchmarks for the GestureNav server pipeline.
+
+Run from the repository root, e.g.:
+    python -m server.benchmark.latency --source session.mp4 --output latency.json
+    python -m server.benchmark.startup --runs 5
+"""
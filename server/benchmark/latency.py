@@ -0,0 +1,381 @@
+"""
+End-to-end latency benchmark.
+
+Drives the server pipeline from a replayed or synthetic frame source and times
+each stage, from reading the frame to the stand-in client applying the delta:
+
+    pacing -> capture -> process_frame -> tracks -> smoothing -> prediction -> analyze -> send_gesture -> client_apply
+
+`pacing` is the time a paced replay waits for the next frame (the camera's frame
+interval, not pipeline cost), and `capture` only the decode / copy of the frame.
+`end_to_end` starts at the frame's capture time (when the frame is available, as
+from a camera) and ends when the stand-in client has applied the delta.
+
+Packets go through the server's `NetworkCore`, as in production: `send_gesture` is the
+hand-off to the network thread, and `client_apply` covers the subscriber fan-out, the
+UDP hop and the stand-in client (subscribed with a hello) decoding and applying it.
+
+Results (p50/p95/p99 per stage and end to end) are written as JSON so runs
+can be compared between releases. Per-hand work (track matching + gesture
+smoothing + analysis) is also reported per hand, and swept over 1..--hands synthetic hands
+to check that it scales linearly with the hand count.
+
+With --predict, the latency-compensated wrist / fingertip positions are
+compared against ground truth: the detector's own landmarks of the same hand
+at the predicted time, interpolated from the later frames of the recording.
+The error without prediction is reported next to it.
+
+The gesture fan-out is swept over 1..--subscribers local subscribers (doubling)
+to show how the send cost grows when several clients share one server.
+
+Usage:
+    python -m server.benchmark.latency --source session.mp4 --output latency.json
+    python -m server.benchmark.latency --frames 600 --fast
+"""
+import argparse
+import json
+import platform
+import socket
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from server.config import settings
+from server.benchmark.receiver import StandInReceiver
+from server.benchmark.timing import StageTimer
+from server.networking import protocol
+from server.networking.core import NetworkCore
+from server.networking.subscribers import SubscriberRegistry
+from server.vision.frame_source import open_frame_source
+from server.vision.gesture_analysis import GestureDecider
+from server.vision.hand_tracking import HandTracker, TrackingResult
+from server.vision.hand_tracks import HandTrackManager
+from server.vision.smoothing import LandmarkSmoother
+from server.vision.prediction import LandmarkPredictor, PREDICTED_LANDMARKS
+
+
+def synthetic_frames(count=300, width=640, height=480):
+    """
+    Generates a deterministic (count, height, width, 3) stack of BGR frames
+    with a bright blob moving across a noisy background.
+    """
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 64, size=(height, width, 3), dtype=np.uint8)
+    frames = np.empty((count, height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        frame = frames[i]
+        frame[:] = background
+        t = i / max(count - 1, 1)
+        center = (int(width * (0.2 + 0.6 * t)), int(height * (0.5 + 0.2 * np.sin(t * 6.28))))
+        cv2.circle(frame, center, height // 8, (180, 200, 230), -1)
+    return frames
+
+
+def synthetic_hands(count, frames=100):
+    """
+    Generates `frames` TrackingResults with `count` (21, 3) hands each, spread
+    across the frame and drifting slowly, for the per-hand scaling sweep.
+    """
+    rng = np.random.default_rng(1)
+    shape = rng.uniform(-0.08, 0.08, size=(21, 3)).astype(np.float32)
+    results = []
+    for i in range(frames):
+        hands = []
+        for h in range(count):
+            hand = shape.copy()
+            hand[:, 0] += (h + 0.5) / count + 0.002 * i
+            hand[:, 1] += 0.5
+            hands.append(hand)
+        results.append(TrackingResult(hands, [[] for _ in hands], i / 30.0))
+    return results
+
+
+def measure_hand_scaling(decider, max_hands, frames=300):
+    """
+    Times track matching, smoothing and gesture analysis for 1..max_hands synthetic hands.
+
+    Returns:
+        list: One dict per hand count with the mean time per frame and per hand (microseconds).
+    """
+    rows = []
+    for count in range(1, max_hands + 1):
+        track_manager = HandTrackManager()
+        smoother = LandmarkSmoother()
+        results = synthetic_hands(count, frames)
+        start = time.perf_counter()
+        for result in results:
+            tracks = track_manager.update(result)
+            smoother.apply(tracks, result.capture_time)
+            decider.analyze_tracks(tracks)
+        elapsed = time.perf_counter() - start
+        per_frame_us = elapsed / frames * 1e6
+        rows.append({'hands': count, 'per_frame_us': per_frame_us, 'per_hand_us': per_frame_us / count})
+    return rows
+
+
+def measure_fanout(max_subscribers, samples=1000):
+    """
+    Times `SubscriberRegistry.send` for 1, 2, 4, ... max_subscribers local UDP subscribers.
+
+    Returns:
+        list: One dict per subscriber count with the mean time per sample and per subscriber (microseconds).
+    """
+    hands = [{'id': 0, 'hand': 'Right', 'state': 'active', 'x': 0.1, 'y': -0.2, 'zoom': 0},
+             {'id': 1, 'hand': 'Left', 'state': 'active', 'x': 0.0, 'y': 0.0, 'zoom': 1}]
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rows = []
+    count = 1
+    while count <= max_subscribers:
+        registry = SubscriberRegistry()
+        sockets = []
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind((settings.DEFAULT_IP, 0))
+            sockets.append(sock)
+            registry.subscribe(sock.getsockname(), list(protocol.SUPPORTED_PROTOCOLS))
+        start = time.perf_counter()
+        for seq in range(samples):
+            registry.send(sender.sendto, 'active', 0.1, -0.2, 0, seq, time.perf_counter(), hands)
+        elapsed = time.perf_counter() - start
+        for sock in sockets:
+            sock.close()
+        per_sample_us = elapsed / samples * 1e6
+        rows.append({'subscribers': count, 'per_sample_us': per_sample_us,
+                     'per_subscriber_us': per_sample_us / count})
+        count *= 2
+    sender.close()
+    return rows
+
+
+def prediction_error(truth, predictions):
+    """
+    Compares predicted landmarks with where the hand actually was at the predicted time.
+
+    Args:
+        truth (dict): track_id -> list of (capture_time, (K, 3) raw landmarks).
+        predictions (list): (track_id, target_time, predicted (K, 3), unpredicted (K, 3)).
+
+    Returns:
+        dict: Sample count and mean / p95 xy error (normalized units) with and without prediction.
+    """
+    predicted_errors, unpredicted_errors = [], []
+    for track_id, target_time, predicted, unpredicted in predictions:
+        samples = truth.get(track_id, [])
+        if len(samples) < 2 or not samples[0][0] <= target_time <= samples[-1][0]:
+            # Hand left the recording before the predicted time
+            continue
+        times = np.array([sample[0] for sample in samples])
+        points = np.stack([sample[1] for sample in samples])
+        i = min(int(np.searchsorted(times, target_time)), len(times) - 1)
+        j = max(i - 1, 0)
+        span = times[i] - times[j]
+        weight = (target_time - times[j]) / span if span > 0 else 1.0
+        actual = points[j] + (points[i] - points[j]) * weight
+        predicted_errors.append(np.linalg.norm((predicted - actual)[:, :2], axis=1).mean())
+        unpredicted_errors.append(np.linalg.norm((unpredicted - actual)[:, :2], axis=1).mean())
+
+    if not predicted_errors:
+        return {'samples': 0}
+    return {
+        'samples': len(predicted_errors),
+        'predicted_mean_error': float(np.mean(predicted_errors)),
+        'predicted_p95_error': float(np.percentile(predicted_errors, 95)),
+        'unpredicted_mean_error': float(np.mean(unpredicted_errors)),
+        'unpredicted_p95_error': float(np.percentile(unpredicted_errors, 95))
+    }
+
+
+def run_benchmark(source, tracker, decider, sender, receiver, warmup=10, predictor=None):
+    """
+    Runs every frame of `source` through the pipeline.
+
+    Returns:
+        tuple: (StageTimer, frame_count, wall_time_seconds, prediction_report)
+    """
+    timer = StageTimer()
+    track_manager = HandTrackManager()
+    smoother = LandmarkSmoother()
+    predictor = predictor or LandmarkPredictor()
+    truth = {}
+    predictions = []
+    frame_count = 0
+    start_wall = time.perf_counter()
+
+    while source.isOpened():
+        read_start = time.perf_counter()
+        success, frame = source.read()
+        capture_time = time.perf_counter()
+        if not success:
+            break
+        pacing = source.last_wait
+
+        stage_start = time.perf_counter()
+        processed_image, detection_result = tracker.process_frame(frame, capture_time)
+        process_end = time.perf_counter()
+
+        tracks = track_manager.update(detection_result)
+        tracks_end = time.perf_counter()
+
+        if detection_result is not None:
+            smoother.apply(tracks, detection_result.capture_time)
+        smoothing_end = time.perf_counter()
+
+        unpredicted = [track.landmarks[PREDICTED_LANDMARKS] for track in tracks]
+        horizon = 0.0
+        if detection_result is not None:
+            horizon = predictor.apply(tracks, detection_result.capture_time, time.perf_counter())
+        prediction_end = time.perf_counter()
+
+        if horizon > 0:
+            # Ground truth: the detector's landmarks, one sample per captured frame
+            for track, base in zip(tracks, unpredicted):
+                samples = truth.setdefault(track.id, [])
+                if not samples or samples[-1][0] < detection_result.capture_time:
+                    samples.append((detection_result.capture_time, track.raw_landmarks[PREDICTED_LANDMARKS]))
+                predictions.append((track.id, detection_result.capture_time + horizon,
+                                    track.landmarks[PREDICTED_LANDMARKS], base))
+
+        gesture_data = decider.analyze_tracks(tracks)
+        analyze_end = time.perf_counter()
+
+        sender.send_gesture(
+            state=gesture_data['state'],
+            x=gesture_data['orbit_x'],
+            y=gesture_data['orbit_y'],
+            zoom=gesture_data['zoom_val'],
+            capture_time=capture_time,
+            hands=gesture_data['hands']
+        )
+        send_end = time.perf_counter()
+
+        applied = receiver.receive()
+        apply_end = time.perf_counter()
+
+        frame_count += 1
+        if frame_count <= warmup:
+            continue
+
+        timer.add('pacing', pacing)
+        timer.add('capture', capture_time - read_start - pacing)
+        timer.add('process_frame', process_end - stage_start)
+        timer.add('tracks', tracks_end - process_end)
+        timer.add('smoothing', smoothing_end - tracks_end)
+        timer.add('prediction', prediction_end - smoothing_end)
+        timer.add('analyze', analyze_end - prediction_end)
+        if tracks:
+            timer.add('per_hand', (analyze_end - process_end) / len(tracks))
+        timer.add('send_gesture', send_end - analyze_end)
+        if applied is not None:
+            timer.add('client_apply', apply_end - send_end)
+            timer.add('end_to_end', apply_end - capture_time)
+
+    report = prediction_error(truth, predictions) if predictor.config['use_prediction'] else None
+    return timer, frame_count, time.perf_counter() - start_wall, report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GestureNav end-to-end latency benchmark")
+    parser.add_argument("--source", default=None,
+                        help="Video file, .npy frame stack or image directory (default: synthetic frames)")
+    parser.add_argument("--frames", type=int, default=300, help="Number of synthetic frames")
+    parser.add_argument("--width", type=int, default=640, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=480, help="Synthetic frame height")
+    parser.add_argument("--fps", type=float, default=30.0, help="Replay FPS for synthetic / frame stack sources")
+    parser.add_argument("--fast", action="store_true", help="Replay as fast as possible instead of paced")
+    parser.add_argument("--running-mode", default=settings.RUNNING_MODE, help="HandTracker running mode")
+    parser.add_argument("--roi", action="store_true", default=settings.USE_ROI_INFERENCE,
+                        help="Run the detector on a crop around the last hand (needs --running-mode IMAGE, --hands 1)")
+    parser.add_argument("--predict", action="store_true",
+                        help="Enable latency compensation and report its error against the recording")
+    parser.add_argument("--hands", type=int, default=2,
+                        help="Maximum hands to track, also the upper end of the per-hand scaling sweep")
+    parser.add_argument("--protocol", default=protocol.PROTOCOL_BINARY, choices=protocol.SUPPORTED_PROTOCOLS,
+                        help="Gesture packet encoding")
+    parser.add_argument("--port", type=int, default=settings.DEFAULT_PORT + 100,
+                        help="UDP port for the stand-in client; the benchmark's network core uses the next two "
+                             "for config / subscriptions and control (default avoids a running server)")
+    parser.add_argument("--subscribers", type=int, default=8,
+                        help="Largest subscriber count of the fan-out sweep")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames excluded from the statistics")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.source is None:
+        frames = synthetic_frames(args.frames, args.width, args.height)
+        source = open_frame_source(frames, paced=not args.fast, fps=args.fps)
+        source_name = f"synthetic:{args.frames}x{args.width}x{args.height}"
+    else:
+        source = open_frame_source(args.source, paced=not args.fast, fps=args.fps)
+        source_name = args.source
+
+    tracker = HandTracker(running_mode=args.running_mode, use_roi=args.roi, max_hands=args.hands)
+    if tracker.detector is None:
+        # Without a detector process_frame returns immediately and every number would be meaningless
+        print("Error: the hand detector could not be created (is the model available?), no results written.",
+              file=sys.stderr)
+        source.release()
+        return 1
+    decider = GestureDecider()
+    sender = NetworkCore(port=args.port, config_port=args.port + 1, control_port=args.port + 2).start()
+    receiver = StandInReceiver(port=args.port, config_port=args.port + 1, protocols=[args.protocol])
+    if receiver.subscribe() is None:
+        print("Error: the network core did not acknowledge the stand-in client's hello.", file=sys.stderr)
+        receiver.close()
+        sender.close()
+        tracker.close()
+        source.release()
+        return 1
+    predictor = LandmarkPredictor()
+    predictor.update_config({'use_prediction': args.predict})
+
+    try:
+        timer, frame_count, wall_time, prediction_report = run_benchmark(
+            source, tracker, decider, sender, receiver, args.warmup, predictor)
+    finally:
+        source.release()
+        receiver.close()
+        sender.close()
+        tracker.close()
+    hand_scaling = measure_hand_scaling(decider, args.hands)
+    fanout = measure_fanout(args.subscribers)
+
+    report = {
+        'benchmark': 'latency',
+        'source': source_name,
+        'paced': not args.fast,
+        'running_mode': tracker.running_mode,
+        'max_hands': tracker.max_hands,
+        'tracker': tracker.get_stats(),
+        'protocol': receiver.protocol,
+        'frames': frame_count,
+        'throughput_fps': frame_count / wall_time if wall_time > 0 else 0.0,
+        'platform': {
+            'python': platform.python_version(),
+            'system': platform.platform(),
+            'opencv': cv2.__version__
+        },
+        'stages': timer.summary(),
+        'network': sender.get_stats(),
+        'hand_scaling': hand_scaling,
+        'fanout': fanout,
+        'prediction_error': prediction_report
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Wrote {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
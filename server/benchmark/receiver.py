@@ -0,0 +1,109 @@
+import json
+import socket
+import time
+
+from server.config import settings
+from server.networking import protocol
+
+
+class StandInReceiver:
+    """
+    Local stand-in for the Blender client.
+
+    Mirrors the parse path of `GestureNav_OT_Start.modal` / `process_navigation`
+    (recvfrom, packet decode, state check, optional EMA smoothing) without `bpy`,
+    so the benchmark can time a packet all the way to the viewport delta.
+
+    Subscribes to the server's gesture stream like the add-on: a hello from the
+    gesture socket to the config port, renewed every `HELLO_INTERVAL` seconds.
+    """
+    ALPHA = 0.1
+    ORBIT_SENSITIVITY = 0.02
+    HELLO_INTERVAL = 1.0
+
+    def __init__(self, ip=None, port=None, use_smoothing=False, config_port=None, protocols=None):
+        self.ip = ip or settings.DEFAULT_IP
+        self.port = port or settings.DEFAULT_PORT
+        self.config_port = config_port or settings.CONFIG_PORT
+        self.protocols = list(protocols or protocol.SUPPORTED_PROTOCOLS)
+        self.protocol = None
+        self._last_hello = None
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.ip, self.port))
+        self.sock.settimeout(1.0)
+
+        self.use_smoothing = use_smoothing
+        self._current_speed_x = 0.0
+        self._current_speed_y = 0.0
+        self.packets_received = 0
+
+    def _hello(self):
+        message = {'hello': {'protocols': self.protocols}}
+        self.sock.sendto(json.dumps(message).encode('utf-8'), (self.ip, self.config_port))
+        self._last_hello = time.perf_counter()
+
+    def subscribe(self, timeout=5.0):
+        """
+        Subscribes to the gesture stream and waits for the server's acknowledgement.
+
+        Returns:
+            str: The negotiated encoding, or None if the server did not answer.
+        """
+        deadline = time.perf_counter() + timeout
+        self._hello()
+        while time.perf_counter() < deadline:
+            try:
+                data, _ = self.sock.recvfrom(1024)
+            except socket.timeout:
+                self._hello()
+                continue
+            try:
+                ack = json.loads(data.decode('utf-8')).get('hello_ack')
+            except (UnicodeDecodeError, ValueError, AttributeError):
+                continue
+            if ack is not None:
+                self.protocol = ack.get('protocol')
+                return self.protocol
+        return None
+
+    def receive(self):
+        """
+        Blocks for one gesture packet and applies it (handshake replies are skipped).
+
+        Returns:
+            tuple: (delta_x, delta_y, zoom) as the client would apply them, or None on timeout.
+        """
+        if self._last_hello is not None and time.perf_counter() - self._last_hello > self.HELLO_INTERVAL:
+            # Keep the subscription alive (the add-on does this on its receive thread)
+            self._hello()
+
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(1024)
+            except socket.timeout:
+                return None
+            payload = protocol.decode_packet(data)
+            if payload is not None:
+                break
+
+        self.packets_received += 1
+        if payload.get('state') != 'active':
+            payload = {'x': 0.0, 'y': 0.0, 'zoom': 0}
+        return self.apply(payload)
+
+    def apply(self, payload):
+        """Same smoothing as `GestureNav_OT_Start.process_navigation`."""
+        target_x = payload.get('x', 0.0)
+        target_y = payload.get('y', 0.0)
+        alpha = self.ALPHA if self.use_smoothing else 1.0
+
+        self._current_speed_x = ((target_x * self.ORBIT_SENSITIVITY) * alpha) + \
+            (self._current_speed_x * (1.0 - alpha))
+        self._current_speed_y = ((target_y * self.ORBIT_SENSITIVITY) * alpha) + \
+            (self._current_speed_y * (1.0 - alpha))
+
+        return self._current_speed_x, self._current_speed_y, payload.get('zoom', 0)
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
@@ -0,0 +1,176 @@
+"""
+Startup benchmark: time from launching the server to the first gesture packet.
+
+Starts `python -m server.main --headless` as a fresh process (so imports are
+included), subscribes to its gesture stream like a client would (hello on the
+config port, repeated until acknowledged) and records, from the moment the
+process was spawned:
+
+    subscribed     the network core answered the hello
+    first_packet   the first gesture packet arrived
+    shutdown       the process exited after Ctrl+C (measured from the signal)
+
+The server's own breakdown (import, detector, camera, warm-up, ...) is read
+from the control channel's `startup` stats. Each number is the median over
+--runs runs.
+
+Usage:
+    python -m server.benchmark.startup --runs 5
+    python -m server.benchmark.startup --source 0 --output startup.json   # real webcam
+"""
+import argparse
+import json
+import os
+import platform
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from server.config import settings
+from server.networking import protocol
+
+REPO_ROOT = os.path.dirname(settings.SERVER_DIR)
+HELLO = json.dumps({'hello': {'protocols': list(protocol.SUPPORTED_PROTOCOLS)}}).encode('utf-8')
+
+
+def _query(sock, message, port):
+    sock.sendto(json.dumps(message).encode('utf-8'), (settings.DEFAULT_IP, port))
+    return json.loads(sock.recvfrom(65536)[0].decode('utf-8'))
+
+
+def _stop(process):
+    if os.name == 'nt':
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        process.send_signal(signal.SIGINT)
+
+
+def run_once(server_args, timeout=30.0):
+    """
+    Launches the server once and times it to its first gesture packet.
+
+    Returns:
+        dict: Seconds since spawn for 'subscribed' and 'first_packet', 'shutdown' seconds,
+              and the server's 'startup' stats (None where a step never happened).
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((settings.DEFAULT_IP, 0))
+    sock.settimeout(0.01)
+    row = {'subscribed': None, 'first_packet': None, 'shutdown': None, 'startup': None}
+
+    flags = subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
+    spawned = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-m', 'server.main', '--headless'] + server_args,
+                               cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=flags)
+    try:
+        while time.perf_counter() - spawned < timeout and process.poll() is None:
+            if row['subscribed'] is None:
+                sock.sendto(HELLO, (settings.DEFAULT_IP, settings.CONFIG_PORT))
+            try:
+                data, _ = sock.recvfrom(65536)
+            except (socket.timeout, ConnectionResetError):
+                continue
+            now = time.perf_counter() - spawned
+            if protocol.decode_packet(data) is not None:
+                row['first_packet'] = now
+                break
+            if 'hello_ack' in json.loads(data.decode('utf-8')):
+                row['subscribed'] = row['subscribed'] or now
+
+        if row['first_packet'] is not None:
+            sock.settimeout(1.0)
+            try:
+                row['startup'] = _query(sock, {'stats': {}}, settings.CONTROL_PORT)['stats'].get('startup')
+            except (socket.timeout, ValueError):
+                pass
+    finally:
+        stop_time = time.perf_counter()
+        if process.poll() is None:
+            _stop(process)
+        try:
+            process.wait(timeout=10.0)
+            row['shutdown'] = time.perf_counter() - stop_time
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        sock.close()
+    return row
+
+
+def _median(rows, key):
+    values = [row[key] for row in rows if row[key] is not None]
+    return statistics.median(values) if values else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GestureNav startup (time to first gesture packet) benchmark")
+    parser.add_argument("--source", default=None,
+                        help="Server --source (default: a short synthetic .npy recording; 0 = webcam)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of server launches")
+    parser.add_argument("--hands", type=int, default=settings.MAX_HANDS, help="Server --hands")
+    parser.add_argument("--workers", type=int, default=0, help="Server --workers")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Give up on a run after this many seconds")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp:
+        source = args.source
+        if source is None:
+            from server.benchmark.latency import synthetic_frames
+            source = os.path.join(temp, 'frames.npy')
+            np.save(source, synthetic_frames(60))
+        server_args = ['--source', source, '--loop', '--hands', str(args.hands), '--workers', str(args.workers)]
+
+        rows = []
+        for run in range(args.runs):
+            row = run_once(server_args, args.timeout)
+            print(f"Run {run + 1}/{args.runs}: first packet "
+                  f"{row['first_packet'] if row['first_packet'] is not None else float('nan'):.3f} s",
+                  file=sys.stderr)
+            rows.append(row)
+
+    steps = {}
+    for row in rows:
+        for step, seconds in (row['startup'] or {}).items():
+            steps.setdefault(step, []).append(seconds)
+
+    report = {
+        'benchmark': 'startup',
+        'source': args.source or 'synthetic',
+        'runs': args.runs,
+        'platform': {
+            'python': platform.python_version(),
+            'system': platform.platform()
+        },
+        'median_s': {
+            'subscribed': _median(rows, 'subscribed'),
+            'first_packet': _median(rows, 'first_packet'),
+            'shutdown': _median(rows, 'shutdown')
+        },
+        'server_steps_median_s': {step: statistics.median(values) for step, values in steps.items()},
+        'runs_detail': rows
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Wrote {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+
+class StageTimer:
+    """
+    Collects per-stage durations and summarizes them as percentiles.
+
+    Usage:
+        timer = StageTimer()
+        with timer.measure('analyze'):
+            decider.analyze(landmarks)
+        timer.add('end_to_end', seconds)
+        timer.summary()
+    """
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def measure(self, stage):
+        return _Measurement(self, stage)
+
+    def summary(self):
+        """
+        Returns:
+            dict: {stage: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}
+        """
+        return {stage: summarize(values) for stage, values in self.samples.items()}
+
+
+class _Measurement:
+    def __init__(self, timer, stage):
+        self.timer = timer
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def summarize(values):
+    """Summarizes durations in seconds as millisecond percentiles."""
+    if not values:
+        return {'count': 0}
+    data = np.asarray(values, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {
+        'count': int(data.size),
+        'mean_ms': float(data.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(data.max())
+    }
@@ -0,0 +1,107 @@
+"""
+Runtime configuration published as immutable, versioned snapshots.
+
+The network thread validates updates and swaps in a new snapshot;
+the vision loop grabs the current snapshot once per frame and reads every
+key from it. A single reference assignment is atomic in Python, so readers
+never see a half-applied update and never need a lock.
+"""
+import math
+import threading
+from collections.abc import Mapping
+
+
+class ConfigSnapshot(Mapping):
+    """Read-only mapping of config values with a version number."""
+    __slots__ = ('_values', 'version')
+
+    def __init__(self, values, version):
+        self._values = dict(values)
+        self.version = version
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"ConfigSnapshot(v{self.version}, {self._values})"
+
+
+def number(minimum=None, maximum=None):
+    """Validator: a finite float within [minimum, maximum]."""
+    def validate(value):
+        if isinstance(value, bool):
+            raise ValueError("expected a number")
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f"{value} is not a finite number")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise ValueError(f"{value} outside [{minimum}, {maximum}]")
+        return value
+    return validate
+
+
+def boolean(value):
+    """Validator: a JSON boolean."""
+    if not isinstance(value, bool):
+        raise ValueError("expected true or false")
+    return value
+
+
+def choice(*options):
+    """Validator: one of the given values."""
+    def validate(value):
+        if value not in options:
+            raise ValueError(f"expected one of {options}")
+        return value
+    return validate
+
+
+class RuntimeConfig:
+    """
+    Holds the current ConfigSnapshot of one component and publishes validated updates.
+
+    Args:
+        defaults (dict): Initial values. Only these keys can be updated.
+        validators (dict): key -> callable returning the cleaned value or raising ValueError.
+    """
+    def __init__(self, defaults, validators=None):
+        self.validators = validators or {}
+        self._snapshot = ConfigSnapshot(defaults, 0)
+        self._lock = threading.Lock()  # Serializes writers only
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def update(self, changes):
+        """
+        Validates `changes` and publishes a new snapshot if any value changed.
+        Unknown keys are ignored; invalid values are rejected (and logged) key by key.
+
+        Returns:
+            ConfigSnapshot: The current snapshot after the update.
+        """
+        with self._lock:
+            current = self._snapshot
+            values = dict(current)
+            for key, value in changes.items():
+                if key not in values:
+                    continue
+                validate = self.validators.get(key)
+                if validate is not None:
+                    try:
+                        value = validate(value)
+                    except (TypeError, ValueError) as e:
+                        print(f"Config Rejected: {key}={value!r} ({e})")
+                        continue
+                values[key] = value
+
+            if values != dict(current):
+                self._snapshot = ConfigSnapshot(values, current.version + 1)
+            return self._snapshot
@@ -7,17 +7,134 @@ import os
 DEFAULT_IP = "127.0.0.1"
 DEFAULT_PORT = 5555
 CONFIG_PORT = 5556
+CONTROL_PORT = 5557  # Control / stats channel (ping, stats requests)
+SUBSCRIBER_TIMEOUT = 5.0  # Seconds without a hello before a client stops receiving gestures
 
 # Paths
 # settings.py is in server/config/, so we go up one level to reach server/
 SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(SERVER_DIR, 'hand_landmarker.task')
+
+# Model (see server/vision/models.py)
+# Hand landmarker variants: file name, download URL and published SHA-256. A variant without a
+# 'sha256' is refused unless MODEL_TRUST_ON_FIRST_USE (or download_model.py --trust-on-first-use)
+# pins it to the checksum of the first copy seen.
+# Add an entry (a 'url', or None plus a pre-seeded file) to use another model build.
+MODEL_VARIANT = "float16"
+MODEL_BASE_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker"
+MODEL_VARIANTS = {
+    'float16': {
+        'file': 'hand_landmarker.task',
+        'url': MODEL_BASE_URL + "/float16/1/hand_landmarker.task",
+        'sha256': None  # Published SHA-256 of float16/1: not recorded yet, see MODEL_TRUST_ON_FIRST_USE
+    },
+    'float16-latest': {
+        'file': 'hand_landmarker_float16_latest.task',
+        'url': MODEL_BASE_URL + "/float16/latest/hand_landmarker.task",
+        'sha256': None  # "latest" moves between releases; pin it explicitly
+    }
+}
+# Per-user model cache (GESTURENAV_MODEL_DIR overrides it)
+HOME_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache')
+USER_CACHE_DIR = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or HOME_CACHE_DIR
+MODEL_CACHE_DIR = os.environ.get('GESTURENAV_MODEL_DIR') or os.path.join(USER_CACHE_DIR, 'GestureNav', 'models')
+MODEL_SEARCH_DIRS = [SERVER_DIR]  # Pre-seeded copies, used when the cache has none (offline machines)
+MODEL_OFFLINE = False             # Never download; only use cached or pre-seeded files
+MODEL_DOWNLOAD_TIMEOUT = 30.0     # Seconds
+MODEL_TRUST_ON_FIRST_USE = False  # Accept and pin variants without a published SHA-256 (explicit opt-in)
+
+# Capture
+CAMERA_INDEX = 0
+# Requested camera mode (None = driver default). Drivers fall back to their nearest supported mode.
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+CAMERA_FOURCC = "MJPG"   # Compressed: high FPS over USB (uncompressed YUYV is often limited to 5-15 FPS)
+CAMERA_BUFFER_SIZE = 1   # Frames queued in the driver; 1 = reads return the newest frame (not every backend obeys)
+
+# Camera Probe: measure each candidate mode at startup, use the fastest meeting the quality floor
+CAMERA_AUTO_PROBE = False
+CAMERA_PROBE_MODES = ["1280x720@60:MJPG", "1280x720@30:MJPG", "640x480@60:MJPG", "640x480@30:MJPG", "640x480@30:YUYV"]
+CAMERA_PROBE_FRAMES = 30   # Frames measured per mode
+CAMERA_PROBE_WARMUP = 5    # Frames discarded after each mode switch
+CAMERA_MIN_WIDTH = 640     # Quality floor (delivered frame size and measured FPS)
+CAMERA_MIN_HEIGHT = 480
+CAMERA_MIN_FPS = 24
+
+# Startup
+STARTUP_FRAME_TIMEOUT = 10.0   # Seconds to wait for the camera's first frame before giving up
 
 # Vision Model Options
+# MediaPipe running mode: "IMAGE", "VIDEO" (tracks between frames) or "LIVE_STREAM" (async)
+RUNNING_MODE = "VIDEO"
+
+# ROI Inference: run the detector on a padded, downscaled crop around the last hand.
+# Needs RUNNING_MODE = "IMAGE" and MAX_HANDS = 1 (VIDEO / LIVE_STREAM keep their own hand
+# tracking and get full frames); HandTracker warns at startup if it is ignored.
+USE_ROI_INFERENCE = False
+ROI_PADDING = 0.5        # Padding on each side, as a fraction of the hand box size
+ROI_MIN_SIZE = 160       # Minimum crop side (px, full frame)
+ROI_INPUT_SIZE = 256     # Crops are resized to this square size (px) before inference
 MIN_HAND_DETECTION_CONFIDENCE = 0.7
 MIN_HAND_PRESENCE_CONFIDENCE = 0.5
 MIN_TRACKING_CONFIDENCE = 0.5
 
+# Multi-Hand Tracking (ROI inference is only used with MAX_HANDS = 1)
+MAX_HANDS = 1
+TRACK_MAX_DISTANCE = 0.25      # Max wrist movement (normalized) between frames to keep a track ID
+TRACK_HANDEDNESS_PENALTY = 0.15  # Added to the match distance when the handedness label differs
+TRACK_TIMEOUT = 0.5            # Seconds a lost hand keeps its track ID
+
+# Hand roles when two hands are tracked (MediaPipe handedness, as seen by the user)
+DEFAULT_ORBIT_HAND = "Right"
+DEFAULT_ZOOM_HAND = "Left"
+
+# Multi-Process Inference (0 = run HandTracker in the main process)
+INFERENCE_WORKERS = 0
+RING_SLOTS_PER_WORKER = 2      # Shared-memory frame slots per worker
+RING_WAIT_TIMEOUT = 0.005      # Seconds to wait for a free slot before dropping a frame
+WORKER_RESULT_TIMEOUT = 0.5    # Seconds a worker result may lag the current frame before it is dropped
+WORKER_READY_TIMEOUT = 30.0    # Seconds warm-up waits for every worker to load and warm up its detector
+
+# Inference Scheduling
+USE_IDLE_SCHEDULER = True
+ACTIVE_INFERENCE_RATE = 0      # Hz while a hand is in view (0 = every frame)
+IDLE_INFERENCE_RATE = 2.0      # Hz while no hand is in view
+IDLE_ENTER_DELAY = 1.0         # Seconds without a hand before dropping to the idle rate
+MOTION_THRESHOLD = 3.0         # Mean abs. thumbnail difference (0-255) that wakes full-rate inference
+MOTION_DOWNSCALE = (32, 24)    # Thumbnail size (w, h) for the motion detector
+
+# Preview Window
+PREVIEW_FPS = 15.0             # Maximum preview refresh rate
+PREVIEW_SCALE = 0.75           # Preview resolution relative to the camera frame
+PREVIEW_QUEUE_SIZE = 1         # Frames waiting for the preview thread (older ones are dropped)
+PREVIEW_STATS_OVERLAY = False  # Draw an FPS / latency line into the preview
+
+# Stage Metrics (rolling per-stage timing of the vision loop)
+METRICS_WINDOW = 300           # Recent samples per stage used for percentiles (~10 s at 30 FPS)
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.035, 0.05, 0.1, 0.25, 1.0)  # Histogram bounds (s)
+METRICS_FILE_INTERVAL = 5.0    # Seconds between rewrites of the Prometheus text file (--metrics-file)
+
+# On-Demand Profiling (started over the control channel, see server/telemetry/profiler.py)
+PROFILE_DIR = os.path.join(SERVER_DIR, 'profiles')  # Collapsed stack / .prof output
+PROFILE_DEFAULT_SECONDS = 10.0
+PROFILE_MAX_SECONDS = 300.0
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples (200 Hz)
+
+# Landmark Smoothing (server side, per hand, all 21 landmarks)
+DEFAULT_FILTER_MODE = "one_euro"           # "one_euro", "kalman" or "off"
+DEFAULT_FILTER_MIN_CUTOFF = 1.0            # One-Euro: cutoff (Hz) at rest, lower = less jitter
+DEFAULT_FILTER_BETA = 20.0                 # One-Euro: cutoff increase per unit/s of speed, higher = less lag
+DEFAULT_FILTER_D_CUTOFF = 1.0              # One-Euro: cutoff (Hz) of the speed estimate
+DEFAULT_FILTER_PROCESS_NOISE = 1.0         # Kalman: acceleration noise ((units/s^2)^2)
+DEFAULT_FILTER_MEASUREMENT_NOISE = 1e-5    # Kalman: landmark noise (units^2)
+
+# Latency Compensation (extrapolates wrist / fingertips to the time the client applies the gesture)
+DEFAULT_USE_PREDICTION = False
+DEFAULT_PREDICTION_LEAD = 0.008            # Seconds added to the measured latency (half a client timer tick)
+DEFAULT_PREDICTION_MAX_HORIZON = 0.1       # Never extrapolate further than this (s)
+DEFAULT_PREDICTION_MAX_OFFSET = 0.05       # Max extrapolated distance per landmark (normalized)
+PREDICTION_HISTORY = 4                     # Samples in the per-hand velocity fit
+
 # Control Logic Defaults
 DEFAULT_DEADZONE_RADIUS = 0.12
 DEFAULT_DEADZONE_OFFSET_X = 0.75
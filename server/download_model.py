@@ -1,15 +1,65 @@
-import urllib.request
+"""
+Downloads (or checks) a hand landmarker model variant into the model cache.
+
+Usage:
+    python server/download_model.py                      # settings.MODEL_VARIANT
+    python server/download_model.py --variant float16-latest
+    python server/download_model.py --from hand_landmarker.task   # offline: seed the cache from a file
+    python server/download_model.py --list
+    python server/download_model.py --variant float16-latest --trust-on-first-use   # pin a variant without a checksum
+"""
+import argparse
 import os
+import sys
+
+# Also runnable as a plain script (start_server.bat), not only with `python -m`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.config import settings  # noqa: E402
+from server.vision.models import ModelStore, sha256_file  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download and verify the GestureNav hand landmarker model")
+    parser.add_argument("--variant", default=settings.MODEL_VARIANT, help="Model variant (settings.MODEL_VARIANTS)")
+    parser.add_argument("--force", action="store_true", help="Download again even if a cached copy exists")
+    parser.add_argument("--from", dest="source", default=None,
+                        help="Copy this local file into the cache instead of downloading")
+    parser.add_argument("--list", action="store_true", help="List the variants and where each one is found")
+    parser.add_argument("--trust-on-first-use", action="store_true", default=settings.MODEL_TRUST_ON_FIRST_USE,
+                        help="Accept a variant without a published SHA-256 and pin it to the file fetched now")
+    args = parser.parse_args(argv)
+
+    store = ModelStore(trust_on_first_use=args.trust_on_first_use)
+    if args.list:
+        for name, variant in store.variants.items():
+            path = store.cache_path(name)
+            state = "cached" if os.path.isfile(path) else "not cached"
+            default = " (default)" if name == settings.MODEL_VARIANT else ""
+            if variant.get('sha256'):
+                source = "published"
+            elif store.expected_sha256(name):
+                source = "pinned on first use"
+            else:
+                source = "no published checksum, needs --trust-on-first-use"
+            print(f"{name}{default}: {variant['file']}, {state}, "
+                  f"sha256 {store.expected_sha256(name) or 'none'} ({source})")
+        print(f"Cache: {store.cache_dir}")
+        return 0
+
+    try:
+        if args.source:
+            path = store.seed(args.variant, args.source)
+        elif args.force:
+            path = store.download(args.variant, force=True)
+        else:
+            path = store.resolve(args.variant)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Model '{args.variant}' OK: {path} (sha256 {sha256_file(path)})")
+    return 0
+
 
-url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-filename = os.path.join(os.path.dirname(__file__), "hand_landmarker.task")
-
-print(f"Downloading {filename}...")
-try:
-    urllib.request.urlretrieve(url, filename)
-    if os.path.exists(filename) and os.path.getsize(filename) > 0:
-        print("Download successful.")
-    else:
-        print("Download failed (empty file).")
-except Exception as e:
-    print(f"Error: {e}")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,141 +1,246 @@
-import cv2
+import argparse
 import time
-import socket
-import json
-import threading
 
 from server.config import settings
-from server.vision.hand_tracking import HandTracker
-from server.networking.udp_server import GestureSender
+from server.vision.hand_tracks import HandTrackManager
+from server.vision.smoothing import LandmarkSmoother
+from server.vision.prediction import LandmarkPredictor
+from server.vision.scheduler import InferenceScheduler
+from server.vision.startup import PipelineStartup
+from server.networking.core import NetworkCore
+from server.telemetry.metrics import StageMetrics, prometheus_text, write_prometheus
+from server.telemetry.profiler import Profiler
 from server.vision.gesture_analysis import GestureDecider
 
 # Global State for graceful shutdown
 stop_server = False
 
-def config_listener(decider: GestureDecider):
-    """Listens for configuration updates from Blender on Port 5556."""
-    UDP_PORT_CONFIG = settings.CONFIG_PORT
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    try:
-        sock.bind((settings.DEFAULT_IP, UDP_PORT_CONFIG))
-        sock.setblocking(False)
-        print(f"Config Listener started on port {UDP_PORT_CONFIG}")
-    except Exception as e:
-        print(f"Config Listener Error: {e}")
-        return
-
-    while not stop_server:
-        try:
-            data, addr = sock.recvfrom(1024)
-            new_config = json.loads(data.decode('utf-8'))
-            
-            # Update decider config safely
-            decider.update_config(new_config)
-            
-        except BlockingIOError:
-            time.sleep(0.1)
-        except Exception as e:
-            print(f"Config Parse Error: {e}")
-            
-    sock.close()
-
-def main():
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GestureNav Vision Server")
+    parser.add_argument("--source", default=None,
+                        help="Camera index, video file, .npy frame stack or image directory (default: webcam)")
+    parser.add_argument("--fast", action="store_true",
+                        help="Replay recorded sources as fast as possible instead of at their original FPS")
+    parser.add_argument("--loop", action="store_true", help="Loop recorded sources")
+    parser.add_argument("--fps", type=float, default=30.0, help="Replay FPS for .npy / image directory sources")
+    parser.add_argument("--probe-camera", action="store_true", default=settings.CAMERA_AUTO_PROBE,
+                        help="Measure the camera's candidate modes and use the fastest that meets the quality floor")
+    parser.add_argument("--hands", type=int, default=settings.MAX_HANDS,
+                        help="Maximum number of hands to track (2 = one hand orbits, the other zooms)")
+    parser.add_argument("--predict", action="store_true",
+                        help="Extrapolate hand landmarks by the measured pipeline latency")
+    parser.add_argument("--model", default=settings.MODEL_VARIANT, choices=sorted(settings.MODEL_VARIANTS),
+                        help="Hand landmarker model variant (settings.MODEL_VARIANTS)")
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_WORKERS,
+                        help="Run inference in N worker processes over a shared-memory frame ring (0 = in-process)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without the preview window (stop with Ctrl+C)")
+    parser.add_argument("--preview-fps", type=float, default=settings.PREVIEW_FPS,
+                        help="Maximum preview refresh rate")
+    parser.add_argument("--preview-scale", type=float, default=settings.PREVIEW_SCALE,
+                        help="Preview resolution relative to the camera frame")
+    parser.add_argument("--stats-overlay", action="store_true", default=settings.PREVIEW_STATS_OVERLAY,
+                        help="Show FPS and capture-to-send latency in the preview")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write stage timings and counters to this file in the Prometheus text format")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     global stop_server
+    args = parse_args(argv)
     print(f"Starting GestureNav Server (v1.8.0) on {settings.DEFAULT_IP}:{settings.DEFAULT_PORT}")
 
-    # 1. Initialize Components
-    tracker = HandTracker()
-    sender = GestureSender()
+    # 1. Build the detector and open the frame source in parallel, in the background
+    #    (frames are read on a dedicated thread, newest frame wins; with --workers N inference
+    #    runs in worker processes and frames are passed through a shared-memory ring)
+    startup = PipelineStartup(args.source, paced=not args.fast, loop=args.loop, fps=args.fps,
+                              workers=args.workers, max_hands=args.hands, model=args.model,
+                              probe=args.probe_camera)
+
+    # Initialize Components
+    track_manager = HandTrackManager()
+    smoother = LandmarkSmoother()
+    predictor = LandmarkPredictor()
+    if args.predict:
+        predictor.update_config({'use_prediction': True})
     decider = GestureDecider()
+    metrics = StageMetrics()
+    profiler = Profiler()  # Profiles this (the vision loop's) thread on request
+
+    # 2. Start the Network Core (gesture output, config input and control channel on one asyncio loop)
+    sender = NetworkCore(targets=(decider, smoother, predictor)).start()
+    sender.add_stats_provider('startup', startup.get_stats)
+
+    def export_metrics():
+        # Stage timings are exported as histograms; the other components' counters as gauges
+        stats = {name: values for name, values in sender.collect_stats().items() if name != 'stages'}
+        write_prometheus(args.metrics_file, prometheus_text(metrics, stats))
+
+    if args.metrics_file:
+        sender.call_every(settings.METRICS_FILE_INTERVAL, export_metrics)
 
-    # 2. Start Config Thread
-    cfg_thread = threading.Thread(target=config_listener, args=(decider,), daemon=True)
-    cfg_thread.start()
-
-    # 3. Setup Webcam
-    cap = cv2.VideoCapture(0)
-    
-    # Setup Window
-    window_name = 'GestureNav Vision (Tasks)'
-    cv2.namedWindow(window_name)
-    
-    # Initial Wait to allow camera to warm up
-    time.sleep(1.0)
-    
-    start_time = time.time()
+    # Set once startup succeeds; the shutdown path below only stops what was started
+    tracker = grabber = preview = scheduler = None
+    gesture_data = decider.analyze_tracks([])
+    first_packet = True
 
     try:
-        while cap.isOpened():
-            # Check for Window Close (X button)
-            try:
-                if cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
-                    stop_server = True
-            except:
-                pass 
+        # 3. Wait until the detector is warmed up and the source delivers frames (no fixed sleep)
+        tracker, grabber = startup.result()
+
+        # Setup Preview (rendered on its own thread; skipped entirely in headless mode)
+        if not args.headless:
+            from server.vision.preview import PreviewRenderer
+            preview = PreviewRenderer(tracker, max_fps=args.preview_fps, scale=args.preview_scale,
+                                      metrics=metrics, stats_overlay=args.stats_overlay).start()
+
+        # Inference scheduling (full rate while a hand is in view, low rate + motion wake-up when idle)
+        scheduler = InferenceScheduler() if settings.USE_IDLE_SCHEDULER else None
+        detection_result = None
+
+        # Served on the control channel ({"stats": {}})
+        sender.add_stats_provider('stages', metrics.get_stats)
+        sender.add_command('profile', profiler.handle)
+        sender.add_stats_provider('capture', grabber.get_stats)
+        if scheduler is not None:
+            sender.add_stats_provider('scheduler', scheduler.get_stats)
+        if preview is not None:
+            sender.add_stats_provider('preview', preview.get_stats)
+        if args.workers > 0:
+            sender.add_stats_provider('workers', tracker.get_stats)
+        else:
+            sender.add_stats_provider('tracker', tracker.get_stats)
+
+        while grabber.is_running():
+            # Window closed or Q / ESC pressed in the preview
+            if preview is not None and preview.closed:
+                stop_server = True
 
             if stop_server:
                 break
 
-            success, raw_image = cap.read()
+            # Switches cProfile on / off when requested over the control channel
+            profiler.poll()
+
+            loop_start = time.perf_counter()
+            success, raw_image, capture_time = grabber.read()
             if not success:
                 continue
-
-            # 4. Process Frame
-            # process_frame returns the image that was processed (flipped) and the result
-            processed_image, detection_result = tracker.process_frame(raw_image)
-            
-            # 5. Determine Gesture
-            hand_landmarks = detection_result.hand_landmarks[0] if detection_result and detection_result.hand_landmarks else None
-            gesture_data = decider.analyze(hand_landmarks)
-            
-            # 6. Send Data
-            sender.send_gesture(
-                state=gesture_data['state'],
-                x=gesture_data['orbit_x'],
-                y=gesture_data['orbit_y'],
-                zoom=gesture_data['zoom_val']
-            )
-
-            # 7. Visualization
-            # Draw Landmarks
-            tracker.draw_landmarks(processed_image, detection_result)
-            
-            # Draw UI Overlays (Text, Deadzone) from logic
-            h, w, _ = processed_image.shape
-            
-            # Deadzone Visual
-            dcx = int(w * decider.config['deadzone_offset_x'])
-            dcy = int(h * decider.config['deadzone_offset_y'])
-            dr = int(w * decider.config['deadzone_radius'])
-            cv2.circle(processed_image, (dcx, dcy), dr, (0, 255, 0), 1)
-            
-            # Status Text
-            joy_text = f"Joy: {gesture_data['orbit_x']:.2f}, {gesture_data['orbit_y']:.2f}"
-            cv2.putText(processed_image, joy_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            # Conditional Overlays (Errors/Warnings)
-            for text, pos, color in gesture_data['text_overlays']:
-                 cv2.putText(processed_image, text, pos, cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-
-            cv2.imshow(window_name, processed_image)
-            
-            # Check Exit Key
-            key = cv2.waitKey(5) & 0xFF
-            if key == 27 or key == ord('q') or key == ord('Q'):
-                stop_server = True
-                break
+            # Waiting for the camera (a slow camera shows up here) and the age of the frame we got
+            # (CPU contention in the loop shows up here)
+            stage_start = time.perf_counter()
+            metrics.observe('capture', stage_start - loop_start)
+            metrics.observe('frame_age', stage_start - capture_time)
+
+            # 4. Process Frame (the scheduler throttles inference while nobody is in view)
+            if scheduler is None or scheduler.should_infer(raw_image, capture_time):
+                # process_frame returns the (unflipped) frame and the result with mirrored landmarks,
+                # tagged with the capture time of the frame the landmarks came from
+                processed_image, detection_result = tracker.process_frame(raw_image, capture_time)
+                stage_end = time.perf_counter()
+                metrics.observe('process_frame', stage_end - stage_start)
+                stage_start = stage_end
+
+                # 5. Determine Gestures (per tracked hand, smoothed, combined by hand role)
+                tracks = track_manager.update(detection_result)
+                if detection_result is not None:
+                    smoother.apply(tracks, detection_result.capture_time)
+                    # Extrapolate to when the client will apply the gesture (no-op unless enabled)
+                    predictor.apply(tracks, detection_result.capture_time, time.perf_counter())
+                stage_end = time.perf_counter()
+                metrics.observe('tracking', stage_end - stage_start)
+                stage_start = stage_end
+
+                gesture_data = decider.analyze_tracks(tracks)
+                if scheduler is not None:
+                    scheduler.report(gesture_data['state'])
+                stage_end = time.perf_counter()
+                metrics.observe('analyze', stage_end - stage_start)
+                stage_start = stage_end
+
+                # 6. Send Data
+                sender.send_gesture(
+                    state=gesture_data['state'],
+                    x=gesture_data['orbit_x'],
+                    y=gesture_data['orbit_y'],
+                    zoom=gesture_data['zoom_val'],
+                    capture_time=detection_result.capture_time if detection_result else capture_time,
+                    hands=gesture_data['hands']
+                )
+                stage_end = time.perf_counter()
+                metrics.observe('send_gesture', stage_end - stage_start)
+                metrics.frame(detection_result.capture_time if detection_result else capture_time, stage_end)
+                if first_packet:
+                    first_packet = False
+                    startup.mark('first_packet_s')
+                    print("Startup: " + ", ".join(f"{step[:-2].replace('_', ' ')} {seconds:.2f} s"
+                                                  for step, seconds in startup.get_stats().items()))
+            else:
+                # Skipped frame: keep showing the preview with the last result
+                processed_image = raw_image
+
+            # 7. Visualization (hand-off only, drawing happens on the preview thread)
+            if preview is not None:
+                # The config snapshot is immutable, so it is handed over without a copy
+                preview.submit(processed_image, detection_result, gesture_data, decider.config)
 
     except KeyboardInterrupt:
         print("Stopping...")
     except Exception as e:
-        print(f"Main Loop Error: {e}")
+        print(f"Server Error: {e}")
     finally:
         stop_server = True
-        cap.release()
-        cv2.destroyAllWindows()
+        profiler.close()
+        if grabber is not None:
+            grabber.stop()
+        if preview is not None:
+            preview.stop()
+
+        if grabber is not None:
+            stats = grabber.get_stats()
+            print(f"Capture Stats: {stats['captured']} captured, {stats['consumed']} processed, "
+                  f"{stats['dropped']} dropped, frame age avg {stats['avg_frame_age_ms']:.1f} ms "
+                  f"/ max {stats['max_frame_age_ms']:.1f} ms")
+        if preview is not None:
+            stats = preview.get_stats()
+            print(f"Preview Stats: {stats['rendered']} rendered, {stats['dropped']} dropped")
+        if tracker is not None and args.workers > 0:
+            stats = tracker.get_stats()
+            print(f"Worker Stats: {stats['dispatched']} dispatched, {stats['results']} results, "
+                  f"{stats['dropped']} dropped, {stats['out_of_order']} out of order, {stats['stale']} stale, "
+                  f"{stats['workers_lost']} worker(s) lost")
+        if tracker is not None and args.workers == 0 and tracker.use_roi:
+            stats = tracker.get_stats()
+            print(f"ROI Stats: {stats['roi_frames']} ROI frames, {stats['full_frames']} full frames, "
+                  f"{stats['roi_misses']} ROI misses")
+        if scheduler is not None:
+            stats = scheduler.get_stats()
+            print(f"Scheduler Stats: active {stats['active_s']:.1f} s, idle {stats['idle_s']:.1f} s, "
+                  f"{stats['frames_inferred']} inferred, {stats['frames_skipped']} skipped, "
+                  f"{stats['wakeups']} motion wake-ups")
         sender.close()
-        tracker.close()
+        if args.metrics_file:
+            export_metrics()
+            print(f"Metrics written to {args.metrics_file}")
+        stats = metrics.get_stats()
+        print(f"Stage Stats (window {metrics.window} frames, {stats['fps']:.1f} FPS):")
+        for stage, summary in stats.items():
+            if isinstance(summary, dict) and summary['count']:
+                print(f"  {stage:<14} p50 {summary['p50_ms']:7.2f} ms | p95 {summary['p95_ms']:7.2f} ms "
+                      f"| max {summary['max_ms']:7.2f} ms")
+        stats = sender.get_stats()
+        print(f"Network Stats: {stats['samples']} samples, {stats['sent']} packets, {stats['send_errors']} errors, "
+              f"{stats['config_updates']} config updates, hand-off avg {stats['avg_handoff_ms']:.3f} ms "
+              f"/ max {stats['max_handoff_ms']:.3f} ms")
+        for count, cost in stats['send_cost_us'].items():
+            target = f"{count} subscriber(s)" if count else "legacy address"
+            print(f"  Fan-out to {target}: {cost:.1f} us per sample")
+        if tracker is not None:
+            tracker.close()
         print("Server shutdown complete.")
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,343 @@
+"""
+asyncio networking core of the server.
+
+All sockets live on one event loop, running on its own thread:
+
+    gesture output  (Server -> subscribers)            GestureOutputProtocol
+    config input    (CONFIG_PORT,  Client -> Server)   ConfigProtocol
+    control / stats (CONTROL_PORT, request -> reply)   ControlProtocol
+
+The vision loop stays on the main thread and hands results over with
+`NetworkCore.send_gesture`, which only schedules the send on the loop
+(`call_soon_threadsafe`). New network features (subscribers, acks, health
+checks) are added as protocol handlers here instead of as new threads.
+
+Clients subscribe to the gesture stream with a hello (see `SubscriberRegistry`),
+so any number of them can share one camera and inference pipeline.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+from server.config import settings
+from server.networking import protocol
+from server.networking.subscribers import SubscriberRegistry
+
+
+class GestureOutputProtocol(asyncio.DatagramProtocol):
+    """Unbound-peer UDP endpoint the gesture packets are sent from."""
+    def __init__(self, core):
+        self.core = core
+
+    def error_received(self, exc):
+        # e.g. ICMP port unreachable while no client is listening
+        self.core.send_errors += 1
+
+
+class ConfigProtocol(asyncio.DatagramProtocol):
+    """
+    Config input (see docs/PROTOCOL.md, section 5).
+
+    Message types:
+        `{"hello": {"protocols": [...]}}` subscribes the sender's address to the gesture
+            stream (or renews its subscription) with the best shared packet encoding,
+            and is acknowledged to that address.
+        `{"bye": {}}` ends the sender's subscription.
+        `{"config": {...}, "version": n}` is a versioned update from the client's config sync.
+            It is applied unless an equal or newer version from the same address was
+            already applied (retransmits / reordering), and always acknowledged. The
+            last applied version of an address is forgotten once it has been silent for
+            the subscriber timeout (see `expire`).
+        Any other object is a legacy, unversioned full config.
+
+    Config updates go to every target (decider, smoother, predictor); each validates the
+    keys it knows and publishes a new immutable config snapshot for the vision loop.
+    """
+    def __init__(self, core, targets):
+        self.core = core
+        self.targets = targets
+        self.transport = None
+        self.applied_versions = {}  # client address -> (last applied config version, last seen)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            message = json.loads(data.decode('utf-8'))
+
+            if 'hello' in message:
+                chosen, changed = self.core.subscribers.subscribe(addr, message['hello'].get('protocols', []))
+                self.transport.sendto(protocol.hello_ack(chosen), addr)
+                if changed:
+                    print(f"Client {addr[0]}:{addr[1]} subscribed with protocol '{chosen}' "
+                          f"({len(self.core.subscribers)} subscriber(s))")
+                return
+
+            if 'bye' in message:
+                self.applied_versions.pop(addr, None)
+                if self.core.subscribers.unsubscribe(addr):
+                    print(f"Client {addr[0]}:{addr[1]} unsubscribed ({len(self.core.subscribers)} subscriber(s))")
+                return
+
+            if 'config' in message:
+                version = message.get('version')
+                self.transport.sendto(protocol.config_ack(version), addr)
+                last, _ = self.applied_versions.get(addr, (None, None))
+                if version is not None and last is not None and version <= last:
+                    # Retransmit of an update we already applied
+                    self.applied_versions[addr] = (last, time.perf_counter())
+                    return
+                self.applied_versions[addr] = (version, time.perf_counter())
+                message = message['config']
+
+            # Publish new config snapshots (validated per target)
+            for target in self.targets:
+                target.update_config(message)
+            self.core.config_updates += 1
+
+        except Exception as e:
+            print(f"Config Parse Error: {e}")
+
+    def expire(self, timeout, now=None):
+        """
+        Forgets the config versions of addresses not heard from for `timeout` seconds.
+
+        The config sync sends from its own socket, so its address is not a subscriber's;
+        it is pruned on the same timeout instead. Returns the forgotten addresses.
+        """
+        if now is None:
+            now = time.perf_counter()
+        gone = [addr for addr, (_, last_seen) in self.applied_versions.items() if now - last_seen > timeout]
+        for addr in gone:
+            del self.applied_versions[addr]
+        return gone
+
+
+class ControlProtocol(asyncio.DatagramProtocol):
+    """
+    Control / stats channel. Every request is a JSON object answered to its source address:
+
+        `{"ping": <any>}`  -> `{"pong": <same>, "uptime": seconds}`   (health check)
+        `{"stats": {}}`    -> `{"stats": {<provider>: {...}, ...}}`
+        `{"<command>": {...}}` -> `{"<command>": <handler result>}`  (see `NetworkCore.add_command`)
+    """
+    def __init__(self, core):
+        self.core = core
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            request = json.loads(data.decode('utf-8'))
+            if 'ping' in request:
+                reply = {'pong': request['ping'], 'uptime': time.perf_counter() - self.core.started_at}
+            elif 'stats' in request:
+                reply = {'stats': self.core.collect_stats()}
+            else:
+                name = next((key for key in request if key in self.core.commands), None)
+                if name is None:
+                    reply = {'error': "unknown request"}
+                else:
+                    reply = {name: self.core.commands[name](request[name])}
+        except Exception as e:
+            reply = {'error': str(e)}
+        self.transport.sendto(json.dumps(reply, default=str).encode('utf-8'), addr)
+
+
+class NetworkCore:
+    """
+    Runs the server's UDP endpoints on an asyncio loop in a background thread.
+
+    The vision loop only calls `send_gesture` / `close`. Each sample is fanned out to
+    every subscriber; the cost of that fan-out is recorded per subscriber count.
+    """
+    EXPIRE_INTERVAL = 1.0  # Seconds between subscriber timeout checks
+
+    def __init__(self, targets=(), ip=None, port=None, config_port=None, control_port=None):
+        self.ip = ip or settings.DEFAULT_IP
+        self.port = port or settings.DEFAULT_PORT
+        self.config_port = config_port or settings.CONFIG_PORT
+        self.control_port = control_port or settings.CONTROL_PORT
+        self.targets = tuple(targets)
+
+        self.loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stop = None
+        self._output = None
+        self._config = None
+        self._stats_providers = {}
+        self.commands = {}
+        self.started_at = time.perf_counter()
+
+        self.seq = 0
+        self.subscribers = SubscriberRegistry(legacy_addr=(self.ip, self.port))
+
+        # Stats
+        self.samples_sent = 0
+        self.packets_sent = 0
+        self.send_errors = 0
+        self.config_updates = 0
+        self._handoff_total = 0.0
+        self.max_handoff = 0.0
+        self._send_cost = {}  # subscriber count -> [total seconds, samples]
+
+    def start(self):
+        """Starts the loop thread and waits until the endpoints are bound."""
+        self._thread = threading.Thread(target=self._run, name="GestureNavNetwork", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        finally:
+            self.loop.close()
+
+    async def _endpoint(self, name, factory, **kwargs):
+        try:
+            transport, _ = await self.loop.create_datagram_endpoint(factory, **kwargs)
+            return transport
+        except OSError as e:
+            print(f"{name} Error: {e}")
+            return None
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        self._output = await self._endpoint("Gesture Output", lambda: GestureOutputProtocol(self),
+                                            family=socket.AF_INET)
+        self._config = ConfigProtocol(self, self.targets)
+        config = await self._endpoint("Config Listener", lambda: self._config,
+                                      local_addr=(settings.DEFAULT_IP, self.config_port))
+        control = await self._endpoint("Control Channel", lambda: ControlProtocol(self),
+                                       local_addr=(settings.DEFAULT_IP, self.control_port))
+        print(f"Network core started: config / subscriptions on {self.config_port}, control on {self.control_port}")
+        self._ready.set()
+        self.loop.call_later(self.EXPIRE_INTERVAL, self._expire)
+
+        await self._stop.wait()
+        for transport in (self._output, config, control):
+            if transport is not None:
+                transport.close()
+
+    def _expire(self):
+        """Runs on the loop thread every `EXPIRE_INTERVAL` seconds."""
+        for addr in self.subscribers.expire():
+            print(f"Client {addr[0]}:{addr[1]} timed out ({len(self.subscribers)} subscriber(s))")
+        self._config.expire(self.subscribers.timeout)
+        self.loop.call_later(self.EXPIRE_INTERVAL, self._expire)
+
+    def send_gesture(self, state, x, y, zoom, capture_time=None, hands=None):
+        """
+        Thread-safe: schedules a gesture packet on the network loop and returns immediately.
+
+        Args:
+            state (str): The state of the gesture (e.g., "idle", "active").
+            x (float): The x-coordinate (orbit).
+            y (float): The y-coordinate (orbit).
+            zoom (int): The zoom value (-1, 0, 1).
+            capture_time (float): `time.perf_counter()` capture time of the source frame.
+                                  Defaults to now.
+            hands (list): Per-hand gestures ('hands' of `GestureDecider.analyze_tracks`).
+                          Sent by the json and binary/2 encodings only.
+        """
+        if self.loop is None or self.loop.is_closed():
+            return
+        if capture_time is None:
+            capture_time = time.perf_counter()
+        try:
+            self.loop.call_soon_threadsafe(self._send_gesture, state, x, y, zoom, capture_time, hands,
+                                           time.perf_counter())
+        except RuntimeError:
+            # Loop already shut down
+            pass
+
+    def _send_gesture(self, state, x, y, zoom, capture_time, hands, queued_at):
+        """Runs on the loop thread."""
+        handoff = time.perf_counter() - queued_at
+        self._handoff_total += handoff
+        self.max_handoff = max(self.max_handoff, handoff)
+
+        self.seq += 1
+        packet_hands = [{'id': hand['id'], 'hand': hand['hand'], 'state': hand['state'],
+                         'x': hand['orbit_x'], 'y': hand['orbit_y'], 'zoom': hand['zoom_val']}
+                        for hand in hands] if hands else ()
+        if self._output is None:
+            return
+        try:
+            subscribers = len(self.subscribers)
+            start = time.perf_counter()
+            self.packets_sent += self.subscribers.send(self._output.sendto, state, x, y, zoom, self.seq,
+                                                       capture_time, packet_hands)
+            cost = self._send_cost.setdefault(subscribers, [0.0, 0])
+            cost[0] += time.perf_counter() - start
+            cost[1] += 1
+            self.samples_sent += 1
+        except Exception as e:
+            self.send_errors += 1
+            print(f"Error sending gesture data: {e}")
+
+    def call_every(self, interval, callback):
+        """Runs `callback()` on the network thread every `interval` seconds. Thread-safe."""
+        def run():
+            try:
+                callback()
+            except Exception as e:
+                print(f"Periodic Task Error: {e}")
+            self.loop.call_later(interval, run)
+
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.call_later, interval, run)
+
+    def add_command(self, name, handler):
+        """
+        Registers a control channel command: `{name: args}` is answered with `{name: handler(args)}`.
+        The handler runs on the network thread and must not block.
+        """
+        self.commands[name] = handler
+
+    def add_stats_provider(self, name, get_stats):
+        """Registers a `get_stats()` callable whose dict is served on the control channel."""
+        self._stats_providers[name] = get_stats
+
+    def collect_stats(self):
+        stats = {'network': self.get_stats(), 'subscribers': self.subscribers.get_stats()}
+        for name, get_stats in self._stats_providers.items():
+            try:
+                stats[name] = get_stats()
+            except Exception as e:
+                stats[name] = {'error': str(e)}
+        return stats
+
+    def get_stats(self):
+        return {
+            'subscribers': len(self.subscribers),
+            'samples': self.samples_sent,
+            'sent': self.packets_sent,
+            'send_errors': self.send_errors,
+            'config_updates': self.config_updates,
+            'avg_handoff_ms': self._handoff_total / self.samples_sent * 1000.0 if self.samples_sent else 0.0,
+            'max_handoff_ms': self.max_handoff * 1000.0,
+            # Mean fan-out time per sample, by number of subscribers at the time (0 = legacy address)
+            'send_cost_us': {count: total / samples * 1e6
+                             for count, (total, samples) in sorted(self._send_cost.items())}
+        }
+
+    def close(self):
+        """Stops the loop (pending sends are flushed first) and joins its thread."""
+        if self.loop is not None and not self.loop.is_closed() and self._stop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._stop.set)
+            except RuntimeError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
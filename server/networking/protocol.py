@@ -0,0 +1,160 @@
+"""
+GestureNav wire protocol (see docs/PROTOCOL.md).
+
+Three encodings exist for gesture packets (Server -> Client, port 5555):
+    "json":     UTF-8 JSON object. The fallback, spoken by every client.
+    "binary/1": Fixed-size struct, selected through the hello handshake on the config port.
+    "binary/2": binary/1 header followed by one record per tracked hand.
+
+The Blender add-on ships its own copy of this module (client/protocol.py),
+since it is installed without the server package. Keep both in sync.
+"""
+import json
+import struct
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary/1"
+PROTOCOL_BINARY_V2 = "binary/2"
+
+# Preference order used during negotiation
+SUPPORTED_PROTOCOLS = (PROTOCOL_BINARY_V2, PROTOCOL_BINARY, PROTOCOL_JSON)
+
+# binary/1 layout (little endian, 26 bytes):
+#   magic     2s   b"GN"
+#   version   B    1
+#   state     B    0 = idle, 1 = active
+#   zoom      b    -1, 0, 1
+#   (pad)     x
+#   seq       I    packet counter, wraps at 2**32
+#   timestamp d    capture time of the source frame (time.perf_counter(), seconds)
+#   x         f    orbit x
+#   y         f    orbit y
+MAGIC = b"GN"
+BINARY_VERSION = 1
+PACKET = struct.Struct("<2sBBbxIdff")
+PACKET_SIZE = PACKET.size
+
+# binary/2: the binary/1 header with version 2 and the pad byte holding the hand count,
+# followed by that many 12-byte hand records (little endian):
+#   id        B    track ID (wraps at 256)
+#   hand      B    0 = unknown, 1 = left, 2 = right
+#   state     B    0 = idle, 1 = active
+#   zoom      b    -1, 0, 1
+#   x         f    orbit x of this hand
+#   y         f    orbit y of this hand
+BINARY_VERSION_HANDS = 2
+HEADER_V2 = struct.Struct("<2sBBbBIdff")
+HAND_RECORD = struct.Struct("<BBBbff")
+MAX_PACKET_HANDS = 255
+
+STATE_CODES = {'idle': 0, 'active': 1}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+HAND_CODES = {None: 0, 'Left': 1, 'Right': 2}
+HAND_NAMES = {code: name for name, code in HAND_CODES.items()}
+
+
+def encode_binary(state, x, y, zoom, seq, timestamp, hands=()):
+    # binary/1 has no per-hand fields
+    return PACKET.pack(MAGIC, BINARY_VERSION, STATE_CODES.get(state, 0), zoom,
+                       seq & 0xFFFFFFFF, timestamp, x, y)
+
+
+def encode_binary_v2(state, x, y, zoom, seq, timestamp, hands=()):
+    hands = hands[:MAX_PACKET_HANDS]
+    parts = [HEADER_V2.pack(MAGIC, BINARY_VERSION_HANDS, STATE_CODES.get(state, 0), zoom, len(hands),
+                            seq & 0xFFFFFFFF, timestamp, x, y)]
+    for hand in hands:
+        parts.append(HAND_RECORD.pack(hand['id'] & 0xFF, HAND_CODES.get(hand['hand'], 0),
+                                      STATE_CODES.get(hand['state'], 0), hand['zoom'], hand['x'], hand['y']))
+    return b"".join(parts)
+
+
+def encode_json(state, x, y, zoom, seq, timestamp, hands=()):
+    payload = {
+        'state': state,
+        'x': x,
+        'y': y,
+        'zoom': zoom,
+        'seq': seq & 0xFFFFFFFF,
+        'ts': timestamp
+    }
+    if hands:
+        payload['hands'] = list(hands)
+    return json.dumps(payload).encode('utf-8')
+
+
+ENCODERS = {
+    PROTOCOL_BINARY_V2: encode_binary_v2,
+    PROTOCOL_BINARY: encode_binary,
+    PROTOCOL_JSON: encode_json
+}
+
+
+def decode_packet(data):
+    """
+    Decodes a gesture packet in either encoding.
+
+    Returns:
+        dict: {'state', 'x', 'y', 'zoom', 'seq', 'ts', 'hands'} (seq / ts are None for legacy JSON
+              senders, hands is a list of {'id', 'hand', 'state', 'x', 'y', 'zoom'}, empty for
+              single-hand encodings), or None if the packet is not a gesture packet
+              (e.g. a handshake reply).
+
+    Raises:
+        ValueError: If the packet is malformed.
+    """
+    if len(data) >= PACKET_SIZE and data[:2] == MAGIC:
+        magic, version, state, zoom, count, seq, timestamp, x, y = HEADER_V2.unpack_from(data)
+        if version == BINARY_VERSION:
+            expected = PACKET_SIZE
+        elif version == BINARY_VERSION_HANDS:
+            expected = PACKET_SIZE + count * HAND_RECORD.size
+        else:
+            raise ValueError(f"Unsupported binary packet version: {version}")
+        if len(data) != expected:
+            raise ValueError(f"Binary packet has {len(data)} bytes, expected {expected}")
+
+        hands = []
+        if version == BINARY_VERSION_HANDS:
+            for offset in range(PACKET_SIZE, expected, HAND_RECORD.size):
+                track_id, hand, hand_state, hand_zoom, hand_x, hand_y = HAND_RECORD.unpack_from(data, offset)
+                hands.append({'id': track_id, 'hand': HAND_NAMES.get(hand),
+                              'state': STATE_NAMES.get(hand_state, 'idle'), 'x': hand_x, 'y': hand_y,
+                              'zoom': hand_zoom})
+        return {'state': STATE_NAMES.get(state, 'idle'), 'x': x, 'y': y, 'zoom': zoom,
+                'seq': seq, 'ts': timestamp, 'hands': hands}
+
+    payload = json.loads(data.decode('utf-8'))
+    if not isinstance(payload, dict):
+        raise ValueError(f"JSON packet is a {type(payload).__name__}, not an object")
+    if 'state' not in payload:
+        return None
+    payload.setdefault('seq', None)
+    payload.setdefault('ts', None)
+    payload.setdefault('hands', [])
+    return payload
+
+
+def negotiate(offered):
+    """
+    Picks the protocol to use from a client's hello.
+
+    Args:
+        offered (list): Protocol identifiers the client understands.
+
+    Returns:
+        str: The most preferred protocol both sides support (JSON if none match).
+    """
+    for protocol in SUPPORTED_PROTOCOLS:
+        if protocol in offered:
+            return protocol
+    return PROTOCOL_JSON
+
+
+def hello_ack(protocol):
+    return json.dumps({'hello_ack': {'protocol': protocol}}).encode('utf-8')
+
+
+def config_ack(version):
+    """Reply to a versioned config message (`{"config": {...}, "version": n}`)."""
+    return json.dumps({'config_ack': {'version': version}}).encode('utf-8')
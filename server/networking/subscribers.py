@@ -0,0 +1,121 @@
+import time
+
+from server.config import settings
+from server.networking import protocol
+
+
+class Subscriber:
+    """One client receiving the gesture stream, with its negotiated encoding."""
+    __slots__ = ('addr', 'protocol', 'registered_at', 'last_seen', 'sent')
+
+    def __init__(self, addr, protocol_name, now):
+        self.addr = addr
+        self.protocol = protocol_name
+        self.registered_at = now
+        self.last_seen = now
+        self.sent = 0
+
+
+class SubscriberRegistry:
+    """
+    Clients that receive the gesture stream of this server.
+
+    A client subscribes (or renews its subscription) by sending a hello to the
+    config port from its gesture socket; the hello's source address is where the
+    stream goes. Subscribers that send nothing for `timeout` seconds expire, and
+    a `bye` removes one immediately. This lets several Blender sessions share
+    one camera and one inference pipeline.
+
+    While nobody is subscribed, the stream goes to the legacy fixed address
+    (`DEFAULT_IP:DEFAULT_PORT`) as JSON, for clients that never send a hello.
+
+    Not thread-safe: used from the network loop only (and from benchmarks).
+    """
+    def __init__(self, timeout=None, legacy_addr=None):
+        self.timeout = settings.SUBSCRIBER_TIMEOUT if timeout is None else timeout
+        self.legacy_addr = legacy_addr or (settings.DEFAULT_IP, settings.DEFAULT_PORT)
+        self.subscribers = {}  # address -> Subscriber
+
+        # Counters
+        self.registered = 0
+        self.expired = 0
+        self.left = 0
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def subscribe(self, addr, offered, now=None):
+        """
+        Registers or renews a subscriber.
+
+        Args:
+            addr (tuple): (ip, port) the gesture packets go to.
+            offered (list): Encodings the client understands, most preferred first.
+
+        Returns:
+            tuple: (chosen encoding, True if the subscriber is new or changed encoding).
+        """
+        if now is None:
+            now = time.perf_counter()
+        chosen = protocol.negotiate(offered)
+        subscriber = self.subscribers.get(addr)
+        if subscriber is None:
+            self.subscribers[addr] = Subscriber(addr, chosen, now)
+            self.registered += 1
+            return chosen, True
+        subscriber.last_seen = now
+        changed = subscriber.protocol != chosen
+        subscriber.protocol = chosen
+        return chosen, changed
+
+    def unsubscribe(self, addr):
+        if self.subscribers.pop(addr, None) is not None:
+            self.left += 1
+            return True
+        return False
+
+    def expire(self, now=None):
+        """Drops subscribers not heard from for `timeout` seconds. Returns their addresses."""
+        if now is None:
+            now = time.perf_counter()
+        gone = [addr for addr, subscriber in self.subscribers.items() if now - subscriber.last_seen > self.timeout]
+        for addr in gone:
+            del self.subscribers[addr]
+        self.expired += len(gone)
+        return gone
+
+    def send(self, sendto, state, x, y, zoom, seq, capture_time, hands=()):
+        """
+        Fans one gesture sample out to every subscriber (or the legacy address).
+
+        Each encoding is serialized once per sample, however many subscribers use it.
+
+        Args:
+            sendto (callable): `sendto(packet, addr)` of a socket or datagram transport.
+
+        Returns:
+            int: Number of datagrams sent.
+        """
+        if not self.subscribers:
+            sendto(protocol.encode_json(state, x, y, zoom, seq, capture_time, hands), self.legacy_addr)
+            return 1
+
+        packets = {}
+        for subscriber in self.subscribers.values():
+            packet = packets.get(subscriber.protocol)
+            if packet is None:
+                packet = protocol.ENCODERS[subscriber.protocol](state, x, y, zoom, seq, capture_time, hands)
+                packets[subscriber.protocol] = packet
+            sendto(packet, subscriber.addr)
+            subscriber.sent += 1
+        return len(self.subscribers)
+
+    def get_stats(self):
+        return {
+            'subscribers': len(self.subscribers),
+            'registered': self.registered,
+            'expired': self.expired,
+            'left': self.left,
+            'clients': [{'addr': f"{addr[0]}:{addr[1]}", 'protocol': subscriber.protocol, 'sent': subscriber.sent}
+                        for addr, subscriber in self.subscribers.items()]
+        }
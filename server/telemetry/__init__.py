@@ -0,0 +1,3 @@
+"""
+Runtime telemetry of the GestureNav server (per-stage timing, metrics export).
+"""
@@ -0,0 +1,161 @@
+import bisect
+import os
+import time
+
+import numpy as np
+from server.config import settings
+
+
+class RollingHistogram:
+    """
+    Durations of one stage: cumulative bucket counts plus a ring of recent samples.
+
+    `observe()` is O(1) and allocation-free, so it can run on every frame. The
+    buckets (Prometheus style, since start) show the long-term distribution; the
+    ring (`window` samples) gives percentiles of the last few seconds only, so a
+    camera that just got slow shows up at once instead of being averaged away.
+    """
+    def __init__(self, window=None, buckets=None):
+        self.bounds = list(settings.METRICS_BUCKETS if buckets is None else buckets)
+        self.bucket_counts = [0] * (len(self.bounds) + 1)  # Last one is +Inf
+        self.count = 0
+        self.total = 0.0
+        self._ring = np.zeros(settings.METRICS_WINDOW if window is None else window, dtype=np.float64)
+        self._index = 0
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self._ring[self._index] = seconds
+        self._index = (self._index + 1) % self._ring.size
+
+    def recent(self):
+        """The samples currently in the window (oldest first is not guaranteed)."""
+        return self._ring[:min(self.count, self._ring.size)]
+
+    def summary(self):
+        """
+        Returns:
+            dict: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'} over the window,
+                  'count' since start.
+        """
+        data = self.recent() * 1000.0
+        if data.size == 0:
+            return {'count': 0}
+        p50, p95, p99 = np.percentile(data, [50, 95, 99])
+        return {
+            'count': self.count,
+            'mean_ms': float(data.mean()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(data.max())
+        }
+
+
+class StageMetrics:
+    """
+    Rolling timing of the vision loop stages, fed by the loop itself.
+
+    Usage:
+        metrics = StageMetrics()
+        start = time.perf_counter()
+        ...
+        metrics.observe('capture', time.perf_counter() - start)
+        metrics.frame(capture_time)
+
+    Written by the vision loop (and preview thread), read by the network thread
+    for stats requests and the metrics file. Readers may see a sample or two
+    less; no lock is taken on the hot path.
+    """
+    def __init__(self, window=None):
+        self.window = settings.METRICS_WINDOW if window is None else window
+        self.stages = {}
+        self._frame_times = np.zeros(self.window, dtype=np.float64)
+        self.frames = 0
+
+    def observe(self, stage, seconds):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = RollingHistogram(self.window)
+        histogram.observe(seconds)
+
+    def frame(self, capture_time, now=None):
+        """Marks the end of one processed frame; records the capture-to-send latency as 'latency'."""
+        if now is None:
+            now = time.perf_counter()
+        self.observe('latency', now - capture_time)
+        self._frame_times[self.frames % self.window] = now
+        self.frames += 1
+
+    def fps(self):
+        """Processed frames per second over the window."""
+        count = min(self.frames, self.window)
+        if count < 2:
+            return 0.0
+        times = self._frame_times[:count]
+        span = times.max() - times.min()
+        return (count - 1) / span if span > 0 else 0.0
+
+    def get_stats(self):
+        stats = {stage: histogram.summary() for stage, histogram in list(self.stages.items())}
+        stats['fps'] = self.fps()
+        return stats
+
+    def overlay_text(self):
+        """One short line for the preview: FPS and capture-to-send latency."""
+        latency = self.stages.get('latency')
+        summary = latency.summary() if latency is not None else {'count': 0}
+        if not summary['count']:
+            return f"{self.fps():.0f} FPS"
+        return f"{self.fps():.0f} FPS | latency p50 {summary['p50_ms']:.0f} ms / p95 {summary['p95_ms']:.0f} ms"
+
+
+def _prometheus_name(text):
+    return ''.join(c if c.isalnum() else '_' for c in text).lower()
+
+
+def prometheus_text(metrics, stats=None):
+    """
+    Renders the stage histograms (and numeric component counters) in the Prometheus text format.
+
+    Args:
+        metrics (StageMetrics): Stage timings, exported as the `gesturenav_stage_seconds` histogram.
+        stats (dict): Optional {component: {key: value}} (e.g. `NetworkCore.collect_stats()`);
+                      numeric values are exported as `gesturenav_<component>_<key>` gauges.
+
+    Returns:
+        str: The exposition text.
+    """
+    lines = ["# HELP gesturenav_stage_seconds Duration of each vision loop stage.",
+             "# TYPE gesturenav_stage_seconds histogram"]
+    for stage, histogram in list(metrics.stages.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.bounds + ['+Inf'], histogram.bucket_counts):
+            cumulative += count
+            lines.append(f'gesturenav_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'gesturenav_stage_seconds_sum{{stage="{stage}"}} {histogram.total:.9f}')
+        lines.append(f'gesturenav_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+    lines += ["# HELP gesturenav_fps Processed frames per second (rolling window).",
+              "# TYPE gesturenav_fps gauge",
+              f"gesturenav_fps {metrics.fps():.3f}"]
+
+    for component, values in (stats or {}).items():
+        if not isinstance(values, dict):
+            continue
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"gesturenav_{_prometheus_name(component)}_{_prometheus_name(key)}"
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, text):
+    """Replaces `path` atomically, so a scraper never reads a half-written file."""
+    temp = f"{path}.tmp"
+    with open(temp, 'w') as f:
+        f.write(text)
+    os.replace(temp, path)
@@ -0,0 +1,236 @@
+"""
+On-demand profiling of the running vision loop.
+
+Started for N seconds from the control channel, without restarting the server:
+
+    python -m server.telemetry.profiler --seconds 10
+    python -m server.telemetry.profiler --seconds 10 --mode cprofile
+
+Both modes write collapsed stacks (`frame;frame;frame count` per line), the
+input format of flamegraph.pl, speedscope and inferno:
+
+    sampling   A background thread samples the vision loop's stack every
+               `interval` seconds. Exact stacks, statistical counts.
+    cprofile   The vision loop runs under cProfile. Exact call counts and times,
+               also saved as a `.prof` file for pstats / snakeviz; the collapsed
+               stacks follow each function's heaviest caller, so they are approximate.
+
+While no profile is running, the only cost is one attribute check per frame
+in `Profiler.poll()`.
+"""
+import argparse
+import collections
+import cProfile
+import json
+import os
+import pstats
+import socket
+import sys
+import threading
+import time
+
+from server.config import settings
+from server.config.runtime import choice, number
+
+
+def _label(filename, firstlineno, name):
+    return f"{name} ({os.path.basename(filename)}:{firstlineno})"
+
+
+def _write_collapsed(path, counts):
+    with open(path, 'w') as f:
+        for stack, count in sorted(counts.items()):
+            if count > 0:
+                f.write(f"{stack} {count}\n")
+
+
+def collapse_pstats(stats):
+    """
+    Turns a cProfile call graph into collapsed stacks weighted by self time (microseconds).
+
+    cProfile only records caller -> callee edges, not whole stacks, so each function
+    is placed under the chain of its heaviest callers (by cumulative time).
+    """
+    counts = collections.Counter()
+    for func, (_, _, self_time, _, callers) in stats.stats.items():
+        chain = [func]
+        current = callers
+        while current:
+            parent = max(current, key=lambda caller: current[caller][3])
+            if parent in chain:
+                break
+            chain.append(parent)
+            current = stats.stats[parent][4] if parent in stats.stats else None
+        stack = ';'.join(_label(*frame) for frame in reversed(chain))
+        counts[stack] += int(self_time * 1e6)
+    return counts
+
+
+class Profiler:
+    """
+    Profiles one thread (the vision loop) on request.
+
+    `handle()` is the control channel command; the vision loop calls `poll()` once per
+    frame, which is where cProfile is switched on and off (it only sees the thread that
+    enables it). Files are written by a helper thread so the loop never waits on disk.
+    """
+    MODES = ('sampling', 'cprofile')
+    VALIDATORS = {
+        'seconds': number(0.1, settings.PROFILE_MAX_SECONDS),
+        'mode': choice(*MODES),
+        'interval': number(0.0005, 1.0)
+    }
+
+    def __init__(self, thread_id=None, output_dir=None):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.output_dir = output_dir or settings.PROFILE_DIR
+
+        self.active = None        # dict describing the running profile
+        self._pending = None      # cProfile request waiting for the next poll()
+        self._profile = None      # cProfile.Profile while enabled
+        self._sampler = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+        # Stats
+        self.runs = 0
+        self.last_output = None
+
+    def handle(self, args):
+        """
+        Control command `{"profile": {...}}`.
+
+        `{"seconds": 10, "mode": "sampling", "interval": 0.005}` starts a profile (all keys
+        optional), `{"stop": true}` ends it early, `{}` returns the status.
+        """
+        args = args or {}
+        if args.get('stop'):
+            return self.stop()
+        if not any(key in args for key in self.VALIDATORS):
+            return self.get_stats()
+        try:
+            options = {key: self.VALIDATORS[key](args[key]) for key in self.VALIDATORS if key in args}
+        except (TypeError, ValueError) as e:
+            return {'error': str(e)}
+        return self.start(**options)
+
+    def start(self, seconds=None, mode='sampling', interval=None):
+        seconds = settings.PROFILE_DEFAULT_SECONDS if seconds is None else seconds
+        interval = settings.PROFILE_SAMPLE_INTERVAL if interval is None else interval
+        with self._lock:
+            if self.active is not None:
+                return {'error': "a profile is already running", **self.active}
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            path = os.path.join(self.output_dir, f"gesturenav-{mode}-{stamp}.collapsed")
+            self.active = {'mode': mode, 'seconds': seconds, 'path': path}
+            self._cancel.clear()
+            deadline = time.perf_counter() + seconds
+            if mode == 'sampling':
+                self._sampler = threading.Thread(target=self._sample, args=(deadline, interval, path),
+                                                 name="GestureNavProfiler", daemon=True)
+                self._sampler.start()
+            else:
+                self._pending = (deadline, path)
+        print(f"Profiling ({mode}) for {seconds:.1f} s -> {path}")
+        return {'started': True, **self.active}
+
+    def stop(self):
+        """Ends the running profile early (its file is still written)."""
+        with self._lock:
+            if self.active is None:
+                return {'stopped': False}
+            self._cancel.set()
+        return {'stopped': True}
+
+    def _finished(self, path):
+        with self._lock:
+            self.active = None
+            self.runs += 1
+            self.last_output = path
+        print(f"Profile written to {path}")
+
+    def _sample(self, deadline, interval, path):
+        """Sampling thread: walks the target thread's stack every `interval` seconds."""
+        counts = collections.Counter()
+        while time.perf_counter() < deadline and not self._cancel.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            counts[';'.join(reversed(stack))] += 1
+            self._cancel.wait(interval)
+        _write_collapsed(path, counts)
+        self._finished(path)
+
+    def poll(self):
+        """Called by the profiled thread once per frame. Enables / disables cProfile."""
+        if self._pending is None:
+            return
+        deadline, path = self._pending
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif time.perf_counter() >= deadline or self._cancel.is_set():
+            self._profile.disable()
+            profile, self._profile, self._pending = self._profile, None, None
+            threading.Thread(target=self._write_cprofile, args=(profile, path), daemon=True).start()
+
+    def _write_cprofile(self, profile, path):
+        stats = pstats.Stats(profile)
+        stats.dump_stats(os.path.splitext(path)[0] + '.prof')
+        _write_collapsed(path, collapse_pstats(stats))
+        self._finished(path)
+
+    def close(self):
+        """Ends a running profile and writes its file. Call from the profiled thread at shutdown."""
+        self._cancel.set()
+        if self._profile is not None:
+            self._profile.disable()
+            profile, path = self._profile, self._pending[1]
+            self._profile, self._pending = None, None
+            self._write_cprofile(profile, path)
+        if self._sampler is not None:
+            self._sampler.join(timeout=2.0)
+            self._sampler = None
+
+    def get_stats(self):
+        return {
+            'active': dict(self.active) if self.active else None,
+            'runs': self.runs,
+            'last_output': self.last_output
+        }
+
+
+def main(argv=None):
+    """Asks a running server to profile itself (control channel command)."""
+    parser = argparse.ArgumentParser(description="Profile a running GestureNav server")
+    parser.add_argument("--seconds", type=float, default=settings.PROFILE_DEFAULT_SECONDS, help="Profile duration")
+    parser.add_argument("--mode", default='sampling', choices=Profiler.MODES, help="Profiler to use")
+    parser.add_argument("--interval", type=float, default=settings.PROFILE_SAMPLE_INTERVAL,
+                        help="Seconds between stack samples (sampling mode)")
+    parser.add_argument("--stop", action="store_true", help="End the running profile early")
+    parser.add_argument("--port", type=int, default=settings.CONTROL_PORT, help="Server control port")
+    args = parser.parse_args(argv)
+
+    command = {'stop': True} if args.stop else {'seconds': args.seconds, 'mode': args.mode, 'interval': args.interval}
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(2.0)
+    try:
+        sock.sendto(json.dumps({'profile': command}).encode('utf-8'), (settings.DEFAULT_IP, args.port))
+        reply = json.loads(sock.recvfrom(65536)[0].decode('utf-8'))
+    except socket.timeout:
+        print("No reply: is the server running?")
+        return 1
+    finally:
+        sock.close()
+    print(json.dumps(reply, indent=2))
+    return 0 if 'error' not in reply.get('profile', reply) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Camera mode negotiation and probing.
+
+Left alone, many webcam drivers pick their largest resolution as uncompressed
+YUYV, which USB bandwidth limits to a low frame rate, and queue several frames
+inside the driver, so every frame read is already a few frames old. The capture
+settings (`CAMERA_WIDTH`, `CAMERA_HEIGHT`, `CAMERA_FPS`, `CAMERA_FOURCC`,
+`CAMERA_BUFFER_SIZE`) are requested explicitly instead; drivers may still
+substitute the nearest mode they support, so the applied mode is read back.
+
+With `CAMERA_AUTO_PROBE` (or `--probe-camera`) each mode in `CAMERA_PROBE_MODES`
+is opened and measured (delivered size, FPS, time per `read()`), and the fastest
+one meeting the quality floor (`CAMERA_MIN_WIDTH`, `CAMERA_MIN_HEIGHT`,
+`CAMERA_MIN_FPS`) is used. To probe once and keep the result in `settings`:
+
+    python -m server.vision.camera_modes --source 0
+    python -m server.vision.camera_modes --source session.mp4   # video file backend (decodes unpaced)
+"""
+import argparse
+import json
+import sys
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from server.config import settings
+
+# Requested or applied capture mode; None fields are left to the driver
+CameraMode = namedtuple('CameraMode', ['width', 'height', 'fps', 'fourcc'])
+
+
+def parse_mode(text):
+    """Parses 'WIDTHxHEIGHT@FPS[:FOURCC]', e.g. '640x480@30:MJPG'."""
+    size, _, rest = text.partition('@')
+    fps, _, fourcc = rest.partition(':')
+    width, height = (int(v) for v in size.lower().split('x'))
+    return CameraMode(width, height, float(fps) if fps else None, fourcc or None)
+
+
+def format_mode(mode):
+    size = f"{mode.width}x{mode.height}" if mode.width and mode.height else "default"
+    fps = f"@{mode.fps:g}" if mode.fps else ""
+    fourcc = f":{mode.fourcc}" if mode.fourcc else ""
+    return f"{size}{fps}{fourcc}"
+
+
+def default_mode():
+    """The capture mode requested in `settings`."""
+    return CameraMode(settings.CAMERA_WIDTH, settings.CAMERA_HEIGHT, settings.CAMERA_FPS, settings.CAMERA_FOURCC)
+
+
+def _fourcc_text(value):
+    value = int(value)
+    text = ''.join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+    return text if value and text.isprintable() else None
+
+
+def configure_capture(capture, mode, buffer_size=None):
+    """
+    Requests `mode` on an opened `cv2.VideoCapture` and reads back what the driver applied.
+
+    The FOURCC is set first: on V4L2 and MSMF the available sizes and rates depend on it.
+    Backends that do not support a property (e.g. video files) keep their own value.
+
+    Returns:
+        CameraMode: The applied mode.
+    """
+    buffer_size = settings.CAMERA_BUFFER_SIZE if buffer_size is None else buffer_size
+    if mode.fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    if mode.width and mode.height:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        capture.set(cv2.CAP_PROP_FPS, mode.fps)
+    if buffer_size:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    return CameraMode(int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                      capture.get(cv2.CAP_PROP_FPS), _fourcc_text(capture.get(cv2.CAP_PROP_FOURCC)))
+
+
+def measure_capture(capture, frames=None, warmup=None):
+    """
+    Reads frames as fast as the capture delivers them.
+
+    Returns:
+        dict: Delivered 'width' / 'height' (of the frames, not the reported mode), measured 'fps',
+              'read_p50_ms' / 'read_p95_ms' per `read()` and the number of 'frames' read.
+    """
+    frames = settings.CAMERA_PROBE_FRAMES if frames is None else frames
+    warmup = settings.CAMERA_PROBE_WARMUP if warmup is None else warmup
+    # The first frames after a mode switch are often slow or black
+    for _ in range(warmup):
+        capture.read()
+
+    read_times = []
+    shape = None
+    start = time.perf_counter()
+    for _ in range(frames):
+        read_start = time.perf_counter()
+        success, frame = capture.read()
+        if not success:
+            break
+        read_times.append(time.perf_counter() - read_start)
+        shape = frame.shape
+    elapsed = time.perf_counter() - start
+
+    if not read_times:
+        return {'width': 0, 'height': 0, 'fps': 0.0, 'read_p50_ms': None, 'read_p95_ms': None, 'frames': 0}
+    p50, p95 = np.percentile(np.array(read_times) * 1000.0, [50, 95])
+    return {
+        'width': shape[1],
+        'height': shape[0],
+        'fps': len(read_times) / elapsed if elapsed > 0 else 0.0,
+        'read_p50_ms': float(p50),
+        'read_p95_ms': float(p95),
+        'frames': len(read_times)
+    }
+
+
+def probe_modes(open_capture, modes=None, frames=None, warmup=None):
+    """
+    Opens, configures and measures each candidate mode in turn.
+
+    Args:
+        open_capture (callable): Returns a new, unconfigured `cv2.VideoCapture` (or compatible) object.
+        modes (list): CameraMode candidates. Defaults to `settings.CAMERA_PROBE_MODES`.
+
+    Returns:
+        list: One dict per mode: 'requested', 'applied' (CameraMode) and the `measure_capture()` values.
+    """
+    if modes is None:
+        modes = [parse_mode(text) for text in settings.CAMERA_PROBE_MODES]
+    results = []
+    for mode in modes:
+        capture = open_capture()
+        try:
+            if not capture.isOpened():
+                continue
+            applied = configure_capture(capture, mode)
+            results.append({'requested': mode, 'applied': applied, **measure_capture(capture, frames, warmup)})
+        finally:
+            capture.release()
+    return results
+
+
+def choose_mode(results, min_width=None, min_height=None, min_fps=None):
+    """
+    Picks the fastest probed mode that meets the quality floor.
+
+    "Fastest" is the highest measured FPS; modes within 5 % of it count as equally fast
+    and the one with the shortest median `read()` wins.
+
+    Returns:
+        dict: The chosen probe result, or None if no mode meets the floor.
+    """
+    min_width = settings.CAMERA_MIN_WIDTH if min_width is None else min_width
+    min_height = settings.CAMERA_MIN_HEIGHT if min_height is None else min_height
+    min_fps = settings.CAMERA_MIN_FPS if min_fps is None else min_fps
+
+    eligible = [r for r in results
+                if r['frames'] and r['width'] >= min_width and r['height'] >= min_height and r['fps'] >= min_fps]
+    if not eligible:
+        return None
+    best_fps = max(r['fps'] for r in eligible)
+    return min((r for r in eligible if r['fps'] >= 0.95 * best_fps), key=lambda r: r['read_p50_ms'])
+
+
+def probe_camera(index, modes=None):
+    """
+    Probes a camera and returns the mode to request (the chosen one, else `default_mode()`).
+    """
+    print(f"Probing camera {index} modes...")
+    results = probe_modes(lambda: cv2.VideoCapture(index), modes)
+    for result in results:
+        print(f"  {format_mode(result['requested']):<18} -> {result['width']}x{result['height']} "
+              f"{result['fps']:5.1f} FPS, read p50 {result['read_p50_ms'] or 0.0:.1f} ms")
+    chosen = choose_mode(results)
+    if chosen is None:
+        print("No camera mode meets the quality floor, using the configured mode.")
+        return default_mode()
+    print(f"Camera probe chose {format_mode(chosen['requested'])}.")
+    return chosen['requested']
+
+
+def main(argv=None):
+    """Probes the candidate modes of a camera (or a video file) and prints the results."""
+    parser = argparse.ArgumentParser(description="Measure the capture modes of a camera")
+    parser.add_argument("--source", default=str(settings.CAMERA_INDEX), help="Camera index or video file")
+    parser.add_argument("--mode", action="append", default=None,
+                        help="Candidate mode WIDTHxHEIGHT@FPS[:FOURCC] (repeatable, default: CAMERA_PROBE_MODES)")
+    parser.add_argument("--frames", type=int, default=settings.CAMERA_PROBE_FRAMES, help="Frames measured per mode")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    modes = [parse_mode(text) for text in (args.mode or settings.CAMERA_PROBE_MODES)]
+    results = probe_modes(lambda: cv2.VideoCapture(source), modes, frames=args.frames)
+    chosen = choose_mode(results)
+
+    report = {
+        'source': args.source,
+        'floor': {'width': settings.CAMERA_MIN_WIDTH, 'height': settings.CAMERA_MIN_HEIGHT,
+                  'fps': settings.CAMERA_MIN_FPS},
+        'modes': [{**r, 'requested': format_mode(r['requested']), 'applied': r['applied']._asdict()}
+                  for r in results],
+        'chosen': format_mode(chosen['requested']) if chosen else None
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Wrote {args.output}")
+    else:
+        print(text)
+    return 0 if chosen else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
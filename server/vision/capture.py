@@ -0,0 +1,151 @@
+import threading
+import time
+
+
+class FrameGrabber:
+    """
+    Reads frames from a capture device on a dedicated thread.
+
+    Only the newest frame is kept (latest-frame-wins). If the vision loop is
+    slower than the camera, older frames are overwritten and counted as
+    dropped instead of queueing up, so `read()` never hands out stale frames.
+    """
+    def __init__(self, capture):
+        """
+        Args:
+            capture: An opened object exposing `read()`, `isOpened()` and `release()`
+                     (e.g. `cv2.VideoCapture`).
+        """
+        self.capture = capture
+
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        # Single-slot buffer
+        self._frame = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._consumed_id = 0
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_consumed = 0
+        self.read_failures = 0
+        self._age_total = 0.0
+        self._age_max = 0.0
+
+    def start(self):
+        """Starts the capture thread."""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            if not self.capture.isOpened():
+                break
+
+            success, frame = self.capture.read()
+            timestamp = time.perf_counter()
+
+            if not success:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+
+            with self._cond:
+                # The previous frame was never picked up by the vision loop
+                if self._frame_id > self._consumed_id:
+                    self.frames_dropped += 1
+
+                self._frame = frame
+                self._timestamp = timestamp
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def wait_ready(self, timeout=None):
+        """
+        Blocks until the first frame has been captured (instead of a fixed camera warm-up sleep).
+
+        Returns:
+            tuple: Shape of the first frame, or None if the source failed or timed out.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame_id > 0 or not self._running, timeout)
+            return self._frame.shape if self._frame is not None else None
+
+    def is_running(self):
+        """Returns True while the capture thread is delivering frames."""
+        return self._running
+
+    def read(self, timeout=1.0):
+        """
+        Blocks until a frame newer than the last one returned is available.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds.
+
+        Returns:
+            tuple: (success, frame, timestamp)
+                   timestamp is the `time.perf_counter()` value taken right after the
+                   frame was read from the device.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame_id > self._consumed_id or not self._running, timeout)
+            if self._frame_id == self._consumed_id:
+                return False, None, 0.0
+
+            self._consumed_id = self._frame_id
+            frame = self._frame
+            timestamp = self._timestamp
+
+        age = time.perf_counter() - timestamp
+        self.frames_consumed += 1
+        self._age_total += age
+        self._age_max = max(self._age_max, age)
+
+        return True, frame, timestamp
+
+    def get_stats(self):
+        """
+        Returns capture counters.
+
+        Returns:
+            dict: {
+                'captured': int,
+                'consumed': int,
+                'dropped': int,
+                'read_failures': int,
+                'avg_frame_age_ms': float, # capture -> handed to the vision loop
+                'max_frame_age_ms': float
+            }
+        """
+        avg_age = self._age_total / self.frames_consumed if self.frames_consumed else 0.0
+        return {
+            'captured': self.frames_captured,
+            'consumed': self.frames_consumed,
+            'dropped': self.frames_dropped,
+            'read_failures': self.read_failures,
+            'avg_frame_age_ms': avg_age * 1000.0,
+            'max_frame_age_ms': self._age_max * 1000.0
+        }
+
+    def stop(self):
+        """Stops the capture thread and releases the device."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.capture.release()
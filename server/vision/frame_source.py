@@ -0,0 +1,189 @@
+import os
+import time
+
+import cv2
+import numpy as np
+from server.config import settings
+from server.vision.camera_modes import configure_capture, default_mode, format_mode, probe_camera
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """
+    Base class for frame sources.
+
+    Mirrors the subset of the `cv2.VideoCapture` interface the server uses
+    (`read`, `isOpened`, `release`), so `FrameGrabber`, `main()` and `HandTracker`
+    consume a camera, a video file or a recorded frame stack the same way.
+
+    Replay sources support two pacing modes:
+        paced=True:  Frames are delivered at the source's original FPS (real-time replay).
+        paced=False: Frames are delivered as fast as possible (throughput measurement).
+
+    `last_wait` is the time the last `read()` slept for pacing (seconds), so callers
+    can tell the replay rate apart from the decode cost.
+    """
+    def __init__(self, fps=30.0, paced=True):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.paced = paced
+        self.last_wait = 0.0
+        self._next_frame_time = None
+
+    def _wait_for_next_frame(self):
+        self.last_wait = 0.0
+        if not self.paced:
+            return
+        now = time.perf_counter()
+        interval = 1.0 / self.fps
+        if self._next_frame_time is None or now - self._next_frame_time > interval:
+            # First frame, or we fell behind by more than a frame: resync instead of bursting
+            self._next_frame_time = now
+        elif self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+            self.last_wait = time.perf_counter() - now
+        self._next_frame_time += interval
+
+    def read(self):
+        """
+        Returns:
+            tuple: (success, frame) with frame as a BGR uint8 array.
+        """
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """
+    Live webcam. Pacing is set by the device, so reads are never delayed.
+
+    Opened in the configured mode (resolution, FPS, FOURCC, a one-frame driver buffer),
+    or with `probe` in the fastest mode that meets the quality floor (see `camera_modes`).
+    """
+    def __init__(self, index=0, mode=None, probe=None):
+        probe = settings.CAMERA_AUTO_PROBE if probe is None else probe
+        if mode is None:
+            mode = probe_camera(index) if probe else default_mode()
+        self.capture = cv2.VideoCapture(index)
+        self.mode = configure_capture(self.capture, mode) if self.capture.isOpened() else None
+        if self.mode is not None:
+            print(f"Camera {index}: {format_mode(self.mode)} (requested {format_mode(mode)})")
+        super().__init__(fps=self.capture.get(cv2.CAP_PROP_FPS), paced=False)
+
+    def read(self):
+        return self.capture.read()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, replayed at its own FPS (paced) or as fast as possible."""
+    def __init__(self, path, paced=True, loop=False):
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        super().__init__(fps=self.capture.get(cv2.CAP_PROP_FPS), paced=paced)
+
+    def read(self):
+        self._wait_for_next_frame()
+        success, frame = self.capture.read()
+        if not success and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.capture.read()
+        if not success:
+            self.release()
+        return success, frame
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+
+class FrameStackSource(FrameSource):
+    """
+    A fixed stack of frames: an in-memory (N, H, W, 3) array, a `.npy` file
+    (memory-mapped, so large recordings are not loaded up front) or a directory
+    of image files read in sorted order.
+    """
+    def __init__(self, frames, fps=30.0, paced=True, loop=False):
+        super().__init__(fps=fps, paced=paced)
+        self.loop = loop
+        self._files = None
+        self._frames = None
+
+        if isinstance(frames, np.ndarray):
+            self._frames = frames
+        elif os.path.isdir(frames):
+            self._files = sorted(
+                os.path.join(frames, name) for name in os.listdir(frames)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        else:
+            self._frames = np.load(frames, mmap_mode='r')
+
+        self._index = 0
+        self._opened = len(self) > 0
+
+    def __len__(self):
+        return len(self._files) if self._files is not None else len(self._frames)
+
+    def read(self):
+        if not self._opened:
+            return False, None
+
+        if self._index >= len(self):
+            if not self.loop:
+                self._opened = False
+                return False, None
+            self._index = 0
+
+        self._wait_for_next_frame()
+
+        if self._files is not None:
+            frame = cv2.imread(self._files[self._index])
+        else:
+            frame = self._frames[self._index]
+        self._index += 1
+
+        return frame is not None, frame
+
+    def isOpened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+
+def open_frame_source(source=None, paced=True, loop=False, fps=30.0, probe=None):
+    """
+    Creates a FrameSource from a source spec.
+
+    Args:
+        source: Camera index (int or digit string), video file path, `.npy` file,
+                image directory or an in-memory frame array. Defaults to `settings.CAMERA_INDEX`.
+        paced (bool): Replay at the original FPS (True) or as fast as possible (False).
+        loop (bool): Restart replay sources when they run out of frames.
+        fps (float): Replay rate for frame stacks, which carry no FPS of their own.
+        probe (bool): Probe the camera's modes first (cameras only). Defaults to `settings.CAMERA_AUTO_PROBE`.
+    """
+    if source is None:
+        source = settings.CAMERA_INDEX
+
+    if isinstance(source, np.ndarray):
+        return FrameStackSource(source, fps=fps, paced=paced, loop=loop)
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return CameraSource(int(source), probe=probe)
+    if os.path.isdir(source) or source.lower().endswith('.npy'):
+        return FrameStackSource(source, fps=fps, paced=paced, loop=loop)
+    return VideoFileSource(source, paced=paced, loop=loop)
@@ -1,14 +1,53 @@
-import math
+import numpy as np
 from server.config import settings
+from server.config.runtime import RuntimeConfig, boolean, choice, number
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+SAFETY_TIPS = [12, 16, 20]  # Middle, Ring, Pinky
+
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Converts one hand's landmarks to a (21, 3) float32 array of normalized (x, y, z).
+    Arrays are passed through (cast to float32 if needed).
+    """
+    if isinstance(hand_landmarks, np.ndarray):
+        return np.asarray(hand_landmarks, dtype=np.float32)
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float32)
+
 
 class GestureDecider:
     """
-    Analyzes hand landmarks to determine gesture states (Orbit, Zoom) 
+    Analyzes hand landmarks to determine gesture states (Orbit, Zoom)
     based on configuration thresholds.
+
+    All features are computed as NumPy array operations over (N, 21, 3) landmark
+    stacks. `analyze` runs a single frame through the same code as `analyze_batch`,
+    so both produce identical values.
+
+    The config is an immutable, versioned snapshot (see `server.config.runtime`):
+    every analyze call reads `self.config` once, so an update arriving from the
+    config thread mid-frame never mixes old and new values.
     """
+    VALIDATORS = {
+        'deadzone_radius': number(0.0, 1.0),
+        'deadzone_offset_x': number(0.0, 1.0),
+        'deadzone_offset_y': number(0.0, 1.0),
+        'zoom_thresh_in': number(0.0, 1.0),
+        'zoom_thresh_out': number(0.0, 1.0),
+        'orbit_sens_server': number(0.0, 100.0),
+        'use_fist_safety': boolean,
+        'use_open_hand_safety': boolean,
+        'orbit_hand': choice('Left', 'Right'),
+        'zoom_hand': choice('Left', 'Right')
+    }
+
     def __init__(self):
-        # Initialize runtime config from settings (allows for future runtime updates)
-        self.config = {
+        # Initialize runtime config from settings (updated at runtime by the config listener)
+        self._config = RuntimeConfig({
             'deadzone_radius': settings.DEFAULT_DEADZONE_RADIUS,
             'deadzone_offset_x': settings.DEFAULT_DEADZONE_OFFSET_X,
             'deadzone_offset_y': settings.DEFAULT_DEADZONE_OFFSET_Y,
@@ -16,22 +55,105 @@ class GestureDecider:
             'zoom_thresh_out': settings.DEFAULT_ZOOM_THRESH_OUT,
             'orbit_sens_server': settings.DEFAULT_ORBIT_SENSITIVITY,
             'use_fist_safety': settings.DEFAULT_USE_FIST_SAFETY,
-            'use_open_hand_safety': settings.DEFAULT_USE_OPEN_HAND_SAFETY
-        }
+            'use_open_hand_safety': settings.DEFAULT_USE_OPEN_HAND_SAFETY,
+            'orbit_hand': settings.DEFAULT_ORBIT_HAND,
+            'zoom_hand': settings.DEFAULT_ZOOM_HAND
+        }, self.VALIDATORS)
+
+    @property
+    def config(self):
+        """The current ConfigSnapshot (read-only)."""
+        return self._config.snapshot
 
     def update_config(self, new_config):
-        """Updates internal configuration (e.g. from UDP listener)."""
-        for key, value in new_config.items():
-            if key in self.config:
-                self.config[key] = value
+        """Validates and publishes a configuration update (e.g. from UDP listener)."""
+        return self._config.update(new_config)
+
+    def _compute(self, landmarks, config):
+        """
+        Vectorized gesture features for an (N, 21, 3) float32 landmark stack.
+        Rows containing NaN are treated as "no hand".
+        """
+        dtype = np.float32
+
+        present = ~np.isnan(landmarks).any(axis=(1, 2))
+        xy = landmarks[:, :, :2]
+        wrist = xy[:, WRIST]
+
+        # --- 1. ORBIT (Joystick Logic) ---
+        center = np.array([config['deadzone_offset_x'], config['deadzone_offset_y']], dtype=dtype)
+        raw = wrist - center
+        magnitude = np.sqrt(np.sum(raw * raw, axis=1))
+
+        deadzone = dtype(config['deadzone_radius'])
+        sensitivity = dtype(config['orbit_sens_server'])
+        max_speed = dtype(settings.DEFAULT_MAX_SPEED)
+
+        # Safety Heuristics
+        tip_offsets = xy[:, SAFETY_TIPS] - wrist[:, None, :]
+        avg_tip_dist = np.sqrt(np.sum(tip_offsets * tip_offsets, axis=2)).sum(axis=1) / dtype(3.0)
+
+        with np.errstate(invalid='ignore'):
+            is_open = avg_tip_dist > dtype(settings.OPEN_HAND_THRESH)
+            is_fist = avg_tip_dist < dtype(settings.FIST_THRESH)
+
+            orbit_locked = present & is_open & bool(config['use_open_hand_safety'])
+            moving = present & (magnitude > deadzone) & ~orbit_locked
+
+            strength = np.minimum((magnitude - deadzone) * sensitivity, max_speed)
+            safe_magnitude = np.where(moving, magnitude, dtype(1.0))
+            orbit = np.where(moving[:, None], raw / safe_magnitude[:, None] * strength[:, None], dtype(0.0))
+
+            # --- 2. ZOOM ---
+            pinch = xy[:, THUMB_TIP] - xy[:, INDEX_TIP]
+            pinch_dist = np.sqrt(np.sum(pinch * pinch, axis=1))
+
+            zoom_locked = present & is_fist & bool(config['use_fist_safety'])
+            zoom_allowed = present & ~zoom_locked
+            zoom_in = zoom_allowed & (pinch_dist < dtype(config['zoom_thresh_in']))
+            zoom_out = zoom_allowed & (pinch_dist > dtype(config['zoom_thresh_out']))
+
+        zoom_val = zoom_in.astype(np.int8) - zoom_out.astype(np.int8)
+
+        return {
+            'orbit_x': orbit[:, 0],
+            'orbit_y': orbit[:, 1],
+            'zoom_val': zoom_val,
+            'active': present,
+            'orbit_locked': orbit_locked,
+            'zoom_locked': zoom_locked
+        }
+
+    def analyze_batch(self, landmarks):
+        """
+        Analyzes a stack of recorded frames at once (offline evaluation / tuning).
 
-    def calculate_distance(self, p1, p2):
-        return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+        Args:
+            landmarks: (N, 21, 3) array of normalized landmarks. Frames without a
+                       hand can be filled with NaN.
+
+        Returns:
+            dict of (N,) arrays: {
+                'orbit_x': float32,
+                'orbit_y': float32,
+                'zoom_val': int8,
+                'active': bool,        # hand present
+                'orbit_locked': bool,  # open hand safety engaged
+                'zoom_locked': bool    # fist safety engaged
+            }
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if landmarks.ndim != 3 or landmarks.shape[1:] != (21, 3):
+            raise ValueError(f"Expected an (N, 21, 3) landmark array, got {landmarks.shape}")
+        return self._compute(landmarks, self.config)
 
     def analyze(self, hand_landmarks):
         """
         Analyzes landmarks and returns gesture data.
-        
+
+        Args:
+            hand_landmarks: One hand's landmarks (MediaPipe landmark list or (21, 3) array), or None.
+
         Returns:
             dict: {
                 'orbit_x': float,
@@ -48,68 +170,92 @@ class GestureDecider:
             'state': "idle",
             'text_overlays': []
         }
-        
-        if not hand_landmarks:
+
+        if hand_landmarks is None or len(hand_landmarks) == 0:
+            return result
+
+        features = self._compute(landmarks_to_array(hand_landmarks)[None], self.config)
+        if not features['active'][0]:
             return result
 
         result['state'] = "active"
-        wrist = hand_landmarks[0]
-        
-        # --- 1. ORBIT (Joystick Logic) ---
-        cx = self.config['deadzone_offset_x']
-        cy = self.config['deadzone_offset_y']
-        
-        raw_x = wrist.x - cx
-        raw_y = wrist.y - cy
-        
-        magnitude = math.sqrt(raw_x**2 + raw_y**2)
-        
-        DEADZONE_THRESH = self.config['deadzone_radius']
-        SENSITIVITY = self.config['orbit_sens_server']
-        MAX_SPEED = settings.DEFAULT_MAX_SPEED
-        
-        # Safety Heuristics
-        tips = [12, 16, 20] # Middle, Ring, Pinky
-        avg_tip_dist = sum([self.calculate_distance(hand_landmarks[i], wrist) for i in tips]) / 3.0
-        
-        IS_OPEN = avg_tip_dist > settings.OPEN_HAND_THRESH
-        IS_FIST = avg_tip_dist < settings.FIST_THRESH
-        
-        ORBIT_ALLOWED = True
-        if self.config['use_open_hand_safety'] and IS_OPEN:
-            ORBIT_ALLOWED = False
-            result['text_overlays'].append(("OPEN HAND (ORBIT LOCKED)", (10, 150), (255, 0, 0)))
-
-        if magnitude > DEADZONE_THRESH and ORBIT_ALLOWED:
-            dir_x = raw_x / magnitude
-            dir_y = raw_y / magnitude
-            
-            raw_strength = (magnitude - DEADZONE_THRESH) * SENSITIVITY
-            strength = min(raw_strength, MAX_SPEED)
-            
-            result['orbit_x'] = dir_x * strength
-            result['orbit_y'] = dir_y * strength
-        
-        # --- 2. ZOOM ---
-        thumb = hand_landmarks[4]
-        index = hand_landmarks[8]
-        
-        ZOOM_ALLOWED = True
-        if self.config['use_fist_safety'] and IS_FIST:
-             ZOOM_ALLOWED = False
-             result['text_overlays'].append(("FIST (ZOOM LOCKED)", (10, 120), (0, 0, 255)))
-
-        if ZOOM_ALLOWED:
-            dist = self.calculate_distance(thumb, index)
-            
-            PINCH_IN = self.config['zoom_thresh_in']
-            PINCH_OUT = self.config['zoom_thresh_out']
-            
-            if dist < PINCH_IN:
-                result['zoom_val'] = 1
-                result['text_overlays'].append(("ZOOM IN", (10, 90), (0, 0, 255)))
-            elif dist > PINCH_OUT:
-                result['zoom_val'] = -1
-                result['text_overlays'].append(("ZOOM OUT", (10, 90), (255, 0, 0)))
+        result['orbit_x'] = float(features['orbit_x'][0])
+        result['orbit_y'] = float(features['orbit_y'][0])
+        result['zoom_val'] = int(features['zoom_val'][0])
+
+        result['text_overlays'] = self._overlays(features['orbit_locked'][0], features['zoom_locked'][0],
+                                                 result['zoom_val'])
+        return result
+
+    @staticmethod
+    def _overlays(orbit_locked, zoom_locked, zoom_val):
+        """Status texts for the preview, as (text, pos, color) tuples."""
+        overlays = []
+        if orbit_locked:
+            overlays.append(("OPEN HAND (ORBIT LOCKED)", (10, 150), (255, 0, 0)))
+        if zoom_locked:
+            overlays.append(("FIST (ZOOM LOCKED)", (10, 120), (0, 0, 255)))
+        if zoom_val == 1:
+            overlays.append(("ZOOM IN", (10, 90), (0, 0, 255)))
+        elif zoom_val == -1:
+            overlays.append(("ZOOM OUT", (10, 90), (255, 0, 0)))
+        return overlays
+
+    @staticmethod
+    def _pick_hand(tracks, handedness, exclude=None):
+        """Index of the first track with the given handedness, else the first track that is not `exclude`."""
+        for i, track in enumerate(tracks):
+            if i != exclude and track.handedness == handedness:
+                return i
+        for i in range(len(tracks)):
+            if i != exclude:
+                return i
+        return exclude
 
+    def analyze_tracks(self, tracks):
+        """
+        Analyzes every tracked hand in one vectorized pass and combines them.
+
+        Each hand gets its own gesture, stored on its track (`track.gesture`) and
+        listed under 'hands'. The combined orbit / zoom fields follow the hand roles:
+        a single hand drives both, with two or more hands the `orbit_hand` drives
+        orbit and the `zoom_hand` drives zoom.
+
+        Args:
+            tracks (list): HandTracks visible in the current frame (see `HandTrackManager`).
+
+        Returns:
+            dict: Same keys as `analyze`, plus 'hands': list of per-hand dicts
+                  {'id', 'hand', 'state', 'orbit_x', 'orbit_y', 'zoom_val'}.
+        """
+        result = self.analyze(None)
+        result['hands'] = []
+        if not tracks:
+            return result
+
+        config = self.config
+        features = self._compute(np.stack([track.landmarks for track in tracks]), config)
+        for i, track in enumerate(tracks):
+            track.gesture = {
+                'id': track.id,
+                'hand': track.handedness,
+                'state': "active" if features['active'][i] else "idle",
+                'orbit_x': float(features['orbit_x'][i]),
+                'orbit_y': float(features['orbit_y'][i]),
+                'zoom_val': int(features['zoom_val'][i])
+            }
+            result['hands'].append(track.gesture)
+
+        if not features['active'].any():
+            return result
+
+        orbit = self._pick_hand(tracks, config['orbit_hand'])
+        zoom = orbit if len(tracks) == 1 else self._pick_hand(tracks, config['zoom_hand'], exclude=orbit)
+
+        result['state'] = "active"
+        result['orbit_x'] = float(features['orbit_x'][orbit])
+        result['orbit_y'] = float(features['orbit_y'][orbit])
+        result['zoom_val'] = int(features['zoom_val'][zoom])
+        result['text_overlays'] = self._overlays(features['orbit_locked'][orbit], features['zoom_locked'][zoom],
+                                                 result['zoom_val'])
         return result
@@ -1,95 +1,334 @@
+import threading
+import time
+from collections import namedtuple
+
 import cv2
 import mediapipe as mp
+import numpy as np
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 from server.config import settings
+from server.vision.models import ModelStore
+
+# Hand landmarker output tagged with the capture time of the frame it was computed from
+TrackingResult = namedtuple('TrackingResult', ['hand_landmarks', 'handedness', 'capture_time'])
+
+HANDEDNESS_SWAP = {'Left': 'Right', 'Right': 'Left'}
+
 
 class HandTracker:
     """
     Encapsulates MediaPipe Hand Object Detection and Tracking.
+
+    Supports the three MediaPipe running modes:
+        IMAGE:       Every frame is detected independently (`detect`).
+        VIDEO:       Frames are tracked over time (`detect_for_video`), so palm detection
+                     only re-runs when tracking is lost.
+        LIVE_STREAM: Frames are submitted asynchronously (`detect_async`); `process_frame`
+                     returns the newest finished result without waiting for inference.
+
+    Frames are never flipped or copied into fresh arrays: the camera image is color
+    converted (and, for ROI crops, resized) into destination buffers that are reused
+    across frames, and the mirror effect is applied to the landmark coordinates
+    (x -> 1 - x) instead of the pixels.
     """
-    def __init__(self):
-        self.model_path = settings.MODEL_PATH
-        
+    RUNNING_MODES = {
+        'IMAGE': vision.RunningMode.IMAGE,
+        'VIDEO': vision.RunningMode.VIDEO,
+        'LIVE_STREAM': vision.RunningMode.LIVE_STREAM
+    }
+
+    def __init__(self, running_mode=None, use_roi=None, max_hands=None, model=None):
+        self.model = model or settings.MODEL_VARIANT
+        self.running_mode = (running_mode or settings.RUNNING_MODE).upper()
+        if self.running_mode not in self.RUNNING_MODES:
+            raise ValueError(f"Unknown running mode: {self.running_mode}")
+        self.max_hands = max_hands or settings.MAX_HANDS
+
+        # Region of interest around the last seen hand (normalized x0, y0, x1, y1 of the mirrored frame).
+        # Single-hand only: a crop around one hand would hide any other hand entering the frame.
+        # IMAGE mode only: VIDEO / LIVE_STREAM track the hand in input-image coordinates from frame
+        # to frame, so a crop that moves and resizes (mixed with full frames) looks like the hand jumping.
+        roi_requested = settings.USE_ROI_INFERENCE if use_roi is None else use_roi
+        self.use_roi = roi_requested and self.max_hands == 1 and self.running_mode == 'IMAGE'
+        if roi_requested and not self.use_roi:
+            print(f"Warning: ROI inference is ignored ({self.running_mode} mode, {self.max_hands} hand(s)); "
+                  f"it needs IMAGE mode and a single hand.")
+        self._roi = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.roi_misses = 0
+
+        # Reusable frame buffers (name -> array), reallocated only when the frame size changes
+        self._buffers = {}
+        self.buffer_allocations = 0
+
+        # Timestamp bookkeeping (MediaPipe requires strictly increasing milliseconds)
+        self._last_timestamp_ms = -1
+        self._pending = {}  # timestamp_ms -> (capture_time, transform, is_roi) (LIVE_STREAM only)
+        self._lock = threading.Lock()
+        self._latest_result = None
+
         # Initialize Hand Landmarker
         try:
-            base_options = python.BaseOptions(model_asset_path=self.model_path)
+            # Verified model bytes (read through a memory map) instead of a path MediaPipe re-reads
+            base_options = python.BaseOptions(model_asset_buffer=ModelStore().load(self.model))
             options = vision.HandLandmarkerOptions(
                 base_options=base_options,
-                num_hands=1,
+                running_mode=self.RUNNING_MODES[self.running_mode],
+                num_hands=self.max_hands,
                 min_hand_detection_confidence=settings.MIN_HAND_DETECTION_CONFIDENCE,
                 min_hand_presence_confidence=settings.MIN_HAND_PRESENCE_CONFIDENCE,
-                min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE
+                min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE,
+                result_callback=self._on_result if self.running_mode == 'LIVE_STREAM' else None
             )
             self.detector = vision.HandLandmarker.create_from_options(options)
-            print("HandTracker initialized successfully.")
+            roi_state = "on" if self.use_roi else "off"
+            print(f"HandTracker initialized successfully ({self.running_mode} mode, {self.model} model, "
+                  f"{self.max_hands} hand(s), ROI {roi_state}).")
         except Exception as e:
             print(f"Failed to initialize HandTracker: {e}")
             self.detector = None
 
-    def process_frame(self, image):
+    def _next_timestamp_ms(self, capture_time):
+        timestamp_ms = max(int(capture_time * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback, runs on a MediaPipe thread."""
+        with self._lock:
+            capture_time, transform, is_roi = self._pending.pop(
+                timestamp_ms, (timestamp_ms / 1000.0, (0.0, 0.0, 1.0, 1.0), False))
+            # Forget frames MediaPipe skipped because it was still busy
+            for stale in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[stale]
+            self._update_roi(result, transform, is_roi)
+            self._latest_result = TrackingResult(result.hand_landmarks, result.handedness, capture_time)
+
+    def _buffer(self, name, shape):
+        """Returns the preallocated uint8 buffer `name`, (re)allocating it only if the shape changed."""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[name] = buffer
+            self.buffer_allocations += 1
+        return buffer
+
+    def _prepare_full(self, image):
+        """
+        Converts the full BGR frame to RGB into a reused buffer.
+
+        Returns:
+            tuple: (rgb_image, transform) with the identity transform.
+        """
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._buffer('full_rgb', image.shape))
+        return rgb_image, (0.0, 0.0, 1.0, 1.0)
+
+    def _prepare_roi(self, image, roi):
+        """
+        Cuts a square, padded ROI around the last hand out of the (unflipped) frame and
+        resizes it into a fixed-size reused buffer, then converts that to RGB.
+
+        Args:
+            image: Raw BGR frame.
+            roi (tuple): (x0, y0, x1, y1) box of the last hand, normalized, in mirrored coordinates.
+
+        Returns:
+            tuple: (rgb_crop, transform) with transform = (offset_x, offset_y, scale_x, scale_y)
+                   mapping crop-normalized to full-frame-normalized (unmirrored) coordinates.
+        """
+        h, w = image.shape[:2]
+        # The ROI is kept in mirrored (output) coordinates; the pixels are not mirrored
+        x0, y0, x1, y1 = roi
+        x0, x1 = 1.0 - x1, 1.0 - x0
+
+        # Square crop (in pixels) around the box, padded on every side, shifted to stay inside the frame
+        side = max((x1 - x0) * w, (y1 - y0) * h) * (1.0 + 2.0 * settings.ROI_PADDING)
+        side = int(min(max(side, settings.ROI_MIN_SIZE), w, h))
+        cx, cy = (x0 + x1) * 0.5 * w, (y0 + y1) * 0.5 * h
+        left = int(min(max(0, cx - side * 0.5), w - side))
+        top = int(min(max(0, cy - side * 0.5), h - side))
+
+        size = settings.ROI_INPUT_SIZE
+        crop = self._buffer('roi_bgr', (size, size, 3))
+        cv2.resize(image[top:top + side, left:left + side], (size, size), dst=crop,
+                   interpolation=cv2.INTER_AREA if side > size else cv2.INTER_LINEAR)
+        rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self._buffer('roi_rgb', (size, size, 3)))
+
+        return rgb_crop, (left / w, top / h, side / w, side / h)
+
+    @staticmethod
+    def _map_to_output(result, transform):
+        """
+        Maps landmarks from detector-input-normalized to mirrored full-frame-normalized
+        coordinates, in place. Handedness labels are swapped to match the mirrored view.
+        """
+        offset_x, offset_y, scale_x, scale_y = transform
+        mirror_x = 1.0 - offset_x
+        for hand_landmarks in result.hand_landmarks:
+            for lm in hand_landmarks:
+                lm.x = mirror_x - lm.x * scale_x
+                lm.y = offset_y + lm.y * scale_y
+                # z uses roughly the same scale as x
+                lm.z = lm.z * scale_x
+
+        # MediaPipe labels hands assuming a mirrored (selfie) input; ours is not mirrored
+        for categories in result.handedness:
+            for category in categories:
+                category.category_name = HANDEDNESS_SWAP.get(category.category_name, category.category_name)
+                category.display_name = HANDEDNESS_SWAP.get(category.display_name, category.display_name)
+
+    def _update_roi(self, result, transform, is_roi):
+        if result.hand_landmarks or result.handedness:
+            self._map_to_output(result, transform)
+
+        if not self.use_roi:
+            return
+        if not result.hand_landmarks:
+            # Tracking lost: back to full-frame detection
+            if is_roi:
+                self.roi_misses += 1
+            self._roi = None
+            return
+
+        xs = [lm.x for lm in result.hand_landmarks[0]]
+        ys = [lm.y for lm in result.hand_landmarks[0]]
+        self._roi = (min(xs), min(ys), max(xs), max(ys))
+
+    def _detect(self, rgb_image, capture_time, transform, is_roi):
+        """
+        Runs the detector on a prepared RGB image in the configured running mode.
+
+        Returns:
+            The landmarker result mapped to output coordinates, or None in LIVE_STREAM mode.
+        """
+        # mp.Image copies the pixels, so the buffer can be reused for the next frame right away
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_image)
+
+        if is_roi:
+            self.roi_frames += 1
+        else:
+            self.full_frames += 1
+
+        if self.running_mode == 'IMAGE':
+            result = self.detector.detect(mp_image)
+        elif self.running_mode == 'VIDEO':
+            result = self.detector.detect_for_video(mp_image, self._next_timestamp_ms(capture_time))
+        else:
+            with self._lock:
+                timestamp_ms = self._next_timestamp_ms(capture_time)
+                self._pending[timestamp_ms] = (capture_time, transform, is_roi)
+            self.detector.detect_async(mp_image, timestamp_ms)
+            return None
+
+        self._update_roi(result, transform, is_roi)
+        return result
+
+    def process_frame(self, image, capture_time=None):
         """
-        Processes a raw OpenCV frame: flips, converts to RGB, and detects hands.
-        
+        Processes a raw OpenCV frame: converts to RGB and detects hands.
+
+        The frame itself is not flipped. Landmarks are returned mirrored (x -> 1 - x)
+        in full-frame normalized coordinates, so they line up with a horizontally
+        flipped preview (see `PreviewRenderer`).
+
+        With ROI inference enabled, only a padded, downscaled crop around the last
+        hand is sent to the detector. If the hand is not found in the crop, the same
+        frame is re-run on the full image.
+
         Args:
             image: Raw BGR image from OpenCV.
-            
+            capture_time (float): `time.perf_counter()` value of when the frame was captured.
+                                  Defaults to now.
+
         Returns:
-            tuple: (processed_image, result)
-                   processed_image is the flipped, potentially annotated image (though annotation happens later/separately depending on flow).
-                   Actually, main.py flips then detects. So we return the flipped image so the UI can show what was actually processed.
+            tuple: (image, result)
+                   image is the unmodified input frame (flip it for display).
+                   result is a TrackingResult (or None). In LIVE_STREAM mode it is the newest
+                   finished result, which may belong to an earlier frame; check `capture_time`.
         """
         if self.detector is None:
             return image, None
 
-        # 1. Flip image (mirror effect)
-        flipped_image = cv2.flip(image, 1)
-        
-        # 2. Convert to RGB for MediaPipe
-        rgb_image = cv2.cvtColor(flipped_image, cv2.COLOR_BGR2RGB)
-        
-        # 3. Create MediaPipe Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_image)
-        
-        # 4. Detect
-        # Note: main.py uses strictly image mode (detect), not video mode (detect_for_video)
-        detection_result = self.detector.detect(mp_image)
-        
-        return flipped_image, detection_result
-
-    def draw_landmarks(self, image, detection_result):
+        if capture_time is None:
+            capture_time = time.perf_counter()
+
+        # Detect (ROI crop first if we know where the hand is). The ROI is read once, under the lock,
+        # since a LIVE_STREAM result callback may replace it at any time.
+        with self._lock:
+            roi = self._roi if self.use_roi else None
+        if roi is not None:
+            rgb_image, transform = self._prepare_roi(image, roi)
+            result = self._detect(rgb_image, capture_time, transform, True)
+            if result is not None and not result.hand_landmarks:
+                # Lost the hand inside the crop: full-frame fallback on the same frame
+                rgb_image, transform = self._prepare_full(image)
+                result = self._detect(rgb_image, capture_time, transform, False)
+        else:
+            rgb_image, transform = self._prepare_full(image)
+            result = self._detect(rgb_image, capture_time, transform, False)
+
+        if result is None:
+            with self._lock:
+                return image, self._latest_result
+
+        return image, TrackingResult(result.hand_landmarks, result.handedness, capture_time)
+
+    def warm_up(self, shape):
+        """
+        Runs one inference on a black frame of the camera's size, so the first real frame
+        does not pay for MediaPipe's lazy initialization and the frame buffers already exist.
+        (In LIVE_STREAM mode the inference only starts here.)
+
+        Args:
+            shape (tuple): (height, width, 3) of the camera frames.
+        """
+        if self.detector is None:
+            return
+        self.process_frame(np.zeros(shape, dtype=np.uint8), time.perf_counter())
+        # Not part of the statistics
+        self.full_frames = 0
+
+    @staticmethod
+    def draw_landmarks(image, detection_result):
         """
         Draws hand landmarks and connections on the image.
-        
+
         Args:
-            image: The BGR image to draw on.
-            detection_result: The result object from process_frame.
+            image: The BGR image to draw on (mirrored, like the landmarks).
+            detection_result: The result object from process_frame. Hands may be MediaPipe
+                              landmark lists or (21, 3) arrays.
         """
         if not detection_result or not detection_result.hand_landmarks:
             return
 
         hand_landmarks_list = detection_result.hand_landmarks
-        
+
         # Loop through each detected hand
         for hand_landmarks in hand_landmarks_list:
             # We need to convert normalized coordinates to pixel coordinates
             h, w, _ = image.shape
-            
+            if isinstance(hand_landmarks, np.ndarray):
+                points = [(int(x * w), int(y * h)) for x, y in hand_landmarks[:, :2]]
+            else:
+                points = [(int(lm.x * w), int(lm.y * h)) for lm in hand_landmarks]
+
             # Draw key points
-            for lm in hand_landmarks:
-                cv2.circle(image, (int(lm.x * w), int(lm.y * h)), 4, (0, 0, 255), -1)
-            
-            # Simple connection drawing (wrist to index for validation from main.py, or full skeleton)
-            # main.py drew specific lines:
-            # cv2.line(image, (int(wrist.x*w), int(wrist.y*h)), (int(index.x*w), int(index.y*h)), (0, 255, 255), 2)
-            # We can replicate that or be more generic. 
-            # The prompt asks to "Ensure the drawing utilities... are either moved here..."
-            # I will implement the generic full hand connections or similar to main.py to start.
-            # main.py only drew: Wrist(0) -> Index(8) line. And circles for all landmarks.
-            
-            wrist = hand_landmarks[0]
-            index = hand_landmarks[8]
-            cv2.line(image, (int(wrist.x * w), int(wrist.y * h)), (int(index.x * w), int(index.y * h)), (0, 255, 255), 2)
+            for point in points:
+                cv2.circle(image, point, 4, (0, 0, 255), -1)
+
+            # Wrist(0) -> Index(8) line
+            cv2.line(image, points[0], points[8], (0, 255, 255), 2)
+
+    def get_stats(self):
+        """Frames run on an ROI crop vs. the full frame, and ROI crops that lost the hand."""
+        return {
+            'roi': self.use_roi,
+            'roi_frames': self.roi_frames,
+            'full_frames': self.full_frames,
+            'roi_misses': self.roi_misses
+        }
 
     def close(self):
         if self.detector:
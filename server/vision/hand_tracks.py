@@ -0,0 +1,128 @@
+import numpy as np
+from server.config import settings
+from server.vision.gesture_analysis import WRIST, landmarks_to_array
+
+
+class HandTrack:
+    """
+    One hand followed across frames.
+
+    Holds everything that has to survive from frame to frame for that hand: its
+    stable ID, handedness, latest landmarks, filter state, landmark history and the
+    per-hand gesture.
+    """
+    def __init__(self, track_id, handedness, landmarks, now):
+        self.id = track_id
+        self.handedness = handedness
+        # Detector output; `landmarks` is replaced with the smoothed version by LandmarkSmoother
+        self.raw_landmarks = landmarks
+        self.landmarks = landmarks
+        self.first_seen = now
+        self.last_seen = now
+
+        # Per-hand filter state (owned by LandmarkSmoother)
+        self.filter = None
+        self.filter_version = None
+
+        # Per-hand (timestamp, landmarks) history (owned by LandmarkPredictor)
+        self.history = None
+
+        # Per-hand gesture state (owned by GestureDecider)
+        self.gesture = None
+
+    @property
+    def wrist(self):
+        return self.landmarks[WRIST, :2]
+
+
+class HandTrackManager:
+    """
+    Assigns stable track IDs to the hands of consecutive TrackingResults.
+
+    Detections are matched to existing tracks by wrist distance, with a penalty
+    when MediaPipe's handedness label disagrees, greedily from the closest pair.
+    Unmatched detections start a new track; tracks not seen for `timeout` seconds
+    are dropped. Matching costs O(tracks * hands), i.e. linear in the hand count
+    for the small `MAX_HANDS` values in use.
+    """
+    def __init__(self, max_distance=None, handedness_penalty=None, timeout=None):
+        self.max_distance = settings.TRACK_MAX_DISTANCE if max_distance is None else max_distance
+        self.handedness_penalty = settings.TRACK_HANDEDNESS_PENALTY if handedness_penalty is None \
+            else handedness_penalty
+        self.timeout = settings.TRACK_TIMEOUT if timeout is None else timeout
+
+        self.tracks = {}  # track_id -> HandTrack
+        self._next_id = 0
+        self._last_capture_time = None
+        self._visible = []
+
+    @staticmethod
+    def _handedness_label(categories):
+        return categories[0].category_name if categories else None
+
+    def update(self, detection_result, now=None):
+        """
+        Matches the hands of a TrackingResult to tracks.
+
+        Args:
+            detection_result: TrackingResult (or None when no inference ran).
+            now (float): Timestamp used for the timeout. Defaults to the result's capture time.
+
+        Returns:
+            list: The HandTracks visible in this result, ordered by track ID.
+        """
+        if detection_result is None:
+            return []
+
+        if now is None:
+            now = detection_result.capture_time
+        if detection_result.capture_time == self._last_capture_time:
+            # Same result again (LIVE_STREAM / worker processes): nothing new to match
+            return self._visible
+        self._last_capture_time = detection_result.capture_time
+
+        hands = [landmarks_to_array(hand) for hand in detection_result.hand_landmarks]
+        labels = [self._handedness_label(categories) for categories in detection_result.handedness]
+        labels += [None] * (len(hands) - len(labels))
+
+        # Expire lost tracks
+        for track_id in [tid for tid, track in self.tracks.items() if now - track.last_seen > self.timeout]:
+            del self.tracks[track_id]
+
+        visible = []
+        unmatched = list(range(len(hands)))
+        candidates = list(self.tracks.values())
+
+        if hands and candidates:
+            wrists = np.array([hand[WRIST, :2] for hand in hands])
+            track_wrists = np.array([track.wrist for track in candidates])
+            cost = np.linalg.norm(wrists[:, None, :] - track_wrists[None, :, :], axis=2)
+            mismatch = np.array([[label is not None and track.handedness is not None and label != track.handedness
+                                  for track in candidates] for label in labels])
+            cost += mismatch * self.handedness_penalty
+
+            # Greedy assignment, closest pairs first
+            used_tracks = set()
+            for flat in np.argsort(cost, axis=None):
+                h, t = np.unravel_index(flat, cost.shape)
+                if cost[h, t] > self.max_distance:
+                    break
+                if h not in unmatched or t in used_tracks:
+                    continue
+                track = candidates[t]
+                track.raw_landmarks = track.landmarks = hands[h]
+                track.handedness = labels[h] or track.handedness
+                track.last_seen = now
+                used_tracks.add(t)
+                unmatched.remove(h)
+                visible.append(track)
+
+        for h in unmatched:
+            track = HandTrack(self._next_id, labels[h], hands[h], now)
+            self._next_id += 1
+            self.tracks[track.id] = track
+            visible.append(track)
+
+        visible.sort(key=lambda track: track.id)
+        self._visible = visible
+        return visible
@@ -0,0 +1,233 @@
+"""
+Hand landmarker model assets: variant registry, user cache and integrity checks.
+
+Each variant in `settings.MODEL_VARIANTS` names a file, where to download it from
+and (optionally) its SHA-256. A variant is looked up, in this order:
+
+    cache       `settings.MODEL_CACHE_DIR` (per user, shared by all checkouts)
+    pre-seeded  `settings.MODEL_SEARCH_DIRS` (e.g. a copy next to the server for offline machines)
+    download    the variant's URL, unless `settings.MODEL_OFFLINE` (file:// URLs work too)
+
+Every file is checked against the variant's published SHA-256 before it is used, so a
+truncated or replaced model is caught instead of failing somewhere inside MediaPipe.
+A variant without a published checksum is refused, unless trust on first use is enabled
+explicitly (`MODEL_TRUST_ON_FIRST_USE`, or `download_model.py --trust-on-first-use`): the
+checksum of the downloaded (or first pre-seeded) file is then recorded in the cache
+(`<file>.sha256`) and enforced from then on, also without the opt-in.
+"""
+import hashlib
+import mmap
+import os
+import shutil
+import urllib.request
+
+from server.config import settings
+
+CHUNK_SIZE = 1 << 20
+
+
+def _mapped(path):
+    """Read-only memory map of `path` (the caller closes it)."""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def sha256_file(path):
+    """SHA-256 (hex) of a file, hashed straight from a memory map."""
+    if os.path.getsize(path) == 0:
+        return hashlib.sha256().hexdigest()
+    with _mapped(path) as mapped:
+        return hashlib.sha256(mapped).hexdigest()
+
+
+class ModelStore:
+    """
+    Finds, verifies, downloads and loads hand landmarker model variants.
+
+    Usage:
+        store = ModelStore()
+        path = store.resolve('float16')   # verified path (downloads it if needed)
+        buffer = store.load('float16')    # verified bytes for BaseOptions(model_asset_buffer=...)
+    """
+    def __init__(self, cache_dir=None, search_dirs=None, variants=None, offline=None, trust_on_first_use=None):
+        self.cache_dir = cache_dir or settings.MODEL_CACHE_DIR
+        self.search_dirs = list(settings.MODEL_SEARCH_DIRS if search_dirs is None else search_dirs)
+        self.variants = settings.MODEL_VARIANTS if variants is None else variants
+        self.offline = settings.MODEL_OFFLINE if offline is None else offline
+        self.trust_on_first_use = (settings.MODEL_TRUST_ON_FIRST_USE if trust_on_first_use is None
+                                   else trust_on_first_use)
+
+    def variant(self, name=None):
+        name = name or settings.MODEL_VARIANT
+        if name not in self.variants:
+            raise ValueError(f"Unknown model variant '{name}', expected one of {sorted(self.variants)}")
+        return self.variants[name]
+
+    def cache_path(self, name=None):
+        return os.path.join(self.cache_dir, self.variant(name)['file'])
+
+    def _pin_path(self, name):
+        return self.cache_path(name) + '.sha256'
+
+    def expected_sha256(self, name=None):
+        """The variant's published checksum, else the one recorded on first use (None if neither)."""
+        expected = self.variant(name).get('sha256')
+        if expected:
+            return expected.lower()
+        try:
+            with open(self._pin_path(name)) as f:
+                return f.read().split()[0].lower()
+        except (OSError, IndexError):
+            return None
+
+    def _require_checksum(self, name):
+        """Raises ValueError if the variant has no checksum to verify against and trust on first use is off."""
+        if self.expected_sha256(name) is None and not self.trust_on_first_use:
+            raise ValueError(
+                f"Model variant '{name}' has no published SHA-256 in settings.MODEL_VARIANTS. Add it, or pin "
+                f"the current file explicitly: python server/download_model.py --variant {name} --trust-on-first-use")
+
+    def _pin(self, name, digest):
+        if self.variant(name).get('sha256'):
+            return
+        print(f"Model variant '{name}' has no published SHA-256, pinned to {digest[:12]}... (trust on first use).")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._pin_path(name), 'w') as f:
+            f.write(f"{digest}  {self.variant(name)['file']}\n")
+
+    def _candidates(self, name):
+        filename = self.variant(name)['file']
+        paths = [self.cache_path(name)] + [os.path.join(d, filename) for d in self.search_dirs]
+        seen = set()
+        for path in paths:
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in seen and os.path.isfile(path):
+                seen.add(key)
+                yield path
+
+    def _check(self, name, path, load):
+        """
+        Verifies one candidate file.
+
+        Returns:
+            tuple: (ok, data) with the file's bytes in `data` if `load` and the file is valid.
+        """
+        if os.path.getsize(path) == 0:
+            print(f"Model {path} is empty, skipped.")
+            return False, None
+        with _mapped(path) as mapped:
+            digest = hashlib.sha256(mapped).hexdigest()
+            expected = self.expected_sha256(name)
+            if expected is not None and digest != expected:
+                print(f"Model {path} failed its SHA-256 check (expected {expected[:12]}..., "
+                      f"got {digest[:12]}...), skipped.")
+                return False, None
+            # MediaPipe takes the model as bytes, so the verified mapping is copied exactly once
+            data = mapped[:] if load else None
+        if expected is None:
+            self._pin(name, digest)
+        return True, data
+
+    def _find(self, name, load):
+        name = name or settings.MODEL_VARIANT
+        self._require_checksum(name)
+        for path in self._candidates(name):
+            ok, data = self._check(name, path, load)
+            if ok:
+                return path, data
+            if path == self.cache_path(name):
+                # A corrupt cache entry is ours to replace; pre-seeded files are left alone
+                os.remove(path)
+        path = self.download(name)
+        ok, data = self._check(name, path, load)
+        if not ok:
+            os.remove(path)
+            raise ValueError(f"Downloaded model {path} failed its checks, removed")
+        return path, data
+
+    def resolve(self, name=None):
+        """
+        Returns the path of a verified copy of the variant, downloading it if there is none.
+
+        Raises:
+            FileNotFoundError: No valid copy and downloading is off or not possible.
+            ValueError: Unknown variant, no checksum to verify against (see `MODEL_TRUST_ON_FIRST_USE`),
+                        or the download failed its checksum.
+        """
+        return self._find(name, load=False)[0]
+
+    def load(self, name=None):
+        """
+        Returns the verified model file contents (read through a memory map).
+
+        Raises:
+            Same as `resolve()`.
+        """
+        return self._find(name, load=True)[1]
+
+    def download(self, name=None, force=False):
+        """
+        Downloads the variant into the cache (to a temporary file, verified, then renamed).
+
+        The file is checked against the published checksum, else the recorded pin. With trust
+        on first use, a variant without a published checksum is (re-)pinned to the download.
+
+        Returns:
+            str: The cached path.
+        """
+        name = name or settings.MODEL_VARIANT
+        variant = self.variant(name)
+        target = self.cache_path(name)
+        if not force and os.path.isfile(target):
+            return target
+        expected = None if self.trust_on_first_use else self.expected_sha256(name)
+        if variant.get('sha256'):
+            expected = variant['sha256'].lower()
+        self._require_checksum(name)
+        url = variant.get('url')
+        if self.offline or not url:
+            reason = "offline mode" if self.offline else "the variant has no URL"
+            raise FileNotFoundError(
+                f"No valid '{name}' model ({reason}). Copy {variant['file']} "
+                f"into {self.cache_dir} or one of {self.search_dirs}.")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp = target + '.part'
+        digest = hashlib.sha256()
+        print(f"Downloading {url} ...")
+        try:
+            with urllib.request.urlopen(url, timeout=settings.MODEL_DOWNLOAD_TIMEOUT) as response, \
+                    open(temp, 'wb') as f:
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+            digest = digest.hexdigest()
+            if os.path.getsize(temp) == 0:
+                raise ValueError(f"Downloaded model {url} is empty")
+            if expected and digest != expected:
+                raise ValueError(f"Downloaded model {url} failed its SHA-256 check "
+                                 f"(expected {expected[:12]}..., got {digest[:12]}...)")
+            os.replace(temp, target)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+        if self.trust_on_first_use:
+            self._pin(name, digest)
+        print(f"Saved {target} (sha256 {digest})")
+        return target
+
+    def seed(self, name, source):
+        """
+        Copies a local model file into the cache (e.g. for offline machines), then verifies it.
+        With trust on first use, a variant without a published checksum is re-pinned to the copied file.
+        """
+        name = name or settings.MODEL_VARIANT
+        self._require_checksum(name)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        shutil.copyfile(source, self.cache_path(name))
+        if self.trust_on_first_use and not self.variant(name).get('sha256') and os.path.exists(self._pin_path(name)):
+            os.remove(self._pin_path(name))
+        return self.resolve(name)
@@ -0,0 +1,289 @@
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from server.config import settings
+from server.vision.hand_tracking import HandTracker, TrackingResult
+from server.vision.models import ModelStore
+
+
+class SharedFrameRing:
+    """
+    A ring of equally sized BGR frame slots in `multiprocessing.shared_memory`.
+
+    Processes exchange frames by slot index only; the pixels never go through a
+    pipe or get pickled.
+    """
+    def __init__(self, slots, shape, name=None):
+        """
+        Args:
+            slots (int): Number of frame slots.
+            shape (tuple): (height, width, channels) of one frame.
+            name (str): Attach to an existing ring instead of creating one.
+        """
+        self.slots = slots
+        self.shape = tuple(shape)
+        size = int(slots * np.prod(self.shape))
+        self._owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        # Drop the view before closing, the buffer cannot be released while it is exported
+        self.frames = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def _inference_worker(ring_name, slots, shape, tasks, results, ready, running_mode, use_roi, max_hands, model):
+    """
+    Worker process: runs HandTracker on ring slots named by its task queue.
+
+    Puts its process name on `ready` once its detector is built and warmed up.
+    Tasks are (slot, frame_id, capture_time); None stops the worker.
+    Results are (slot, frame_id, capture_time, landmarks, handedness) with the
+    landmarks of each hand as a (21, 3) float32 array.
+    """
+    ring = SharedFrameRing(slots, shape, name=ring_name)
+    tracker = HandTracker(running_mode=running_mode, use_roi=use_roi, max_hands=max_hands, model=model)
+    tracker.warm_up(shape)
+    ready.put(mp_proc.current_process().name)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            slot, frame_id, capture_time = task
+
+            _, result = tracker.process_frame(ring.frames[slot], capture_time)
+
+            landmarks, handedness = [], []
+            if result is not None:
+                landmarks = [np.array([(lm.x, lm.y, lm.z) for lm in hand], dtype=np.float32)
+                             for hand in result.hand_landmarks]
+                handedness = result.handedness
+            results.put((slot, frame_id, capture_time, landmarks, handedness))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tracker.close()
+        ring.close()
+
+
+class MultiProcessTracker:
+    """
+    Drop-in replacement for `HandTracker` that runs inference in worker processes.
+
+    `process_frame` copies the frame into a free slot of a shared-memory ring,
+    queues the slot index for the next free worker and returns the newest finished
+    result (like LIVE_STREAM mode, check `capture_time` for its age). Gesture logic
+    and networking stay in the main process; inference no longer competes with
+    them (or with the preview and config threads) for the GIL.
+
+    The ring and the workers are created on the first frame, since the frame size
+    is not known before. The frame size must stay constant afterwards.
+
+    Each worker has its own task queue, so the tracker knows which slots a worker
+    holds. A worker that died is skipped from then on and its slots go back to the
+    pool; a result older than `WORKER_RESULT_TIMEOUT` is no longer returned, so a
+    gesture cannot stay "active" on a result that will never be replaced.
+    """
+    def __init__(self, workers=None, running_mode=None, use_roi=None, max_hands=None, model=None):
+        self.workers = workers or settings.INFERENCE_WORKERS
+        self.running_mode = (running_mode or settings.RUNNING_MODE).upper()
+        if self.running_mode == 'LIVE_STREAM':
+            # Workers already run asynchronously to the main loop
+            self.running_mode = 'VIDEO'
+        self.use_roi = settings.USE_ROI_INFERENCE if use_roi is None else use_roi
+        self.max_hands = max_hands or settings.MAX_HANDS
+        self.model = model or settings.MODEL_VARIANT
+        try:
+            # Fetched once here, so the workers do not all download it at the same time
+            ModelStore().resolve(self.model)
+        except (OSError, ValueError) as e:
+            print(f"Model unavailable: {e}")
+        self.slots = self.workers * settings.RING_SLOTS_PER_WORKER
+
+        self._ring = None
+        self._processes = []
+        self._context = mp_proc.get_context('spawn')
+        self._tasks = []          # One task queue per worker
+        self._results = None
+        self._ready = None
+
+        self._free_slots = list(range(self.slots))
+        self._in_flight = {}      # slot -> (index of the worker processing it, frame_id)
+        self._frame_id = 0
+        self._latest_frame_id = -1
+        self._latest_result = None
+
+        # Stats
+        self.frames_dispatched = 0
+        self.frames_dropped = 0
+        self.results_received = 0
+        self.results_out_of_order = 0
+        self.workers_lost = 0
+        self.workers_ready = 0
+        self.stale_results = 0
+
+    # Same drawing helper as the in-process tracker
+    draw_landmarks = staticmethod(HandTracker.draw_landmarks)
+
+    def _start(self, shape):
+        self._ring = SharedFrameRing(self.slots, shape)
+        self._results = self._context.Queue()
+        self._ready = self._context.Queue()
+        for i in range(self.workers):
+            tasks = self._context.Queue()
+            process = self._context.Process(
+                target=_inference_worker,
+                args=(self._ring.name, self.slots, shape, tasks, self._results, self._ready,
+                      self.running_mode, self.use_roi, self.max_hands, self.model),
+                name=f"GestureNavInference-{i}",
+                daemon=True
+            )
+            process.start()
+            self._tasks.append(tasks)
+            self._processes.append(process)
+        print(f"MultiProcessTracker started {self.workers} worker(s), {self.slots} ring slots of {shape}.")
+
+    def warm_up(self, shape):
+        """
+        Starts the workers early and waits until each one has built and warmed up its own
+        detector (at most `WORKER_READY_TIMEOUT` seconds; a worker that dies is not waited for).
+        """
+        if self._ring is None:
+            self._start(shape)
+        deadline = time.perf_counter() + settings.WORKER_READY_TIMEOUT
+        while True:
+            alive = self._reclaim_dead_workers()
+            if self.workers_ready >= len(alive):
+                break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                print(f"Only {self.workers_ready} of {len(alive)} inference worker(s) ready "
+                      f"after {settings.WORKER_READY_TIMEOUT:.0f} s, continuing.")
+                break
+            try:
+                # Short waits, so a worker that crashes while loading is noticed
+                self._ready.get(timeout=min(remaining, 0.1))
+                self.workers_ready += 1
+            except queue.Empty:
+                pass
+
+    def _collect(self, block=False, timeout=None):
+        """Takes finished results off the result queue and frees their slots."""
+        while True:
+            try:
+                slot, frame_id, capture_time, landmarks, handedness = self._results.get(block=block, timeout=timeout)
+            except queue.Empty:
+                return
+            block = False
+            if self._in_flight.get(slot, (None, None))[1] == frame_id:
+                # (A result a worker sent just before dying may name a slot that was reassigned since)
+                del self._in_flight[slot]
+                self._free_slots.append(slot)
+            self.results_received += 1
+
+            if frame_id < self._latest_frame_id:
+                # A faster worker already delivered a newer frame
+                self.results_out_of_order += 1
+                continue
+            self._latest_frame_id = frame_id
+            self._latest_result = TrackingResult(landmarks, handedness, capture_time)
+
+    def _reclaim_dead_workers(self):
+        """Returns the slots of workers that died to the free pool. Returns the live worker indices."""
+        alive = []
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            if process.is_alive():
+                alive.append(index)
+                continue
+            print(f"Inference worker {process.name} died (exit code {process.exitcode}).")
+            self._processes[index] = None
+            self.workers_lost += 1
+            for slot in [slot for slot, (worker, _) in self._in_flight.items() if worker == index]:
+                del self._in_flight[slot]
+                self._free_slots.append(slot)
+        return alive
+
+    def _next_worker(self, alive):
+        """The live worker with the fewest frames in flight."""
+        load = {index: 0 for index in alive}
+        for worker, _ in self._in_flight.values():
+            if worker in load:
+                load[worker] += 1
+        return min(alive, key=lambda index: load[index])
+
+    def process_frame(self, image, capture_time=None):
+        """
+        Same contract as `HandTracker.process_frame` in LIVE_STREAM mode.
+
+        Returns:
+            tuple: (image, result) with result the newest finished TrackingResult (or None).
+        """
+        if capture_time is None:
+            capture_time = time.perf_counter()
+        if self._ring is None:
+            self._start(image.shape)
+
+        self._collect()
+        if not self._free_slots:
+            # Every slot is in flight: wait briefly for a worker instead of queueing more
+            self._collect(block=True, timeout=settings.RING_WAIT_TIMEOUT)
+
+        alive = self._reclaim_dead_workers()
+        if self._free_slots and alive:
+            slot = self._free_slots.pop()
+            worker = self._next_worker(alive)
+            np.copyto(self._ring.frames[slot], image)
+            self._in_flight[slot] = (worker, self._frame_id)
+            self._tasks[worker].put((slot, self._frame_id, capture_time))
+            self._frame_id += 1
+            self.frames_dispatched += 1
+        else:
+            self.frames_dropped += 1
+
+        result = self._latest_result
+        if result is not None and capture_time - result.capture_time > settings.WORKER_RESULT_TIMEOUT:
+            # No newer result for too long (workers dead or stalled): report no hands instead
+            self.stale_results += 1
+            return image, None
+        return image, result
+
+    def get_stats(self):
+        return {
+            'dispatched': self.frames_dispatched,
+            'dropped': self.frames_dropped,
+            'results': self.results_received,
+            'out_of_order': self.results_out_of_order,
+            'stale': self.stale_results,
+            'workers_ready': self.workers_ready,
+            'workers_alive': sum(1 for process in self._processes if process is not None and process.is_alive()),
+            'workers_lost': self.workers_lost
+        }
+
+    def close(self):
+        for process, tasks in zip(self._processes, self._tasks):
+            if process is not None:
+                tasks.put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._tasks = []
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
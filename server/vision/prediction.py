@@ -0,0 +1,103 @@
+from collections import deque
+
+import numpy as np
+from server.config import settings
+from server.config.runtime import RuntimeConfig, boolean, number
+from server.vision.gesture_analysis import WRIST, THUMB_TIP, INDEX_TIP, SAFETY_TIPS
+
+# Landmarks the gesture logic reads: extrapolating only these keeps the rest of the hand untouched
+PREDICTED_LANDMARKS = [WRIST, THUMB_TIP, INDEX_TIP] + SAFETY_TIPS
+
+
+class LandmarkPredictor:
+    """
+    Latency compensation: extrapolates the wrist and fingertips of every track
+    forward to the time the gesture will actually be applied.
+
+    The horizon is the measured pipeline latency of the current frame (capture
+    to now) plus `prediction_lead`, the expected delay until the client applies
+    the packet. Velocities are a least-squares fit over the last few
+    (timestamp, landmarks) samples of the track, so a single noisy frame cannot
+    flip the direction. The horizon is capped at `prediction_max_horizon` and
+    the displacement at `prediction_max_offset` to avoid overshoot when the
+    hand stops or turns.
+
+    Runs after `LandmarkSmoother`, on the smoothed landmarks.
+    """
+    VALIDATORS = {
+        'use_prediction': boolean,
+        'prediction_lead': number(0.0, 1.0),
+        'prediction_max_horizon': number(0.0, 1.0),
+        'prediction_max_offset': number(0.0, 1.0)
+    }
+
+    def __init__(self):
+        self._config = RuntimeConfig({
+            'use_prediction': settings.DEFAULT_USE_PREDICTION,
+            'prediction_lead': settings.DEFAULT_PREDICTION_LEAD,
+            'prediction_max_horizon': settings.DEFAULT_PREDICTION_MAX_HORIZON,
+            'prediction_max_offset': settings.DEFAULT_PREDICTION_MAX_OFFSET
+        }, self.VALIDATORS)
+        self.history_size = settings.PREDICTION_HISTORY
+        self.last_horizon = 0.0
+
+    @property
+    def config(self):
+        """The current ConfigSnapshot (read-only)."""
+        return self._config.snapshot
+
+    def update_config(self, new_config):
+        """Validates and publishes a predictor configuration update (e.g. from UDP listener)."""
+        return self._config.update(new_config)
+
+    def _velocity(self, history):
+        """Least-squares slope of the predicted landmarks over the history, per element."""
+        times = np.array([sample[0] for sample in history])
+        points = np.stack([sample[1] for sample in history])
+        times = times - times.mean()
+        denominator = float(np.dot(times, times))
+        if denominator <= 0:
+            return None
+        return np.tensordot(times, points - points.mean(axis=0), axes=1) / denominator
+
+    def apply(self, tracks, capture_time, now):
+        """
+        Records the current landmarks and replaces `track.landmarks` with the prediction.
+
+        Args:
+            tracks (list): HandTracks visible in the current frame (already smoothed).
+            capture_time (float): Capture time of the frame the landmarks came from.
+            now (float): `time.perf_counter()` just before the gesture logic runs.
+
+        Returns:
+            float: The horizon (seconds) the landmarks were extrapolated by, 0 if disabled.
+        """
+        config = self.config
+        horizon = 0.0
+        if config['use_prediction']:
+            horizon = min(max(now - capture_time + config['prediction_lead'], 0.0), config['prediction_max_horizon'])
+        self.last_horizon = horizon
+
+        for track in tracks:
+            if track.history is None:
+                track.history = deque(maxlen=self.history_size)
+            if not track.history or capture_time > track.history[-1][0]:
+                track.history.append((capture_time, track.landmarks[PREDICTED_LANDMARKS]))
+
+            if horizon <= 0 or len(track.history) < 2:
+                continue
+            velocity = self._velocity(track.history)
+            if velocity is None:
+                continue
+
+            # Extrapolate from the current sample, clamped per landmark
+            offset = velocity * horizon
+            length = np.linalg.norm(offset[:, :2], axis=1, keepdims=True)
+            limit = config['prediction_max_offset']
+            offset *= np.minimum(1.0, limit / np.maximum(length, 1e-9))
+
+            predicted = track.landmarks.copy()
+            predicted[PREDICTED_LANDMARKS] += offset
+            track.landmarks = predicted
+
+        return horizon
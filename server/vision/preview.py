@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+
+import cv2
+from server.config import settings
+
+
+class PreviewRenderer:
+    """
+    Renders the preview window on its own thread.
+
+    The vision loop hands over (frame, result, gesture) through a bounded queue
+    with `submit()`, which never blocks: when the renderer falls behind, the oldest
+    pending frame is dropped. Frames are rendered at most `max_fps` times per
+    second, downscaled by `scale`, so drawing, `imshow` and `waitKey` no longer
+    add latency or GUI jitter to the gesture samples.
+
+    With `metrics` (a `StageMetrics`), the time spent rendering each frame is
+    recorded as the 'preview' stage, and `stats_overlay` adds an FPS / latency line.
+
+    Note: OpenCV's HighGUI runs fine off the main thread on Windows and Linux.
+    On macOS window calls must stay on the main thread; use `--headless` there.
+    """
+    def __init__(self, tracker, window_name="GestureNav Vision (Tasks)", max_fps=None, scale=None,
+                 metrics=None, stats_overlay=None):
+        self.tracker = tracker
+        self.window_name = window_name
+        self.max_fps = settings.PREVIEW_FPS if max_fps is None else max_fps
+        self.scale = settings.PREVIEW_SCALE if scale is None else scale
+        self.metrics = metrics
+        self.stats_overlay = settings.PREVIEW_STATS_OVERLAY if stats_overlay is None else stats_overlay
+
+        self._queue = queue.Queue(maxsize=settings.PREVIEW_QUEUE_SIZE)
+        self._thread = None
+        self._running = False
+
+        # Set when the user closes the window or presses Q / ESC
+        self.closed = False
+
+        # Stats
+        self.frames_submitted = 0
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="PreviewRenderer", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, frame, detection_result, gesture_data, config):
+        """
+        Queues a frame for display. Never blocks; drops the oldest frame under pressure.
+
+        Args:
+            frame: Unflipped BGR camera frame (not modified afterwards by the caller).
+            detection_result: TrackingResult to draw.
+            gesture_data (dict): Output of `GestureDecider.analyze`.
+            config (dict): Deadzone settings to draw (a copy of the decider config).
+        """
+        self.frames_submitted += 1
+        item = (frame, detection_result, gesture_data, config)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.frames_dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        cv2.namedWindow(self.window_name)
+        min_interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+        last_render = float('-inf')
+
+        while self._running:
+            try:
+                item = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                wait = min_interval - (time.perf_counter() - last_render)
+                if wait > 0:
+                    # Rate limit; newer frames replace this one in the meantime
+                    time.sleep(wait)
+                    try:
+                        item = self._queue.get_nowait()
+                        self.frames_dropped += 1
+                    except queue.Empty:
+                        pass
+                last_render = time.perf_counter()
+                cv2.imshow(self.window_name, self.render(*item))
+                self.frames_rendered += 1
+                if self.metrics is not None:
+                    self.metrics.observe('preview', time.perf_counter() - last_render)
+
+            # Check Exit Key
+            key = cv2.waitKey(1) & 0xFF
+            if key == 27 or key == ord('q') or key == ord('Q'):
+                self.closed = True
+
+            # Check for Window Close (X button)
+            try:
+                if cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE) < 1:
+                    self.closed = True
+            except cv2.error:
+                pass
+
+        cv2.destroyAllWindows()
+
+    def render(self, frame, detection_result, gesture_data, config):
+        """
+        Draws landmarks, the deadzone and status text onto a (downscaled) mirrored copy of the frame.
+
+        The vision loop never flips pixels (landmarks are mirrored instead), so the
+        mirror effect is applied here, only for frames that are actually shown.
+        """
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        image = cv2.flip(frame, 1)
+
+        # Draw Landmarks
+        self.tracker.draw_landmarks(image, detection_result)
+
+        # Draw UI Overlays (Text, Deadzone) from logic
+        h, w, _ = image.shape
+
+        # Deadzone Visual
+        dcx = int(w * config['deadzone_offset_x'])
+        dcy = int(h * config['deadzone_offset_y'])
+        dr = int(w * config['deadzone_radius'])
+        cv2.circle(image, (dcx, dcy), dr, (0, 255, 0), 1)
+
+        # Status Text
+        joy_text = f"Joy: {gesture_data['orbit_x']:.2f}, {gesture_data['orbit_y']:.2f}"
+        cv2.putText(image, joy_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+        # Conditional Overlays (Errors/Warnings)
+        for text, pos, color in gesture_data['text_overlays']:
+            cv2.putText(image, text, pos, cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+        # Performance line (bottom left)
+        if self.stats_overlay and self.metrics is not None:
+            cv2.putText(image, self.metrics.overlay_text(), (10, h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                        (255, 255, 0), 1)
+
+        return image
+
+    def get_stats(self):
+        return {
+            'submitted': self.frames_submitted,
+            'rendered': self.frames_rendered,
+            'dropped': self.frames_dropped
+        }
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
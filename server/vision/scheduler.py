@@ -0,0 +1,121 @@
+import time
+
+import numpy as np
+from server.config import settings
+
+
+class InferenceScheduler:
+    """
+    Decides per frame whether the vision loop runs full hand inference.
+
+    Modes:
+        ACTIVE: Inference on every frame (or capped at `active_rate` Hz).
+        IDLE:   Entered once `analyze` has reported "idle" for `idle_delay` seconds.
+                Inference drops to `idle_rate` Hz, and a cheap frame-difference motion
+                detector on a tiny grayscale thumbnail wakes full-rate inference as
+                soon as something moves.
+    """
+    ACTIVE = "active"
+    IDLE = "idle"
+
+    def __init__(self, idle_rate=None, active_rate=None, motion_threshold=None, idle_delay=None):
+        self.idle_rate = settings.IDLE_INFERENCE_RATE if idle_rate is None else idle_rate
+        self.active_rate = settings.ACTIVE_INFERENCE_RATE if active_rate is None else active_rate
+        self.motion_threshold = settings.MOTION_THRESHOLD if motion_threshold is None else motion_threshold
+        self.idle_delay = settings.IDLE_ENTER_DELAY if idle_delay is None else idle_delay
+
+        self.mode = self.ACTIVE
+        now = time.perf_counter()
+        self._mode_since = now
+        self._idle_since = None
+        self._last_inference = float('-inf')
+        self._prev_thumb = None
+
+        # Stats
+        self._time_in_mode = {self.ACTIVE: 0.0, self.IDLE: 0.0}
+        self.frames_inferred = 0
+        self.frames_skipped = 0
+        self.wakeups = 0
+
+    def _set_mode(self, mode, now):
+        if mode == self.mode:
+            return
+        self._time_in_mode[self.mode] += now - self._mode_since
+        self.mode = mode
+        self._mode_since = now
+        if mode == self.IDLE:
+            self._prev_thumb = None
+
+    def _motion(self, frame):
+        """Mean absolute difference (0-255) between this and the previous thumbnail."""
+        # Imported here: `server.main` imports this module, and OpenCV should load on the
+        # startup thread that opens the camera (in parallel with MediaPipe), not on import
+        import cv2
+        thumb = cv2.resize(frame, settings.MOTION_DOWNSCALE, interpolation=cv2.INTER_AREA)
+        thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        prev, self._prev_thumb = self._prev_thumb, thumb
+        if prev is None:
+            return 0.0
+        return float(np.mean(cv2.absdiff(thumb, prev)))
+
+    def should_infer(self, frame, now=None):
+        """
+        Args:
+            frame: The BGR frame about to be processed.
+            now (float): `time.perf_counter()` timestamp. Defaults to now.
+
+        Returns:
+            bool: True if full inference should run on this frame.
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        if self.mode == self.IDLE and self._motion(frame) > self.motion_threshold:
+            # Something moved: wake up and run inference on this very frame
+            self.wakeups += 1
+            self._idle_since = None
+            self._set_mode(self.ACTIVE, now)
+            self._last_inference = float('-inf')
+
+        rate = self.idle_rate if self.mode == self.IDLE else self.active_rate
+
+        if rate > 0 and now - self._last_inference < 1.0 / rate:
+            self.frames_skipped += 1
+            return False
+
+        self._last_inference = now
+        self.frames_inferred += 1
+        return True
+
+    def report(self, state, now=None):
+        """Feeds back the gesture state ("idle" / "active") of the last analyzed frame."""
+        if now is None:
+            now = time.perf_counter()
+
+        if state != "idle":
+            self._idle_since = None
+            self._set_mode(self.ACTIVE, now)
+            return
+
+        if self._idle_since is None:
+            self._idle_since = now
+        elif self.mode == self.ACTIVE and now - self._idle_since >= self.idle_delay:
+            self._set_mode(self.IDLE, now)
+
+    def get_stats(self, now=None):
+        """
+        Returns:
+            dict: {'mode', 'active_s', 'idle_s', 'frames_inferred', 'frames_skipped', 'wakeups'}
+        """
+        if now is None:
+            now = time.perf_counter()
+        time_in_mode = dict(self._time_in_mode)
+        time_in_mode[self.mode] += now - self._mode_since
+        return {
+            'mode': self.mode,
+            'active_s': time_in_mode[self.ACTIVE],
+            'idle_s': time_in_mode[self.IDLE],
+            'frames_inferred': self.frames_inferred,
+            'frames_skipped': self.frames_skipped,
+            'wakeups': self.wakeups
+        }
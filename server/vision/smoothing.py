@@ -0,0 +1,173 @@
+import math
+
+import numpy as np
+from server.config import settings
+from server.config.runtime import RuntimeConfig, choice, number
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter (Casiez et al.) over a whole landmark array at once.
+
+    Every element is its own signal: a low-pass filter whose cutoff rises with
+    the (smoothed) speed of that element, so slow movement is smoothed hard
+    (little jitter) and fast movement passes with little lag.
+    """
+    def __init__(self, min_cutoff=None, beta=None, d_cutoff=None):
+        self.min_cutoff = settings.DEFAULT_FILTER_MIN_CUTOFF if min_cutoff is None else min_cutoff
+        self.beta = settings.DEFAULT_FILTER_BETA if beta is None else beta
+        self.d_cutoff = settings.DEFAULT_FILTER_D_CUTOFF if d_cutoff is None else d_cutoff
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, timestamp):
+        """
+        Args:
+            x: Array of raw values (e.g. (21, 3) landmarks).
+            timestamp (float): Time of the measurement in seconds.
+
+        Returns:
+            The filtered array (a new array, safe to keep).
+        """
+        if self.value is None:
+            self.value = np.array(x, dtype=np.float32)
+            self.velocity = np.zeros_like(self.value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+
+        raw_velocity = (x - self.value) / dt
+        self.velocity = self.velocity + self._alpha(self.d_cutoff, dt) * (raw_velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        self.value = self.value + self._alpha(cutoff, dt) * (x - self.value)
+        self.timestamp = timestamp
+        return self.value
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter over a whole landmark array at once.
+
+    Each element has an independent (position, velocity) state, so the 2x2
+    covariance is kept as three arrays (p00, p01, p11) and predict / update are
+    plain element-wise NumPy expressions.
+    """
+    def __init__(self, process_noise=None, measurement_noise=None):
+        self.process_noise = settings.DEFAULT_FILTER_PROCESS_NOISE if process_noise is None else process_noise
+        self.measurement_noise = settings.DEFAULT_FILTER_MEASUREMENT_NOISE if measurement_noise is None \
+            else measurement_noise
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    def __call__(self, x, timestamp):
+        """Same contract as `OneEuroFilter.__call__`."""
+        if self.value is None:
+            self.value = np.array(x, dtype=np.float32)
+            self.velocity = np.zeros_like(self.value)
+            self._p00 = np.full_like(self.value, self.measurement_noise)
+            self._p01 = np.zeros_like(self.value)
+            self._p11 = np.ones_like(self.value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+        q = self.process_noise
+
+        # Predict (white-noise acceleration model)
+        position = self.value + self.velocity * dt
+        p00 = self._p00 + dt * (2.0 * self._p01 + dt * self._p11) + q * dt ** 4 / 4.0
+        p01 = self._p01 + dt * self._p11 + q * dt ** 3 / 2.0
+        p11 = self._p11 + q * dt ** 2
+
+        # Update with the measured position
+        gain_p = p00 / (p00 + self.measurement_noise)
+        gain_v = p01 / (p00 + self.measurement_noise)
+        innovation = x - position
+        self.value = position + gain_p * innovation
+        self.velocity = self.velocity + gain_v * innovation
+        self._p00 = (1.0 - gain_p) * p00
+        self._p01 = (1.0 - gain_p) * p01
+        self._p11 = p11 - gain_v * p01
+        self.timestamp = timestamp
+        return self.value
+
+
+class LandmarkSmoother:
+    """
+    Filtering stage between `HandTracker` and `GestureDecider`.
+
+    Smooths all 21 landmarks of every tracked hand (not just the final orbit
+    vector), so the pinch and fist heuristics see the same steady signal. Each
+    track keeps its own filter state; `track.raw_landmarks` stays unfiltered.
+
+    Modes: "one_euro" (adaptive low-pass), "kalman" (constant velocity) or "off".
+    Configurable at runtime over the config port, like `GestureDecider`.
+    """
+    MODES = ('off', 'one_euro', 'kalman')
+    VALIDATORS = {
+        'filter_mode': choice(*MODES),
+        'filter_min_cutoff': number(1e-3, 100.0),
+        'filter_beta': number(0.0, 1e4),
+        'filter_d_cutoff': number(1e-3, 100.0),
+        'filter_process_noise': number(0.0, 1e6),
+        'filter_measurement_noise': number(1e-12, 1.0)
+    }
+
+    def __init__(self):
+        self._config = RuntimeConfig({
+            'filter_mode': settings.DEFAULT_FILTER_MODE,
+            'filter_min_cutoff': settings.DEFAULT_FILTER_MIN_CUTOFF,
+            'filter_beta': settings.DEFAULT_FILTER_BETA,
+            'filter_d_cutoff': settings.DEFAULT_FILTER_D_CUTOFF,
+            'filter_process_noise': settings.DEFAULT_FILTER_PROCESS_NOISE,
+            'filter_measurement_noise': settings.DEFAULT_FILTER_MEASUREMENT_NOISE
+        }, self.VALIDATORS)
+
+    @property
+    def config(self):
+        """The current ConfigSnapshot; its version changes whenever a value does."""
+        return self._config.snapshot
+
+    def update_config(self, new_config):
+        """Validates and publishes a filter configuration update (e.g. from UDP listener)."""
+        return self._config.update(new_config)
+
+    @staticmethod
+    def _make_filter(config):
+        if config['filter_mode'] == 'kalman':
+            return KalmanFilter(config['filter_process_noise'], config['filter_measurement_noise'])
+        return OneEuroFilter(config['filter_min_cutoff'], config['filter_beta'], config['filter_d_cutoff'])
+
+    def apply(self, tracks, timestamp):
+        """
+        Replaces `track.landmarks` with the filtered landmarks, in place.
+
+        Args:
+            tracks (list): HandTracks visible in the current frame.
+            timestamp (float): Capture time of the frame the landmarks came from.
+        """
+        config = self.config
+        if config['filter_mode'] == 'off':
+            for track in tracks:
+                track.filter = None
+                track.landmarks = track.raw_landmarks
+            return
+
+        for track in tracks:
+            # Rebuild the filter when the config changed since it was made
+            if track.filter is None or track.filter_version != config.version:
+                track.filter = self._make_filter(config)
+                track.filter_version = config.version
+            track.landmarks = track.filter(track.raw_landmarks, timestamp)
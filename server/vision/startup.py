@@ -0,0 +1,110 @@
+"""
+Parallel server startup.
+
+The slow steps of bringing the vision pipeline up do not depend on each other:
+
+    detector  Importing MediaPipe (~0.8 s) and building the HandLandmarker (model check and load).
+    camera    Opening the capture device (often 0.5-2 s), probing its modes if enabled,
+              and waiting for its first frame.
+    warm-up   MediaPipe's first inference is several times slower than the following ones.
+
+`PipelineStartup` runs the detector and camera steps on two threads, then warms the
+detector up with a black frame of the camera's size. Readiness is checked (first
+frame captured, warm-up finished) instead of sleeping a fixed time.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from server.config import settings
+from server.vision.capture import FrameGrabber
+
+
+class PipelineStartup:
+    """
+    Builds the tracker and the frame grabber in the background.
+
+    Usage:
+        startup = PipelineStartup(source=None, workers=0, max_hands=1)
+        ...                                   # start everything else meanwhile
+        tracker, grabber = startup.result()   # both ready (detector warmed up, first frame captured)
+
+    `get_stats()` has the time of each step, in seconds since the startup began.
+    """
+    def __init__(self, source=None, paced=True, loop=False, fps=30.0, workers=0, max_hands=None, model=None,
+                 probe=None):
+        self.started = time.perf_counter()
+        self.timings = {}
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="GestureNavStartup")
+        self._grabber = self._pool.submit(self._open_grabber, source, paced, loop, fps, probe)
+        self._tracker = self._pool.submit(self._build_tracker, workers, max_hands, model)
+
+    def mark(self, step):
+        """Records that `step` finished now."""
+        self.timings[step] = time.perf_counter() - self.started
+
+    def _open_grabber(self, source, paced, loop, fps, probe):
+        # Imported here so OpenCV loads in parallel with MediaPipe
+        from server.vision.frame_source import open_frame_source
+        capture = open_frame_source(source, paced=paced, loop=loop, fps=fps, probe=probe)
+        self.mark('camera_open_s')
+        grabber = FrameGrabber(capture).start()
+        shape = grabber.wait_ready(settings.STARTUP_FRAME_TIMEOUT)
+        if shape is None:
+            print(f"No frame from the source within {settings.STARTUP_FRAME_TIMEOUT:.0f} s.")
+        else:
+            self.mark('first_frame_s')
+        return grabber, shape
+
+    def _build_tracker(self, workers, max_hands, model):
+        # Imported here, off the main thread: MediaPipe is by far the slowest import of the server
+        if workers > 0:
+            from server.vision.multiprocess import MultiProcessTracker
+            self.mark('import_s')
+            tracker = MultiProcessTracker(workers=workers, max_hands=max_hands, model=model)
+        else:
+            from server.vision.hand_tracking import HandTracker
+            self.mark('import_s')
+            tracker = HandTracker(max_hands=max_hands, model=model)
+        self.mark('detector_s')
+
+        # Warm up at the camera's frame size (known once the first frame is in)
+        try:
+            _, shape = self._grabber.result()
+            if shape is not None:
+                tracker.warm_up(shape)
+                self.mark('warm_up_s')
+        except BaseException:
+            # The source failed to open (or warm-up failed): nobody will close the tracker otherwise
+            tracker.close()
+            raise
+        return tracker
+
+    def result(self):
+        """
+        Waits until the detector is warmed up and the camera delivers frames.
+
+        Returns:
+            tuple: (tracker, grabber)
+
+        Raises:
+            The exception of the failed step. Whatever did start is stopped first.
+        """
+        try:
+            try:
+                grabber, _ = self._grabber.result()
+            except BaseException:
+                # The detector step sees the failure too and closes its tracker; let it finish
+                self._pool.shutdown(wait=True)
+                raise
+            try:
+                tracker = self._tracker.result()
+            except BaseException:
+                grabber.stop()
+                raise
+        finally:
+            self._pool.shutdown(wait=False)
+        self.mark('ready_s')
+        return tracker, grabber
+
+    def get_stats(self):
+        return dict(self.timings)
@@ -35,8 +35,8 @@ echo [SUCCESS] Dependencies installed.
 :: ---------------------------------------------------------
 :: STEP 3: Sanity Check for Model 
 :: ---------------------------------------------------------
-IF EXIST "server\hand_landmarker.task" GOTO Launch
-echo [!] Model file missing. Downloading...
+:: Finds the cached model (downloading it if missing) and checks its SHA-256
+echo [2/3] Checking AI Model...
 python server/download_model.py
 IF %ERRORLEVEL% NEQ 0 GOTO DownloadFailed
 echo [OK] AI Model found.
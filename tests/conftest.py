@@ -0,0 +1,13 @@
+import pytest
+
+from server.config import settings
+
+
+@pytest.fixture
+def model_cache(tmp_path, monkeypatch):
+    """An empty, offline model cache, so nothing is read from the user's cache or downloaded."""
+    cache = tmp_path / "models"
+    monkeypatch.setattr(settings, 'MODEL_CACHE_DIR', str(cache))
+    monkeypatch.setattr(settings, 'MODEL_SEARCH_DIRS', [])
+    monkeypatch.setattr(settings, 'MODEL_OFFLINE', True)
+    return cache
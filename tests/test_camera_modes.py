@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+import pytest
+
+from server.vision.camera_modes import CameraMode, choose_mode, parse_mode, probe_modes
+
+MODES = [parse_mode(text) for text in ("640x480@30:MJPG", "1280x720@30:MJPG", "320x240@30:YUYV")]
+
+
+def write_video(path, width, height, frames=30):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (width, height))
+    if not writer.isOpened():
+        pytest.skip("OpenCV was built without an AVI / MJPG writer")
+    rng = np.random.default_rng(0)
+    for _ in range(frames):
+        writer.write(rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def test_parse_mode():
+    assert parse_mode("640x480@30:MJPG") == CameraMode(640, 480, 30.0, 'MJPG')
+    assert parse_mode("1280x720") == CameraMode(1280, 720, None, None)
+
+
+def test_probe_measures_every_mode_and_chooses_one_above_the_floor(tmp_path):
+    video = write_video(tmp_path / "camera.avi", 640, 480)
+
+    # A video file ignores the requested mode, so every candidate delivers the recorded one
+    results = probe_modes(lambda: cv2.VideoCapture(video), MODES, frames=20, warmup=2)
+    assert [result['requested'] for result in results] == MODES
+    for result in results:
+        assert (result['width'], result['height']) == (640, 480)
+        assert result['frames'] == 20
+        assert result['fps'] > 0
+        assert result['read_p50_ms'] <= result['read_p95_ms']
+
+    chosen = choose_mode(results, min_width=640, min_height=480, min_fps=24)
+    assert chosen in results
+    assert chosen['width'] >= 640 and chosen['height'] >= 480 and chosen['fps'] >= 24
+
+
+def test_no_mode_is_chosen_below_the_floor(tmp_path):
+    video = write_video(tmp_path / "camera.avi", 320, 240)
+
+    results = probe_modes(lambda: cv2.VideoCapture(video), MODES[:1], frames=10, warmup=2)
+    assert results[0]['width'] == 320
+    assert choose_mode(results, min_width=640, min_height=480, min_fps=24) is None
+
+
+def test_unopened_sources_are_skipped(tmp_path):
+    missing = str(tmp_path / "missing.avi")
+    assert probe_modes(lambda: cv2.VideoCapture(missing), MODES, frames=5, warmup=0) == []
@@ -0,0 +1,97 @@
+import importlib.util
+import json
+import os
+import sys
+import types
+
+import pytest
+
+# Loaded from its file inside a stand-in package (for its `from . import protocol`),
+# since the `client` package imports bpy
+_client_dir = os.path.join(os.path.dirname(__file__), '..', 'client')
+_package = types.ModuleType('gesturenav_client')
+_package.__path__ = [_client_dir]
+sys.modules.setdefault('gesturenav_client', _package)
+_spec = importlib.util.spec_from_file_location('gesturenav_client.config_sync',
+                                               os.path.join(_client_dir, 'config_sync.py'))
+config_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(config_sync)
+ConfigSync = config_sync.ConfigSync
+
+
+class FakeSocket:
+    """Records sent messages; `acks` are returned by `recvfrom` until empty."""
+    def __init__(self):
+        self.sent = []
+        self.acks = []
+
+    def sendto(self, data, addr):
+        self.sent.append(json.loads(data.decode('utf-8')))
+
+    def recvfrom(self, size):
+        if not self.acks:
+            raise BlockingIOError
+        return json.dumps({'config_ack': {'version': self.acks.pop(0)}}).encode('utf-8'), ('127.0.0.1', 5556)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sync():
+    sync = ConfigSync()
+    sync.sock = FakeSocket()
+    return sync
+
+
+def test_changes_are_coalesced_and_rate_limited(sync):
+    sync.push({'orbit_sens_server': 1.0})
+    sync.tick(now=0.0)
+    sync.push({'orbit_sens_server': 1.5})
+    sync.push({'orbit_sens_server': 2.0, 'filter_beta': 0.1})
+
+    # Too soon after the last send: wait for the rest of the interval
+    assert sync.tick(now=0.01) == pytest.approx(1.0 / ConfigSync.MAX_RATE - 0.01)
+    assert len(sync.sock.sent) == 1
+    sync.tick(now=1.0 / ConfigSync.MAX_RATE)
+    assert sync.sock.sent[-1] == {'config': {'orbit_sens_server': 2.0, 'filter_beta': 0.1}, 'version': 2}
+
+
+def test_ack_ends_the_retransmits(sync):
+    sync.push({'orbit_sens_server': 2.0})
+    sync.tick(now=0.0)
+    sync.sock.acks.append(1)
+
+    assert sync.tick(now=1.0) is None
+    assert sync.pending() == {}
+    assert (sync.messages_sent, sync.retransmits, sync.acks) == (1, 0, 1)
+
+
+def test_stale_ack_is_ignored(sync):
+    sync.push({'orbit_sens_server': 2.0})
+    sync.tick(now=0.0)
+    sync.push({'orbit_sens_server': 3.0})
+    sync.tick(now=1.0)
+    sync.sock.acks.append(1)   # Acknowledges the superseded message
+
+    sync.tick(now=1.01)
+    assert sync.pending() == {'orbit_sens_server': 3.0}
+    assert sync.acks == 0
+
+
+def test_retransmits_stop_after_max_retries(sync):
+    sync.push({'orbit_sens_server': 2.0})
+    now = 0.0
+    while sync.tick(now=now) is not None:
+        now += ConfigSync.RETRY_INTERVAL
+
+    assert len(sync.sock.sent) == ConfigSync.MAX_RETRIES == 8
+    assert all(message == sync.sock.sent[0] for message in sync.sock.sent)
+    assert sync.retransmits == ConfigSync.MAX_RETRIES - 1
+
+    # Silent until the next change
+    assert sync.tick(now=now + 10.0) is None
+    assert len(sync.sock.sent) == ConfigSync.MAX_RETRIES
+    sync.push({'orbit_sens_server': 3.0})
+    sync.tick(now=now + 20.0)
+    assert sync.sock.sent[-1] == {'config': {'orbit_sens_server': 3.0}, 'version': 2}
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from server.config import settings
+from server.vision.gesture_analysis import GestureDecider
+from server.vision.hand_tracks import HandTrack
+
+F32 = np.float32
+
+
+def scalar_analyze(hand, config):
+    """
+    The original per-landmark `GestureDecider.analyze`, step for step, in float32
+    scalars (the vectorized path computes in float32, so only the precision differs).
+    """
+    result = {'orbit_x': 0.0, 'orbit_y': 0.0, 'zoom_val': 0, 'state': "idle", 'text_overlays': []}
+    if np.isnan(hand).any():
+        return result
+
+    def distance(a, b):
+        dx, dy = hand[a, 0] - hand[b, 0], hand[a, 1] - hand[b, 1]
+        return np.sqrt(dx * dx + dy * dy)
+
+    result['state'] = "active"
+    raw_x = hand[0, 0] - F32(config['deadzone_offset_x'])
+    raw_y = hand[0, 1] - F32(config['deadzone_offset_y'])
+    magnitude = np.sqrt(raw_x * raw_x + raw_y * raw_y)
+    deadzone = F32(config['deadzone_radius'])
+
+    avg_tip_dist = (distance(12, 0) + distance(16, 0) + distance(20, 0)) / F32(3.0)
+    is_open = avg_tip_dist > F32(settings.OPEN_HAND_THRESH)
+    is_fist = avg_tip_dist < F32(settings.FIST_THRESH)
+
+    orbit_allowed = True
+    if config['use_open_hand_safety'] and is_open:
+        orbit_allowed = False
+        result['text_overlays'].append(("OPEN HAND (ORBIT LOCKED)", (10, 150), (255, 0, 0)))
+    if magnitude > deadzone and orbit_allowed:
+        strength = min((magnitude - deadzone) * F32(config['orbit_sens_server']), F32(settings.DEFAULT_MAX_SPEED))
+        result['orbit_x'] = float(raw_x / magnitude * strength)
+        result['orbit_y'] = float(raw_y / magnitude * strength)
+
+    zoom_allowed = True
+    if config['use_fist_safety'] and is_fist:
+        zoom_allowed = False
+        result['text_overlays'].append(("FIST (ZOOM LOCKED)", (10, 120), (0, 0, 255)))
+    if zoom_allowed:
+        pinch = distance(4, 8)
+        if pinch < F32(config['zoom_thresh_in']):
+            result['zoom_val'] = 1
+            result['text_overlays'].append(("ZOOM IN", (10, 90), (0, 0, 255)))
+        elif pinch > F32(config['zoom_thresh_out']):
+            result['zoom_val'] = -1
+            result['text_overlays'].append(("ZOOM OUT", (10, 90), (255, 0, 0)))
+    return result
+
+
+def random_hands(count, seed=0):
+    """Hands all over the frame: wrists around the deadzone, fists to open hands, pinches to spreads."""
+    rng = np.random.default_rng(seed)
+    hands = np.empty((count, 21, 3), dtype=np.float32)
+    hands[:, 0, :2] = rng.uniform(0.3, 1.0, size=(count, 2))
+    hands[:, 0, 2] = 0.0
+    spread = rng.uniform(0.05, 0.6, size=(count, 1, 1))
+    hands[:, 1:] = hands[:, :1] + rng.uniform(-1.0, 1.0, size=(count, 20, 3)) * spread
+    # Every fourth hand pinches (index tip next to the thumb tip)
+    hands[::4, 8] = hands[::4, 4] + rng.uniform(-0.04, 0.04, size=(len(hands[::4]), 3))
+    return hands
+
+
+# A deadzone float32 represents exactly, so wrists can sit exactly on its edge
+DEADZONE = {'deadzone_offset_x': 0.5, 'deadzone_offset_y': 0.5, 'deadzone_radius': 0.25}
+
+
+def edge_hands():
+    """Wrists exactly on, just inside and just outside the deadzone, plus rows without a hand."""
+    edge = F32(DEADZONE['deadzone_offset_x'] + DEADZONE['deadzone_radius'])
+    hand = random_hands(1, seed=1)[0]
+    rows = []
+    for x in (edge, np.nextafter(edge, F32(0)), np.nextafter(edge, F32(1)), F32(DEADZONE['deadzone_offset_x'])):
+        row = hand - hand[0]
+        row[:, :2] += (x, DEADZONE['deadzone_offset_y'])
+        row[0] = (x, DEADZONE['deadzone_offset_y'], 0.0)
+        rows.append(row)
+    rows.append(np.full((21, 3), np.nan, dtype=np.float32))
+    partial = rows[0].copy()
+    partial[7, 2] = np.nan
+    rows.append(partial)
+    return np.stack(rows)
+
+
+def tracks_for(hands):
+    return [HandTrack(i, 'Right' if i % 2 else 'Left', hand, 0.0) for i, hand in enumerate(hands)]
+
+
+@pytest.fixture(params=[(True, True), (True, False), (False, True), (False, False)],
+                ids=['both-safeties', 'fist-only', 'open-hand-only', 'no-safety'])
+def decider(request):
+    decider = GestureDecider()
+    use_fist_safety, use_open_hand_safety = request.param
+    decider.update_config(dict(DEADZONE, use_fist_safety=use_fist_safety, use_open_hand_safety=use_open_hand_safety))
+    return decider
+
+
+@pytest.mark.parametrize('hands', [random_hands(500), edge_hands()], ids=['random', 'edge-cases'])
+def test_all_paths_match_the_scalar_path(decider, hands):
+    config = decider.config
+    batch = decider.analyze_batch(hands)
+
+    for i, hand in enumerate(hands):
+        expected = scalar_analyze(hand, config)
+        assert decider.analyze(hand) == expected
+
+        assert (batch['orbit_x'][i], batch['orbit_y'][i]) == (expected['orbit_x'], expected['orbit_y'])
+        assert batch['zoom_val'][i] == expected['zoom_val']
+        assert batch['active'][i] == (expected['state'] == "active")
+
+        combined = decider.analyze_tracks(tracks_for([hand]))
+        assert combined.pop('hands')[0]['state'] == expected['state']
+        assert combined == expected
+
+
+def test_analyze_tracks_matches_the_batch_per_hand(decider):
+    hands = random_hands(4, seed=2)
+    batch = decider.analyze_batch(hands)
+    result = decider.analyze_tracks(tracks_for(hands))
+
+    for i, gesture in enumerate(result['hands']):
+        assert gesture['orbit_x'] == batch['orbit_x'][i]
+        assert gesture['orbit_y'] == batch['orbit_y'][i]
+        assert gesture['zoom_val'] == batch['zoom_val'][i]
+
+
+def test_deadzone_boundary_does_not_orbit():
+    decider = GestureDecider()
+    decider.update_config(dict(DEADZONE, use_open_hand_safety=False))
+    on, inside, outside, center = edge_hands()[:4]
+    assert decider.analyze(on)['orbit_x'] == 0.0
+    assert decider.analyze(inside)['orbit_x'] == 0.0
+    assert decider.analyze(center)['orbit_x'] == 0.0
+    assert decider.analyze(outside)['orbit_x'] > 0.0
+
+
+def test_analyze_batch_rejects_other_shapes():
+    with pytest.raises(ValueError):
+        GestureDecider().analyze_batch(np.zeros((4, 20, 3)))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from server.vision.hand_tracking import HandTracker
+
+
+@pytest.fixture
+def tracker(model_cache):
+    # No model in the cache: the detector is not built, the frame preparation still works
+    tracker = HandTracker(running_mode='IMAGE', use_roi=True, max_hands=1)
+    assert tracker.detector is None
+    return tracker
+
+
+def frames(count, shape=(480, 640, 3)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, size=shape, dtype=np.uint8) for _ in range(count)]
+
+
+def test_full_frame_preparation_allocates_once(tracker):
+    for frame in frames(50):
+        rgb, transform = tracker._prepare_full(frame)
+        assert np.shares_memory(rgb, tracker._buffers['full_rgb'])
+        assert np.array_equal(rgb, frame[:, :, ::-1])
+        assert transform == (0.0, 0.0, 1.0, 1.0)
+    assert tracker.buffer_allocations == 1
+
+
+def test_roi_preparation_allocates_once(tracker):
+    rng = np.random.default_rng(1)
+    for frame in frames(50):
+        # A different hand box every frame: the crop size changes, the resized buffers do not
+        x0, y0 = rng.uniform(0.0, 0.6, size=2)
+        size = rng.uniform(0.05, 0.4)
+        rgb, _ = tracker._prepare_roi(frame, (x0, y0, x0 + size, y0 + size))
+        assert np.shares_memory(rgb, tracker._buffers['roi_rgb'])
+    # One BGR crop buffer and one RGB buffer, both allocated on the first frame
+    assert tracker.buffer_allocations == 2
+
+
+def test_allocates_again_only_when_the_shape_changes(tracker):
+    for frame in frames(10):
+        tracker._prepare_full(frame)
+    assert tracker.buffer_allocations == 1
+
+    for frame in frames(10, shape=(720, 1280, 3)):
+        tracker._prepare_full(frame)
+    assert tracker.buffer_allocations == 2
+
+    for frame in frames(10, shape=(720, 1280, 3)):
+        tracker._prepare_full(frame)
+    assert tracker.buffer_allocations == 2
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from server.vision.hand_tracking import TrackingResult
+from server.vision.hand_tracks import HandTrackManager
+
+DT = 1.0 / 30.0
+
+
+def hand(x, y):
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, 0], landmarks[:, 1] = x, y
+    return landmarks
+
+
+def result(hands, time):
+    """A TrackingResult from (x, y, label) tuples, in detection order."""
+    return TrackingResult([hand(x, y) for x, y, _ in hands],
+                          [[SimpleNamespace(category_name=label)] for _, _, label in hands], time)
+
+
+def ids_by_label(tracks):
+    return {track.handedness: track.id for track in tracks}
+
+
+def test_ids_stay_stable_while_the_detection_order_swaps():
+    manager = HandTrackManager()
+    first = ids_by_label(manager.update(result([(0.2, 0.5, 'Left'), (0.8, 0.5, 'Right')], 0.0)))
+
+    for i in range(1, 20):
+        drift = 0.005 * i
+        hands = [(0.2 + drift, 0.5, 'Left'), (0.8 - drift, 0.5, 'Right')]
+        if i % 2:
+            hands.reverse()
+        tracks = manager.update(result(hands, i * DT))
+        assert ids_by_label(tracks) == first
+        assert [track.id for track in tracks] == sorted(first.values())
+
+
+def test_ids_follow_position_when_labels_are_missing():
+    manager = HandTrackManager()
+    tracks = manager.update(result([(0.2, 0.5, None), (0.8, 0.5, None)], 0.0))
+    left, right = tracks[0].id, tracks[1].id
+
+    tracks = manager.update(result([(0.79, 0.5, None), (0.21, 0.5, None)], DT))
+    assert {track.id: track.wrist[0] for track in tracks} == {left: np.float32(0.21), right: np.float32(0.79)}
+
+
+def test_far_jump_starts_a_new_track_and_lost_tracks_expire():
+    manager = HandTrackManager(max_distance=0.25, timeout=0.5)
+    (first,) = manager.update(result([(0.2, 0.5, 'Right')], 0.0))
+    (jumped,) = manager.update(result([(0.9, 0.5, 'Right')], DT))
+    assert jumped.id != first.id
+    assert set(manager.tracks) == {first.id, jumped.id}
+
+    # 0.52 s after the first track was last seen, 0.49 s after the second
+    manager.update(result([(0.9, 0.5, 'Right')], 0.52))
+    assert set(manager.tracks) == {jumped.id}
+
+
+def test_same_result_is_not_matched_twice():
+    manager = HandTrackManager()
+    detection = result([(0.2, 0.5, 'Left')], 0.0)
+    assert manager.update(detection) is manager.update(detection)
+    assert manager.update(None) == []
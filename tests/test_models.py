@@ -0,0 +1,109 @@
+import hashlib
+
+import pytest
+
+from server.vision.models import ModelStore
+
+MODEL = b"hand landmarker model bytes" * 1000
+
+
+@pytest.fixture
+def published(tmp_path):
+    """A model served from a file:// URL, with its published checksum."""
+    served = tmp_path / "served" / "hand_landmarker.task"
+    served.parent.mkdir()
+    served.write_bytes(MODEL)
+    return {
+        'file': 'hand_landmarker.task',
+        'url': served.as_uri(),
+        'sha256': hashlib.sha256(MODEL).hexdigest()
+    }
+
+
+def store_for(tmp_path, variant, offline=False, search_dirs=(), trust_on_first_use=False):
+    return ModelStore(cache_dir=str(tmp_path / "cache"), search_dirs=list(search_dirs),
+                      variants={'test': variant}, offline=offline, trust_on_first_use=trust_on_first_use)
+
+
+def test_download_with_a_checksum_mismatch_is_rejected(tmp_path, published):
+    variant = dict(published, sha256=hashlib.sha256(b"another model").hexdigest())
+    store = store_for(tmp_path, variant)
+
+    with pytest.raises(ValueError, match="SHA-256"):
+        store.resolve('test')
+    # Neither the download nor its temporary file is left in the cache
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_corrupt_cached_file_is_fetched_again(tmp_path, published):
+    store = store_for(tmp_path, published)
+    cached = tmp_path / "cache" / "hand_landmarker.task"
+    cached.parent.mkdir()
+    cached.write_bytes(MODEL[:100])
+
+    assert store.resolve('test') == str(cached)
+    assert cached.read_bytes() == MODEL
+    assert store.load('test') == MODEL
+    # Published checksums are never replaced by a pin
+    assert not (tmp_path / "cache" / "hand_landmarker.task.sha256").exists()
+
+
+def test_offline_uses_a_pre_seeded_file(tmp_path, published):
+    seeded = tmp_path / "seeded"
+    seeded.mkdir()
+    (seeded / "hand_landmarker.task").write_bytes(MODEL)
+    variant = dict(published, url="file:///nonexistent/hand_landmarker.task")
+    store = store_for(tmp_path, variant, offline=True, search_dirs=[seeded])
+
+    assert store.resolve('test') == str(seeded / "hand_landmarker.task")
+    assert store.load('test') == MODEL
+
+
+def test_offline_without_a_valid_copy_fails(tmp_path, published):
+    seeded = tmp_path / "seeded"
+    seeded.mkdir()
+    (seeded / "hand_landmarker.task").write_bytes(b"truncated")
+    store = store_for(tmp_path, published, offline=True, search_dirs=[seeded])
+
+    with pytest.raises(FileNotFoundError, match="offline"):
+        store.resolve('test')
+
+
+def test_failed_check_after_download_removes_the_file(tmp_path, published, monkeypatch):
+    store = store_for(tmp_path, published)
+    cached = tmp_path / "cache" / "hand_landmarker.task"
+
+    def download(name=None, force=False):
+        # E.g. the file was replaced between the download and the load
+        cached.parent.mkdir(exist_ok=True)
+        cached.write_bytes(b"replaced model")
+        return str(cached)
+
+    monkeypatch.setattr(store, 'download', download)
+    with pytest.raises(ValueError, match="failed its checks"):
+        store.load('test')
+    assert not cached.exists()
+
+
+def test_variant_without_a_checksum_is_refused(tmp_path, published):
+    store = store_for(tmp_path, dict(published, sha256=None))
+
+    with pytest.raises(ValueError, match="no published SHA-256"):
+        store.resolve('test')
+    # Refused before anything was fetched
+    assert not (tmp_path / "cache").exists()
+
+
+def test_trust_on_first_use_pins_and_enforces_the_first_copy(tmp_path, published):
+    variant = dict(published, sha256=None)
+    store_for(tmp_path, variant, trust_on_first_use=True).resolve('test')
+
+    # The pin is enforced from then on, also without the opt-in
+    store = store_for(tmp_path, variant)
+    assert store.expected_sha256('test') == published['sha256']
+    cached = tmp_path / "cache" / "hand_landmarker.task"
+    cached.write_bytes(b"replaced model")
+    (tmp_path / "served" / "hand_landmarker.task").write_bytes(b"replaced model")
+    with pytest.raises(ValueError, match="SHA-256"):
+        store.resolve('test')
+    assert not cached.exists()
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from server.vision.hand_tracks import HandTrack
+from server.vision.prediction import PREDICTED_LANDMARKS, LandmarkPredictor
+
+DT = 1.0 / 30.0
+
+
+@pytest.fixture
+def predictor():
+    predictor = LandmarkPredictor()
+    predictor.update_config({'use_prediction': True, 'prediction_lead': 0.0,
+                             'prediction_max_horizon': 0.1, 'prediction_max_offset': 0.05})
+    return predictor
+
+
+def run(predictor, speed, frames=4, latency=0.02):
+    """Feeds a hand moving along x at `speed` (normalized units / s); returns the track and the last horizon."""
+    track = HandTrack(0, 'Right', None, 0.0)
+    horizon = 0.0
+    for i in range(frames):
+        landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+        landmarks[:, 0] += speed * i * DT
+        track.raw_landmarks = track.landmarks = landmarks
+        horizon = predictor.apply([track], i * DT, i * DT + latency)
+    return track, horizon
+
+
+def offsets(track):
+    return (track.landmarks - track.raw_landmarks)[PREDICTED_LANDMARKS]
+
+
+def test_extrapolates_by_the_measured_latency(predictor):
+    track, horizon = run(predictor, speed=0.3, latency=0.02)
+    assert horizon == pytest.approx(0.02)
+    assert offsets(track)[:, 0] == pytest.approx(0.3 * 0.02, rel=1e-3)
+    assert np.abs(offsets(track)[:, 1:]).max() < 1e-6
+    # Landmarks the gesture logic does not read are left alone
+    untouched = [i for i in range(21) if i not in PREDICTED_LANDMARKS]
+    assert np.array_equal(track.landmarks[untouched], track.raw_landmarks[untouched])
+
+
+def test_horizon_is_capped_at_prediction_max_horizon(predictor):
+    track, horizon = run(predictor, speed=0.3, latency=0.5)
+    assert horizon == pytest.approx(0.1)
+    assert offsets(track)[:, 0] == pytest.approx(0.3 * 0.1, rel=1e-3)
+
+
+def test_offset_is_capped_at_prediction_max_offset(predictor):
+    track, _ = run(predictor, speed=5.0, latency=0.05)
+    assert np.linalg.norm(offsets(track)[:, :2], axis=1) == pytest.approx(0.05, rel=1e-4)
+
+
+def test_disabled_prediction_changes_nothing(predictor):
+    predictor.update_config({'use_prediction': False})
+    track, horizon = run(predictor, speed=0.3)
+    assert horizon == 0.0
+    assert np.array_equal(track.landmarks, track.raw_landmarks)
+    # History is still recorded, so turning it on takes effect right away
+    assert len(track.history) == 4
@@ -0,0 +1,104 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+from server.config import settings
+from server.networking import protocol
+
+# The add-on's copy; loaded from its file, since the `client` package imports bpy
+_spec = importlib.util.spec_from_file_location(
+    'client_protocol', os.path.join(os.path.dirname(__file__), '..', 'client', 'protocol.py'))
+client_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(client_protocol)
+
+DECODERS = [protocol.decode_packet, client_protocol.decode_packet]
+
+
+def hands(count):
+    # Values float32 represents exactly, so binary round trips compare equal
+    return [{'id': i, 'hand': ('Left', 'Right', None)[i % 3], 'state': ('active', 'idle')[i % 2],
+             'x': 0.25 * (i % 4) - 0.5, 'y': -0.125 * (i % 8), 'zoom': i % 3 - 1}
+            for i in range(count)]
+
+
+@pytest.mark.parametrize('decode', DECODERS, ids=['server', 'client'])
+@pytest.mark.parametrize('encoding', protocol.SUPPORTED_PROTOCOLS)
+@pytest.mark.parametrize('count', sorted({0, 1, settings.MAX_HANDS, protocol.MAX_PACKET_HANDS}))
+def test_round_trip(decode, encoding, count):
+    sent = hands(count)
+    data = protocol.ENCODERS[encoding]('active', 0.5, -0.25, 1, 42, 1234.5, sent)
+    packet = decode(data)
+
+    assert {key: packet[key] for key in ('state', 'x', 'y', 'zoom', 'seq', 'ts')} == {
+        'state': 'active', 'x': 0.5, 'y': -0.25, 'zoom': 1, 'seq': 42, 'ts': 1234.5}
+    # binary/1 has no per-hand fields
+    assert packet['hands'] == ([] if encoding == protocol.PROTOCOL_BINARY else sent)
+
+
+@pytest.mark.parametrize('encoding', [protocol.PROTOCOL_BINARY, protocol.PROTOCOL_BINARY_V2])
+def test_binary_packet_sizes(encoding):
+    data = protocol.ENCODERS[encoding]('idle', 0.0, 0.0, 0, 1, 0.0, hands(2))
+    records = 2 if encoding == protocol.PROTOCOL_BINARY_V2 else 0
+    assert len(data) == protocol.PACKET_SIZE + records * protocol.HAND_RECORD.size
+
+
+def test_binary_v2_keeps_at_most_max_packet_hands():
+    data = protocol.encode_binary_v2('active', 0.0, 0.0, 0, 1, 0.0, hands(protocol.MAX_PACKET_HANDS + 5))
+    assert len(protocol.decode_packet(data)['hands']) == protocol.MAX_PACKET_HANDS
+
+
+@pytest.mark.parametrize('encoding', protocol.SUPPORTED_PROTOCOLS)
+def test_sequence_number_wraps_at_32_bits(encoding):
+    data = protocol.ENCODERS[encoding]('idle', 0.0, 0.0, 0, 2 ** 32 + 5, 0.0)
+    assert protocol.decode_packet(data)['seq'] == 5
+
+
+@pytest.mark.parametrize('decode', DECODERS, ids=['server', 'client'])
+@pytest.mark.parametrize('data', [
+    b'[1]', b'"active"', b'42', b'null',          # Valid JSON, but not an object
+    b'{"state": ', b'\xff\xfe',                   # Not JSON
+    protocol.encode_binary('idle', 0.0, 0.0, 0, 1, 0.0) + b'\x00',       # Wrong size
+    protocol.encode_binary_v2('idle', 0.0, 0.0, 0, 1, 0.0, hands(2))[:-1],
+    b'GN\x07' + bytes(protocol.PACKET_SIZE - 3)   # Unknown version
+])
+def test_malformed_packets_raise_value_error(decode, data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+@pytest.mark.parametrize('decode', DECODERS, ids=['server', 'client'])
+def test_handshake_replies_are_not_gesture_packets(decode):
+    assert decode(protocol.hello_ack(protocol.PROTOCOL_BINARY)) is None
+    assert decode(protocol.config_ack(3)) is None
+
+
+def test_legacy_json_has_no_sequence_or_timestamp():
+    packet = protocol.decode_packet(json.dumps({'state': 'active', 'x': 0.1, 'y': 0.2, 'zoom': 0}).encode())
+    assert (packet['seq'], packet['ts'], packet['hands']) == (None, None, [])
+
+
+def test_is_newer_in_order_and_stale():
+    is_newer = client_protocol.is_newer
+    assert is_newer(11, 10)
+    assert not is_newer(10, 10)
+    assert not is_newer(9, 10)
+    assert is_newer(5, None) and is_newer(None, 5)
+
+
+def test_is_newer_across_the_32_bit_wrap():
+    is_newer = client_protocol.is_newer
+    assert is_newer(0, 0xFFFFFFFF)
+    assert is_newer(3, 0xFFFFFFFD)
+    assert not is_newer(0xFFFFFFFF, 0)
+    assert not is_newer(0xFFFFFFF0, 3)
+
+
+def test_is_newer_accepts_a_restarted_counter():
+    is_newer = client_protocol.is_newer
+    window = client_protocol.REORDER_WINDOW
+    # Up to REORDER_WINDOW behind is a reordered packet, further back the server restarted
+    assert not is_newer(1000 - window, 1000)
+    assert is_newer(1000 - window - 1, 1000)
+    assert is_newer(1, 5_000_000)
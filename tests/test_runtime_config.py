@@ -0,0 +1,82 @@
+import math
+import threading
+
+import pytest
+
+from server.config.runtime import RuntimeConfig, boolean, choice, number
+
+
+@pytest.fixture
+def config():
+    return RuntimeConfig({'radius': 0.1, 'gain': 3.0, 'enabled': True, 'hand': 'Right'}, {
+        'radius': number(0.0, 1.0),
+        'gain': number(),
+        'enabled': boolean,
+        'hand': choice('Left', 'Right')
+    })
+
+
+@pytest.mark.parametrize('value', [0.0, 1.0, 0.5, 1, "0.25"])
+def test_number_accepts_values_within_bounds(value):
+    assert number(0.0, 1.0)(value) == float(value)
+
+
+@pytest.mark.parametrize('value', [-0.01, 1.01, math.nan, math.inf, True, "abc"])
+def test_number_rejects_values_outside_bounds(value):
+    with pytest.raises(ValueError):
+        number(0.0, 1.0)(value)
+
+
+@pytest.mark.parametrize('value', [math.inf, -math.inf, math.nan, "inf", "nan"])
+def test_unbounded_number_rejects_non_finite_values(value):
+    with pytest.raises(ValueError):
+        number()(value)
+
+
+def test_boolean_and_choice():
+    assert boolean(False) is False
+    with pytest.raises(ValueError):
+        boolean(1)
+    assert choice('Left', 'Right')('Left') == 'Left'
+    with pytest.raises(ValueError):
+        choice('Left', 'Right')('left')
+
+
+def test_update_publishes_a_new_version(config):
+    before = config.snapshot
+    after = config.update({'radius': 0.2, 'hand': 'Left'})
+
+    assert after is config.snapshot
+    assert after.version == before.version + 1
+    assert (after['radius'], after['hand']) == (0.2, 'Left')
+    # Snapshots are immutable: the old one still has the old values
+    assert (before['radius'], before['hand']) == (0.1, 'Right')
+    with pytest.raises(TypeError):
+        after['radius'] = 0.3
+
+
+def test_invalid_keys_are_rejected_one_by_one(config):
+    snapshot = config.update({'radius': 2.0, 'gain': math.inf, 'enabled': "yes", 'hand': 'Left'})
+
+    assert snapshot.version == 1
+    assert dict(snapshot) == {'radius': 0.1, 'gain': 3.0, 'enabled': True, 'hand': 'Left'}
+
+
+def test_unknown_keys_and_unchanged_values_keep_the_version(config):
+    assert config.update({'unknown': 1}).version == 0
+    assert config.update({'radius': 0.1, 'gain': 3}).version == 0
+    assert config.update({'radius': 5.0}).version == 0
+
+
+def test_concurrent_updates_get_distinct_versions(config):
+    def writer(offset):
+        for i in range(100):
+            config.update({'gain': offset + i})
+
+    threads = [threading.Thread(target=writer, args=(1000 * t,)) for t in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Every update changed the value, so none of the 400 versions was lost
+    assert config.snapshot.version == 400
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from server.vision.hand_tracks import HandTrack
+from server.vision.smoothing import KalmanFilter, LandmarkSmoother, OneEuroFilter
+
+DT = 1.0 / 30.0
+
+
+@pytest.mark.parametrize('make_filter', [OneEuroFilter, KalmanFilter], ids=['one_euro', 'kalman'])
+def test_filter_converges_on_a_constant_input(make_filter):
+    smoothing = make_filter()
+    start = np.zeros((21, 3), dtype=np.float32)
+    target = np.full((21, 3), 0.6, dtype=np.float32)
+
+    assert np.array_equal(smoothing(start, 0.0), start)
+    errors = [np.abs(smoothing(target, i * DT) - target).max() for i in range(1, 151)]
+    # Moves towards the target without jumping there at once, and settles on it
+    assert 0.0 < errors[0] < 0.6
+    assert errors[-1] < 1e-3
+    assert all(later <= earlier + 1e-6 for earlier, later in zip(errors[75:], errors[76:]))
+
+
+@pytest.mark.parametrize('make_filter', [OneEuroFilter, KalmanFilter], ids=['one_euro', 'kalman'])
+def test_filter_ignores_samples_that_are_not_newer(make_filter):
+    smoothing = make_filter()
+    first = smoothing(np.zeros((21, 3), dtype=np.float32), 1.0)
+    assert np.array_equal(smoothing(np.ones((21, 3), dtype=np.float32), 1.0), first)
+
+
+def track_at(value):
+    return HandTrack(0, 'Right', np.full((21, 3), value, dtype=np.float32), 0.0)
+
+
+def test_smoother_keeps_its_filter_while_the_config_is_unchanged():
+    smoother = LandmarkSmoother()
+    track = track_at(0.2)
+    smoother.apply([track], 0.0)
+    first_filter = track.filter
+
+    track.raw_landmarks = np.full((21, 3), 0.8, dtype=np.float32)
+    smoother.apply([track], DT)
+    assert track.filter is first_filter
+    assert 0.2 < track.landmarks[0, 0] < 0.8
+    assert track.raw_landmarks[0, 0] == np.float32(0.8)
+
+
+@pytest.mark.parametrize('change', [{'filter_min_cutoff': 5.0}, {'filter_mode': 'kalman'}])
+def test_smoother_resets_the_filter_on_a_config_change(change):
+    smoother = LandmarkSmoother()
+    track = track_at(0.2)
+    smoother.apply([track], 0.0)
+    first_filter = track.filter
+
+    smoother.update_config(change)
+    track.raw_landmarks = np.full((21, 3), 0.8, dtype=np.float32)
+    smoother.apply([track], DT)
+    # A fresh filter starts from the current measurement
+    assert track.filter is not first_filter
+    assert track.filter_version == smoother.config.version
+    assert np.array_equal(track.landmarks, track.raw_landmarks)
+
+
+def test_smoother_off_passes_the_raw_landmarks():
+    smoother = LandmarkSmoother()
+    smoother.update_config({'filter_mode': 'off'})
+    track = track_at(0.4)
+    smoother.apply([track], 0.0)
+    assert track.filter is None
+    assert track.landmarks is track.raw_landmarks
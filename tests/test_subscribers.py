@@ -0,0 +1,109 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from server.networking import protocol
+from server.networking.core import ConfigProtocol
+from server.networking.subscribers import SubscriberRegistry
+
+TIMEOUT = 5.0
+CLIENT = ('127.0.0.1', 40001)
+OTHER = ('127.0.0.1', 40002)
+
+
+class FakeTransport:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((json.loads(data.decode('utf-8')), addr))
+
+
+class RecordingTarget:
+    def __init__(self):
+        self.updates = []
+
+    def update_config(self, config):
+        self.updates.append(config)
+
+
+@pytest.fixture
+def registry():
+    return SubscriberRegistry(timeout=TIMEOUT, legacy_addr=('127.0.0.1', 5555))
+
+
+@pytest.fixture
+def config_protocol(registry):
+    config_protocol = ConfigProtocol(SimpleNamespace(subscribers=registry, config_updates=0), [RecordingTarget()])
+    config_protocol.connection_made(FakeTransport())
+    return config_protocol
+
+
+def receive(config_protocol, message, addr=CLIENT):
+    config_protocol.datagram_received(json.dumps(message).encode('utf-8'), addr)
+
+
+def test_subscriber_expires_after_the_timeout(registry):
+    registry.subscribe(CLIENT, [protocol.PROTOCOL_BINARY_V2], now=0.0)
+    registry.subscribe(OTHER, [], now=3.0)
+
+    assert registry.expire(now=TIMEOUT) == []
+    assert registry.expire(now=TIMEOUT + 0.01) == [CLIENT]
+    assert list(registry.subscribers) == [OTHER]
+    assert registry.expired == 1
+
+
+def test_hello_renews_the_subscription(registry):
+    assert registry.subscribe(CLIENT, [protocol.PROTOCOL_BINARY_V2], now=0.0) == (protocol.PROTOCOL_BINARY_V2, True)
+    assert registry.subscribe(CLIENT, [protocol.PROTOCOL_BINARY_V2], now=4.0) == (protocol.PROTOCOL_BINARY_V2, False)
+    assert registry.expire(now=8.0) == []
+    assert registry.expire(now=9.5) == [CLIENT]
+
+
+def test_bye_removes_the_subscriber_immediately(registry, config_protocol):
+    receive(config_protocol, {'hello': {'protocols': [protocol.PROTOCOL_BINARY]}})
+    assert len(registry) == 1
+    assert config_protocol.transport.sent == [({'hello_ack': {'protocol': protocol.PROTOCOL_BINARY}}, CLIENT)]
+
+    receive(config_protocol, {'bye': {}})
+    assert len(registry) == 0
+    assert (registry.left, registry.expired) == (1, 0)
+
+
+def test_stream_falls_back_to_the_legacy_address(registry):
+    sent = []
+    registry.subscribe(CLIENT, [protocol.PROTOCOL_BINARY], now=0.0)
+    registry.expire(now=TIMEOUT + 1.0)
+
+    assert registry.send(lambda data, addr: sent.append(addr), 'idle', 0.0, 0.0, 0, 1, 0.0) == 1
+    assert sent == [registry.legacy_addr]
+
+
+def test_old_config_version_is_acked_but_not_applied(config_protocol):
+    target = config_protocol.targets[0]
+    receive(config_protocol, {'config': {'orbit_sens_server': 2.0}, 'version': 2})
+    receive(config_protocol, {'config': {'orbit_sens_server': 1.0}, 'version': 1})   # Reordered
+    receive(config_protocol, {'config': {'orbit_sens_server': 2.0}, 'version': 2})   # Retransmit
+
+    assert [message for message, _ in config_protocol.transport.sent] == [
+        {'config_ack': {'version': 2}}, {'config_ack': {'version': 1}}, {'config_ack': {'version': 2}}]
+    assert target.updates == [{'orbit_sens_server': 2.0}]
+    assert config_protocol.core.config_updates == 1
+
+    # Versions are tracked per address
+    receive(config_protocol, {'config': {'orbit_sens_server': 1.0}, 'version': 1}, addr=OTHER)
+    assert target.updates[-1] == {'orbit_sens_server': 1.0}
+
+
+def test_config_versions_of_silent_clients_are_forgotten(config_protocol):
+    receive(config_protocol, {'config': {'orbit_sens_server': 2.0}, 'version': 2})
+    (_, last_seen), = config_protocol.applied_versions.values()
+
+    assert config_protocol.expire(TIMEOUT, now=last_seen + TIMEOUT) == []
+    assert config_protocol.expire(TIMEOUT, now=last_seen + TIMEOUT + 0.01) == [CLIENT]
+    assert config_protocol.applied_versions == {}
+
+    # A restarted client counting from 1 again is applied
+    receive(config_protocol, {'config': {'orbit_sens_server': 1.0}, 'version': 1})
+    assert config_protocol.targets[0].updates[-1] == {'orbit_sens_server': 1.0}